@@ -16,5 +16,5 @@ if __name__ == "__main__":
         "registry.txt",
     )
 
-    # Export the portfolio to json
+    # Export the portfolio, built from catalog.json, to the pooch registry
     portfolio.to_registry(path_to_datasets)
@@ -6,6 +6,7 @@ EmbedSeg, etc.
 """
 
 __all__ = [
+    "CacheManager",
     "PortfolioManager",
     "__author__",
     "__email__",
@@ -13,13 +14,66 @@ __all__ = [
     "update_registry",
 ]
 
-from importlib.metadata import PackageNotFoundError, version
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
 
-from .portfolio import PortfolioManager, update_registry
+if TYPE_CHECKING:
+    from .portfolio import PortfolioManager, update_registry
+    from .utils.cache_manager import CacheManager
 
-try:
-    __version__ = version("microscopy-portfolio")
-except PackageNotFoundError:
-    __version__ = "uninstalled"
 __author__ = "Joran Deschamps"
 __email__ = "joran.deschamps@fht.org"
+
+# attributes imported on first access (PEP 562), so that importing the package
+# does not import pooch and its dependencies
+_LAZY_ATTRIBUTES = {
+    "CacheManager": ".utils.cache_manager",
+    "PortfolioManager": ".portfolio",
+    "update_registry": ".portfolio",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public attributes of the package on first access.
+
+    Parameters
+    ----------
+    name : str
+        Name of the attribute.
+
+    Returns
+    -------
+    Any
+        Attribute of the package.
+
+    Raises
+    ------
+    AttributeError
+        If the package has no such attribute.
+    """
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("microscopy-portfolio")
+        except PackageNotFoundError:
+            value = "uninstalled"
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # cached, so that __getattr__ is only called once per attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the attributes of the package, including those not imported yet.
+
+    Returns
+    -------
+    List[str]
+        Attributes of the package.
+    """
+    return sorted(set(globals()) | set(__all__))
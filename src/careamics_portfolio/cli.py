@@ -0,0 +1,132 @@
+"""Command line interface of the portfolio."""
+
+import argparse
+import time
+from typing import List, Optional
+
+from .utils.cache_manager import KINDS, CacheManager, parse_size
+
+
+def _format_size(size: int) -> str:
+    """Format a number of bytes with a binary unit.
+
+    Parameters
+    ----------
+    size : int
+        Number of bytes.
+
+    Returns
+    -------
+    str
+        Formatted size, e.g. "1.5 GiB".
+    """
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def cache_cli(argv: Optional[List[str]] = None) -> int:
+    """Manage the disk usage of a portfolio cache folder.
+
+    Run `careamics-portfolio-cache --help` for the list of commands.
+
+    Parameters
+    ----------
+    argv : List[str] | None
+        Command line arguments, by default None, in which case `sys.argv` is
+        used.
+
+    Returns
+    -------
+    int
+        Exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="careamics-portfolio-cache",
+        description="Manage the disk usage of the portfolio cache.",
+    )
+    parser.add_argument(
+        "--path", default=None, help="cache folder, by default the system's cache"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("usage", help="disk usage of the cached datasets")
+
+    pin = commands.add_parser("pin", help="never evict the data of datasets")
+    pin.add_argument("names", nargs="+", help="registry names")
+
+    unpin = commands.add_parser("unpin", help="allow evicting datasets again")
+    unpin.add_argument("names", nargs="+", help="registry names")
+
+    evict = commands.add_parser("evict", help="remove the data of datasets")
+    evict.add_argument("names", nargs="+", help="registry names")
+    evict.add_argument(
+        "--kind",
+        action="append",
+        choices=KINDS,
+        help="kind of data to remove, can be repeated, by default all",
+    )
+
+    enforce = commands.add_parser(
+        "enforce", help="evict least recently used data to fit in a budget"
+    )
+    enforce.add_argument(
+        "budget",
+        nargs="?",
+        type=parse_size,
+        help="maximum size, e.g. 5G, by default $CAREAMICS_PORTFOLIO_CACHE_BUDGET",
+    )
+
+    args = parser.parse_args(argv)
+    cache = CacheManager(args.path)
+
+    unknown = set(getattr(args, "names", [])) - set(cache.names())
+    if unknown:
+        parser.error(f"unknown registry names {sorted(unknown)}")
+
+    if args.command == "usage":
+        usage = cache.usage()
+        access = cache.last_access()
+        pinned = set(cache.pinned)
+        header = ("name", *KINDS, "total", "last access")
+        print("{:<40} {:>10} {:>10} {:>10} {:>10}  {}".format(*header))
+        for name, sizes in sorted(
+            usage.items(), key=lambda item: access.get(item[0], 0.0)
+        ):
+            sizes_text = [_format_size(sizes[k]) for k in (*KINDS, "total")]
+            last = (
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(access[name]))
+                if name in access
+                else "never"
+            )
+            print(
+                "{:<40} {:>10} {:>10} {:>10} {:>10}  {}{}".format(
+                    name, *sizes_text, last, " (pinned)" if name in pinned else ""
+                )
+            )
+        total = sum(sizes["total"] for sizes in usage.values())
+        print(f"Total: {_format_size(total)}")
+    elif args.command == "pin":
+        for name in args.names:
+            cache.pin(name)
+    elif args.command == "unpin":
+        for name in args.names:
+            cache.unpin(name)
+    elif args.command == "evict":
+        kinds = args.kind or KINDS
+        for name in args.names:
+            freed = cache.evict(name, kinds)
+            print(f"{name}: freed {_format_size(freed)}")
+    elif args.command == "enforce":
+        try:
+            evicted = cache.enforce(args.budget)
+        except ValueError as e:
+            parser.error(str(e))
+        for name, kind in evicted:
+            print(f"Evicted {kind} of {name}")
+        print(f"Total: {_format_size(cache.total_size())}")
+
+    return 0
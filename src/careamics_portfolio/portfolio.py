@@ -1,38 +1,26 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from json import JSONEncoder
 from pathlib import Path
+from typing import Any, Iterable
 
-from .denoiseg_datasets import (
-    DENOISEG,
-    DSB2018,
-    MouseNuclei,
-    NoiseLevel,
-    SegFlywing,
-)
-from .denoising_datasets import (
-    CARE_U2OS,
-    DENOISING,
-    N2N_SEM,
-    N2V_BSD68,
-    N2V_RGB,
-    N2V_SEM,
-    Convallaria,
-    Flywing,
-    Tribolium,
-)
+from .denoiseg_datasets import DENOISEG
+from .denoising_datasets import DENOISING
 from .portfolio_entry import PortfolioEntry
-from .utils.download_utils import get_registry_path
-from .utils.pale_blue_dot import PaleBlueDot
-from .utils.pale_blue_dot_zip import PaleBlueDotZip
+from .utils.catalog import get_catalog
+from .utils.manifest import MANIFEST_SUFFIX
 
 
 class IterablePortfolio:
     """Iterable portfolio class.
 
-    Subclass this class and add PortfolioEntry objects as attributes.
+    The entries of a portfolio are read from the catalog (see `Catalog`) and
+    created on first access, either by iterating over the portfolio or as
+    attributes named after the entries. Subclasses may also add PortfolioEntry
+    objects as attributes.
 
 
     Attributes
@@ -48,16 +36,143 @@ class IterablePortfolio:
     def __init__(self, name: str) -> None:
         self._name = name
 
-        # create list of datasets
-        datasets = []
-        for dataset in vars(self).values():
-            if isinstance(dataset, PortfolioEntry):
-                datasets.append(dataset)
-
-        # record datasets
-        self._datasets = datasets
+        # entries set as attributes by subclasses
+        self._attributes = [
+            dataset
+            for dataset in vars(self).values()
+            if isinstance(dataset, PortfolioEntry)
+        ]
+
+        # entries of the catalog created on first access, indexed by name, and
+        # dictionary representation, both reset when the catalog changes
+        self._entries: dict[str, PortfolioEntry] = {}
+        self._dict: dict[str, dict[str, Any]] | None = None
+        self._version: int | None = None
+
+        # datasets being iterated over, listed by __iter__
+        self._iterated: list[PortfolioEntry] | None = None
         self._current_index = 0
 
+    def _sync(self) -> None:
+        """Reset the cached entries if the catalog was modified."""
+        version = get_catalog().version
+        if version != self._version:
+            self._entries, self._dict, self._version = {}, None, version
+
+    def reload(self) -> None:
+        """Reset the cached entries if the catalog was modified.
+
+        Entries already accessed as attributes are not checked against the
+        catalog, iterating over the portfolio, listing its datasets or calling
+        this method picks up the changes.
+        """
+        self._sync()
+
+    def _entry(self, name: str) -> PortfolioEntry:
+        """Entry of the catalog, created on first access.
+
+        The catalog is only checked for changes when the entry was not created
+        yet, cached entries are returned without accessing the file.
+
+        Parameters
+        ----------
+        name : str
+            Name of the entry in the portfolio.
+
+        Returns
+        -------
+        PortfolioEntry
+            Entry of the portfolio.
+
+        Raises
+        ------
+        KeyError
+            If the catalog has no such entry in the portfolio.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            self._sync()
+            entry = self._get(name)
+        return entry
+
+    def _get(self, name: str) -> PortfolioEntry:
+        """Entry of the catalog, without checking whether the catalog changed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the entry in the portfolio.
+
+        Returns
+        -------
+        PortfolioEntry
+            Entry of the portfolio.
+
+        Raises
+        ------
+        KeyError
+            If the catalog has no such entry in the portfolio.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            record = get_catalog().record(self._name, name)
+            # setdefault, so that concurrent first accesses return the same entry
+            entry = self._entries.setdefault(name, PortfolioEntry(**record))
+        return entry
+
+    def __getattr__(self, name: str) -> PortfolioEntry:
+        """Entries of the catalog without a dedicated property.
+
+        Parameters
+        ----------
+        name : str
+            Name of the entry in the portfolio.
+
+        Returns
+        -------
+        PortfolioEntry
+            Entry of the portfolio.
+
+        Raises
+        ------
+        AttributeError
+            If the catalog has no such entry in the portfolio.
+        """
+        # private attributes are not entries, e.g. before __init__ sets them
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        try:
+            return self._entry(name)
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+
+    @property
+    def _datasets(self) -> list[PortfolioEntry]:
+        """Datasets of the portfolio, created if they were not accessed yet.
+
+        Returns
+        -------
+        list[PortfolioEntry]
+            List of datasets in the portfolio.
+        """
+        self._sync()
+        return self._list()
+
+    def _list(self) -> list[PortfolioEntry]:
+        """Datasets of the portfolio, without checking whether the catalog changed.
+
+        Returns
+        -------
+        list[PortfolioEntry]
+            List of datasets in the portfolio.
+        """
+        return self._attributes + [
+            self._get(name) for name in get_catalog().names(self._name)
+        ]
+
     def __iter__(self) -> IterablePortfolio:
         """Iterator method.
 
@@ -66,6 +181,8 @@ class IterablePortfolio:
         IterablePortfolio
             Iterator over the portfolio.
         """
+        # listed once, rather than on each call to __next__
+        self._iterated = self._datasets
         self._current_index = 0
         return self
 
@@ -77,10 +194,16 @@ class IterablePortfolio:
         PortfolioEntry
             Next dataset in the portfolio.
         """
-        if self._current_index < len(self._datasets):
-            next_dataset = self._datasets[self._current_index]
+        datasets = self._iterated
+        if datasets is None:
+            # __next__ called without __iter__
+            datasets = self._iterated = self._datasets
+
+        if self._current_index < len(datasets):
+            next_dataset = datasets[self._current_index]
             self._current_index += 1
             return next_dataset
+        self._iterated = None
         raise StopIteration("The iterator does not have any more elements.")
 
     @property
@@ -105,42 +228,99 @@ class IterablePortfolio:
         list[str]
             List of datasets in the portfolio.
         """
-        attributes = []
-
-        # for each attribute
-        for attribute in vars(self).values():
-            if isinstance(attribute, PortfolioEntry):
-                attributes.append(attribute.name)
-
-        return attributes
+        return [dataset.name for dataset in self._datasets]
 
     def as_dict(self) -> dict:
         """Dictionary representation of a portfolio.
 
-        Used to serialize the class to json, with friendly names as entries.
+        Used to serialize the class to json, with friendly names as entries. The
+        dictionary is computed once per version of the catalog, and a copy of it
+        is returned.
 
         Returns
         -------
         dict[str]
             Dictionary representation of the DenoiSeg portfolio.
         """
-        entries = {}
-
-        # for each attribute
-        for attribute in vars(self).values():
-            # if the attribute is a PortfolioEntry
-            if isinstance(attribute, PortfolioEntry):
-                # add the attribute to the entries dictionary
-                entries[attribute.name] = {
-                    "URL": attribute.url,
-                    "Description": attribute.description,
-                    "Citation": attribute.citation,
-                    "License": attribute.license,
-                    "Hash": attribute.hash,
-                    "File size": f"{attribute.size} MB",
-                    "Tags": attribute.tags,
+        self._sync()
+        entries = self._dict
+        if entries is None:
+            entries = {}
+            for dataset in self._list():
+                entries[dataset.name] = {
+                    "URL": dataset.url,
+                    "Description": dataset.description,
+                    "Citation": dataset.citation,
+                    "License": dataset.license,
+                    "Hash": dataset.hash,
+                    "File size": f"{dataset.size} MB",
+                    "Tags": dataset.tags,
                 }
-        return entries
+            self._dict = entries
+        return {
+            name: {**fields, "Tags": list(fields["Tags"])}
+            for name, fields in entries.items()
+        }
+
+    def download_all(
+        self,
+        path: str | Path | None = None,
+        max_workers: int = 4,
+        max_per_host: int = 2,
+        progressbar: bool = True,
+        connections: int = 1,
+        force_verify: bool = False,
+        stream_extract: bool = False,
+        extract_workers: int | None = None,
+    ) -> dict[str, Any]:
+        """Download all datasets of the portfolio concurrently.
+
+        See `PortfolioManager.download_many` for details.
+
+        Parameters
+        ----------
+        path : str | Path | None
+            Path to the folder in which to download the datasets. Defaults to
+            None, in which case the system's cache folder is used.
+        max_workers : int
+            Maximum number of concurrent downloads, by default 4.
+        max_per_host : int
+            Maximum number of concurrent downloads from the same host, by
+            default 2.
+        progressbar : bool
+            Whether to display an aggregated progress bar, by default True.
+        connections : int
+            Number of parallel connections used to download each file, by
+            default 1.
+        force_verify : bool
+            Whether to hash existing files even if they were already verified,
+            by default False.
+        stream_extract : bool
+            Whether to extract the archives while they are downloaded, by default
+            False.
+        extract_workers : int | None
+            Number of threads extracting each zip archive, by default None.
+
+        Returns
+        -------
+        dict[str, Any]
+            Dictionary mapping the registry name of each dataset to the path(s)
+            returned by its download.
+        """
+        # lazy import, as pooch does, to speed up import time
+        from .utils.batch_download import download_many
+
+        return download_many(
+            self._datasets,
+            path=path,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            progressbar=progressbar,
+            connections=connections,
+            force_verify=force_verify,
+            stream_extract=stream_extract,
+            extract_workers=extract_workers,
+        )
 
     def __str__(self) -> str:
         """String representation of a portfolio.
@@ -177,128 +357,118 @@ class DenoiSeg(IterablePortfolio):
 
     Attributes
     ----------
-        DSB2018_n0 (DSB2018): DSB2018 dataset with noise level 0.
-        DSB2018_n10 (DSB2018): DSB2018 dataset with noise level 10.
-        DSB2018_n20 (DSB2018): DSB2018 dataset with noise level 20.
-        Flywing_n0 (SegFlywing): Flywing dataset with noise level 0.
-        Flywing_n10 (SegFlywing): Flywing dataset with noise level 10.
-        Flywing_n20 (SegFlywing): Flywing dataset with noise level 20.
-        MouseNuclei_n0 (MouseNuclei): MouseNuclei dataset with noise level 0.
-        MouseNuclei_n10 (MouseNuclei): MouseNuclei dataset with noise level 10.
-        MouseNuclei_n20 (MouseNuclei): MouseNuclei dataset with noise level 20.
+        DSB2018_n0 (PortfolioEntry): DSB2018 dataset with noise level 0.
+        DSB2018_n10 (PortfolioEntry): DSB2018 dataset with noise level 10.
+        DSB2018_n20 (PortfolioEntry): DSB2018 dataset with noise level 20.
+        Flywing_n0 (PortfolioEntry): Flywing dataset with noise level 0.
+        Flywing_n10 (PortfolioEntry): Flywing dataset with noise level 10.
+        Flywing_n20 (PortfolioEntry): Flywing dataset with noise level 20.
+        MouseNuclei_n0 (PortfolioEntry): MouseNuclei dataset with noise level 0.
+        MouseNuclei_n10 (PortfolioEntry): MouseNuclei dataset with noise level 10.
+        MouseNuclei_n20 (PortfolioEntry): MouseNuclei dataset with noise level 20.
     """
 
     def __init__(self) -> None:
-        self._DSB2018_n0 = DSB2018(NoiseLevel.N0)
-        self._DSB2018_n10 = DSB2018(NoiseLevel.N10)
-        self._DSB2018_n20 = DSB2018(NoiseLevel.N20)
-        self._SegFlywing_n0 = SegFlywing(NoiseLevel.N0)
-        self._SegFlywing_n10 = SegFlywing(NoiseLevel.N10)
-        self._SegFlywing_n20 = SegFlywing(NoiseLevel.N20)
-        self._MouseNuclei_n0 = MouseNuclei(NoiseLevel.N0)
-        self._MouseNuclei_n10 = MouseNuclei(NoiseLevel.N10)
-        self._MouseNuclei_n20 = MouseNuclei(NoiseLevel.N20)
-
         super().__init__(DENOISEG)
 
     @property
-    def DSB2018_n0(self) -> DSB2018:
+    def DSB2018_n0(self) -> PortfolioEntry:
         """DSB2018 dataset with noise level 0.
 
         Returns
         -------
-        DSB2018
+        PortfolioEntry
             DSB2018 dataset with noise level 0.
         """
-        return self._DSB2018_n0
+        return self._entry("DSB2018_n0")
 
     @property
-    def DSB2018_n10(self) -> DSB2018:
+    def DSB2018_n10(self) -> PortfolioEntry:
         """DSB2018 dataset with noise level 10.
 
         Returns
         -------
-        DSB2018
+        PortfolioEntry
             DSB2018 dataset with noise level 10.
         """
-        return self._DSB2018_n10
+        return self._entry("DSB2018_n10")
 
     @property
-    def DSB2018_n20(self) -> DSB2018:
+    def DSB2018_n20(self) -> PortfolioEntry:
         """DSB2018 dataset with noise level 20.
 
         Returns
         -------
-        DSB2018
+        PortfolioEntry
             DSB2018 dataset with noise level 20.
         """
-        return self._DSB2018_n20
+        return self._entry("DSB2018_n20")
 
     @property
-    def Flywing_n0(self) -> SegFlywing:
+    def Flywing_n0(self) -> PortfolioEntry:
         """Flywing dataset with noise level 0.
 
         Returns
         -------
-        SegFlywing
+        PortfolioEntry
             Flywing dataset with noise level 0.
         """
-        return self._SegFlywing_n0
+        return self._entry("Flywing_n0")
 
     @property
-    def Flywing_n10(self) -> SegFlywing:
+    def Flywing_n10(self) -> PortfolioEntry:
         """Flywing dataset with noise level 10.
 
         Returns
         -------
-        SegFlywing
+        PortfolioEntry
             Flywing dataset with noise level 10.
         """
-        return self._SegFlywing_n10
+        return self._entry("Flywing_n10")
 
     @property
-    def Flywing_n20(self) -> SegFlywing:
+    def Flywing_n20(self) -> PortfolioEntry:
         """Flywing dataset with noise level 20.
 
         Returns
         -------
-        SegFlywing
+        PortfolioEntry
             Flywing dataset with noise level 20.
         """
-        return self._SegFlywing_n20
+        return self._entry("Flywing_n20")
 
     @property
-    def MouseNuclei_n0(self) -> MouseNuclei:
+    def MouseNuclei_n0(self) -> PortfolioEntry:
         """MouseNuclei dataset with noise level 0.
 
         Returns
         -------
-        MouseNuclei
+        PortfolioEntry
             MouseNuclei dataset with noise level 0.
         """
-        return self._MouseNuclei_n0
+        return self._entry("MouseNuclei_n0")
 
     @property
-    def MouseNuclei_n10(self) -> MouseNuclei:
+    def MouseNuclei_n10(self) -> PortfolioEntry:
         """MouseNuclei dataset with noise level 10.
 
         Returns
         -------
-        MouseNuclei
+        PortfolioEntry
             MouseNuclei dataset with noise level 10.
         """
-        return self._MouseNuclei_n10
+        return self._entry("MouseNuclei_n10")
 
     @property
-    def MouseNuclei_n20(self) -> MouseNuclei:
+    def MouseNuclei_n20(self) -> PortfolioEntry:
         """MouseNuclei dataset with noise level 20.
 
         Returns
         -------
-        MouseNuclei
+        PortfolioEntry
             MouseNuclei dataset with noise level 20.
         """
-        return self._MouseNuclei_n20
+        return self._entry("MouseNuclei_n20")
 
 
 class Denoising(IterablePortfolio):
@@ -306,114 +476,105 @@ class Denoising(IterablePortfolio):
 
     Attributes
     ----------
-    N2V_BSD68 (N2V_BSD68): BSD68 dataset.
-    N2V_SEM (N2V_SEM): SEM dataset.
-    N2V_RGB (N2V_RGB): RGB dataset.
-    flywing (Flywing): Flywing dataset.
-    Convallaria (Convallaria): Convallaria dataset.
-    CARE_U2OS (CARE_U2OS): CARE_U2OS dataset.
-    Tribolium (Tribolium): Tribolium dataset.
+    N2V_BSD68 (PortfolioEntry): BSD68 dataset.
+    N2V_SEM (PortfolioEntry): SEM dataset.
+    N2V_RGB (PortfolioEntry): RGB dataset.
+    Flywing (PortfolioEntry): Flywing dataset.
+    Convallaria (PortfolioEntry): Convallaria dataset.
+    CARE_U2OS (PortfolioEntry): CARE_U2OS dataset.
+    Tribolium (PortfolioEntry): Tribolium dataset.
     """
 
     def __init__(self) -> None:
-        self._N2N_SEM = N2N_SEM()
-        self._N2V_BSD68 = N2V_BSD68()
-        self._N2V_SEM = N2V_SEM()
-        self._N2V_RGB = N2V_RGB()
-        self._flywing = Flywing()
-        self._Convallaria = Convallaria()
-        self._CARE_U2OS = CARE_U2OS()
-        self._Tribolium = Tribolium()
-
         super().__init__(DENOISING)
 
     @property
-    def N2N_SEM(self) -> N2N_SEM:
+    def N2N_SEM(self) -> PortfolioEntry:
         """SEM dataset.
 
         Returns
         -------
-        N2N_SEM
+        PortfolioEntry
             SEM dataset.
         """
-        return self._N2N_SEM
+        return self._entry("N2N_SEM")
 
     @property
-    def N2V_BSD68(self) -> N2V_BSD68:
+    def N2V_BSD68(self) -> PortfolioEntry:
         """BSD68 dataset.
 
         Returns
         -------
-        N2V_BSD68
+        PortfolioEntry
             BSD68 dataset.
         """
-        return self._N2V_BSD68
+        return self._entry("N2V_BSD68")
 
     @property
-    def N2V_SEM(self) -> N2V_SEM:
+    def N2V_SEM(self) -> PortfolioEntry:
         """SEM dataset.
 
         Returns
         -------
-        N2V_SEM
+        PortfolioEntry
             SEM dataset.
         """
-        return self._N2V_SEM
+        return self._entry("N2V_SEM")
 
     @property
-    def N2V_RGB(self) -> N2V_RGB:
+    def N2V_RGB(self) -> PortfolioEntry:
         """RGB dataset.
 
         Returns
         -------
-        N2V_RGB
+        PortfolioEntry
             RGB dataset.
         """
-        return self._N2V_RGB
+        return self._entry("N2V_RGB")
 
     @property
-    def Flywing(self) -> Flywing:
+    def Flywing(self) -> PortfolioEntry:
         """Flywing dataset.
 
         Returns
         -------
-        Flywing
+        PortfolioEntry
             Flywing dataset.
         """
-        return self._flywing
+        return self._entry("Flywing")
 
     @property
-    def Convallaria(self) -> Convallaria:
+    def Convallaria(self) -> PortfolioEntry:
         """Convallaria dataset.
 
         Returns
         -------
-        Convallaria
+        PortfolioEntry
             Convallaria dataset.
         """
-        return self._Convallaria
+        return self._entry("Convallaria")
 
     @property
-    def CARE_U2OS(self) -> CARE_U2OS:
+    def CARE_U2OS(self) -> PortfolioEntry:
         """CARE_U2OS dataset.
 
         Returns
         -------
-        CARE_U2OS
+        PortfolioEntry
             CARE_U2OS dataset.
         """
-        return self._CARE_U2OS
+        return self._entry("CARE_U2OS")
 
     @property
-    def Tribolium(self) -> Tribolium:
+    def Tribolium(self) -> PortfolioEntry:
         """Tribolium dataset.
 
         Returns
         -------
-        Tribolium
+        PortfolioEntry
             Tribolium dataset.
         """
-        return self._Tribolium
+        return self._entry("Tribolium")
 
 
 @dataclass
@@ -427,8 +588,12 @@ class PortfolioManager:
     """
 
     def __init__(self) -> None:
-        self._denoising = Denoising()
-        self._denoiseg = DenoiSeg()
+        # portfolios are created on first access
+        self._denoising: Denoising | None = None
+        self._denoiseg: DenoiSeg | None = None
+
+        # JSON representation, along with the version of the catalog
+        self._json: tuple[int, str] | None = None
         # self._segmentation = Segmentation()
 
     @property
@@ -440,6 +605,8 @@ class PortfolioManager:
         Denoising
             Denoising datasets.
         """
+        if self._denoising is None:
+            self._denoising = Denoising()
         return self._denoising
 
     @property
@@ -451,6 +618,8 @@ class PortfolioManager:
         DenoiSeg
             DenoiSeg datasets.
         """
+        if self._denoiseg is None:
+            self._denoiseg = DenoiSeg()
         return self._denoiseg
 
     def __str__(self) -> str:
@@ -480,13 +649,229 @@ class PortfolioManager:
         dict[str, IterablePortfolio]
             Portfolio as dictionary.
         """
-        attributes = {}
+        portfolios: list[IterablePortfolio] = [self.denoising, self.denoiseg]
+        return {portfolio.name: portfolio for portfolio in portfolios}
+
+    def search(
+        self,
+        tags: Iterable[str] | None = None,
+        max_size_mb: float | None = None,
+        text: str | None = None,
+    ) -> list[PortfolioEntry]:
+        """Search the datasets of all portfolios.
+
+        The search uses the inverted indices of the catalog, built once on the
+        first search, rather than scanning all datasets.
+
+        Parameters
+        ----------
+        tags : Iterable[str] | None
+            Tags that the datasets must all have, case insensitive, e.g.
+            ["denoising", "fluorescence"], by default None.
+        max_size_mb : float | None
+            Maximum size of the datasets in MB, by default None.
+        text : str | None
+            Words that must all appear in the name, description or tags of the
+            datasets, case insensitive, by default None.
+
+        Returns
+        -------
+        list[PortfolioEntry]
+            Matching datasets, in the order of the catalog.
+        """
+        portfolios = self.as_dict()
+        catalog = get_catalog()
+        for iterable in portfolios.values():
+            iterable._sync()
+
+        results = []
+        for registry_name in catalog.search(tags, max_size_mb, text, portfolios):
+            portfolio, name = registry_name.split("-", 1)
+            results.append(portfolios[portfolio]._get(name))
+        return results
+
+    def download_many(
+        self,
+        entries: Iterable[PortfolioEntry],
+        path: str | Path | None = None,
+        max_workers: int = 4,
+        max_per_host: int = 2,
+        progressbar: bool = True,
+        connections: int = 1,
+        force_verify: bool = False,
+        stream_extract: bool = False,
+        extract_workers: int | None = None,
+    ) -> dict[str, Any]:
+        """Download several datasets concurrently.
+
+        All downloads share the same pooch object and run on a thread pool, with
+        at most `max_per_host` simultaneous downloads from the same server. A
+        single progress bar aggregates the progress of all downloads.
 
-        for attribute in vars(self).values():
-            if isinstance(attribute, IterablePortfolio):
-                attributes[attribute.name] = attribute
+        Parameters
+        ----------
+        entries : Iterable[PortfolioEntry]
+            Datasets to download, possibly from different portfolios.
+        path : str | Path | None
+            Path to the folder in which to download the datasets. Defaults to
+            None, in which case the system's cache folder is used.
+        max_workers : int
+            Maximum number of concurrent downloads, by default 4.
+        max_per_host : int
+            Maximum number of concurrent downloads from the same host, by
+            default 2.
+        progressbar : bool
+            Whether to display an aggregated progress bar, by default True.
+        connections : int
+            Number of parallel connections used to download each file, by
+            default 1.
+        force_verify : bool
+            Whether to hash existing files even if they were already verified,
+            by default False.
+        stream_extract : bool
+            Whether to extract the archives while they are downloaded, by default
+            False.
+        extract_workers : int | None
+            Number of threads extracting each zip archive, by default None.
 
-        return attributes
+        Returns
+        -------
+        dict[str, Any]
+            Dictionary mapping the registry name of each dataset to the path(s)
+            returned by its download.
+        """
+        from .utils.batch_download import download_many
+
+        return download_many(
+            entries,
+            path=path,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            progressbar=progressbar,
+            connections=connections,
+            force_verify=force_verify,
+            stream_extract=stream_extract,
+            extract_workers=extract_workers,
+        )
+
+    def build_mirror(
+        self,
+        path: str | Path,
+        entries: Iterable[PortfolioEntry] | None = None,
+        cache: str | Path | None = None,
+        as_tar: bool = False,
+        connections: int = 1,
+    ) -> Path:
+        """Write the files of datasets to a mirror, e.g. for offline machines.
+
+        The mirror holds the downloaded files under their registry name, along
+        with a `registry.txt` whose URLs are relative to the mirror. A mirror,
+        served over HTTP or accessed as a local folder or tar file, is used by
+        setting the `CAREAMICS_PORTFOLIO_MIRRORS` environment variable or the
+        `mirrors` parameter of `get_poochfolio`.
+
+        Parameters
+        ----------
+        path : str | Path
+            Folder of the mirror, or path to the tar file if `as_tar` is True.
+        entries : Iterable[PortfolioEntry] | None
+            Datasets to include in the mirror, by default None, in which case
+            all datasets of all portfolios are included.
+        cache : str | Path | None
+            Cache folder in which the files are downloaded, unless they are
+            already there. Defaults to None, in which case the system's cache
+            folder is used.
+        as_tar : bool
+            Whether to write the mirror as a single uncompressed tar file, by
+            default False.
+        connections : int
+            Number of parallel connections used to download each file, by
+            default 1.
+
+        Returns
+        -------
+        Path
+            Path to the mirror.
+        """
+        from .utils.mirror import build_mirror
+
+        if entries is None:
+            entries = [
+                entry for portfolio in self.as_dict().values() for entry in portfolio
+            ]
+
+        return build_mirror(
+            entries, path, cache=cache, as_tar=as_tar, connections=connections
+        )
+
+    def verify(
+        self,
+        path: str | Path | None = None,
+        max_workers: int = 4,
+        force_verify: bool = False,
+    ) -> dict[str, bool]:
+        """Check the integrity of all downloaded datasets.
+
+        The downloaded files are hashed concurrently, since hashing releases the
+        GIL, and compared to the hashes of the entries. Files that were already
+        verified and did not change since are not hashed again, unless
+        `force_verify` is True. Datasets that were not downloaded are ignored,
+        and extractions whose archive was deleted are checked against their
+        manifest, see `PortfolioEntry.verify`.
+
+        Parameters
+        ----------
+        path : str | Path | None
+            Path to the folder in which the datasets were downloaded. Defaults
+            to None, in which case the system's cache folder is used.
+        max_workers : int
+            Maximum number of files hashed concurrently, by default 4.
+        force_verify : bool
+            Whether to hash all files, even those already verified, by default
+            False.
+
+        Returns
+        -------
+        dict[str, bool]
+            Dictionary mapping the registry name of each downloaded dataset to
+            whether its file matches its hash.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        root = Path(get_poochfolio(path).abspath)
+        entries = [
+            entry
+            for portfolio in self.as_dict().values()
+            for entry in portfolio
+            if (root / entry.get_registry_name()).exists()
+            or (root / (entry.get_registry_name() + MANIFEST_SUFFIX)).exists()
+        ]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda entry: entry.verify(root, force_verify=force_verify),
+                entries,
+            )
+            return {
+                entry.get_registry_name(): result
+                for entry, result in zip(entries, results)
+            }
+
+    def as_json(self) -> str:
+        """Portfolio as json, computed once per version of the catalog.
+
+        Returns
+        -------
+        str
+            JSON representation of the `as_dict` method.
+        """
+        version = get_catalog().version
+        if self._json is None or self._json[0] != version:
+            self._json = (
+                version,
+                json.dumps(self.as_dict(), indent=4, cls=ItarablePortfolioEncoder),
+            )
+        return self._json[1]
 
     def to_json(self, path: str | Path) -> None:
         """Save portfolio to json file using the `as_dict` method.
@@ -497,7 +882,7 @@ class PortfolioManager:
             Path to json file.
         """
         with open(path, "w") as f:
-            json.dump(self.as_dict(), f, indent=4, cls=ItarablePortfolioEncoder)
+            f.write(self.as_json())
 
     def to_registry(self, path: str | Path) -> None:
         """Save portfolio as registry (Pooch).
@@ -512,7 +897,10 @@ class PortfolioManager:
         portfolios = self.as_dict()
         with open(path, "w") as file:
             file.write("# Portfolio datasets - pooch registry\n")
-            file.write("# Generated by running " "scripts/update_registry.py\n\n")
+            file.write(
+                "# Generated from catalog.json by running "
+                "scripts/update_registry.py\n\n"
+            )
 
             # write each portfolio
             for key in portfolios.keys():
@@ -525,20 +913,24 @@ class PortfolioManager:
 
             # add pale blue dot for testing purposes
             file.write("# Test sample\n")
-            pale_blue_dot = PaleBlueDot()
-            file.write(
-                f"{pale_blue_dot.get_registry_name()} "
-                f"{pale_blue_dot.hash} {pale_blue_dot.url}\n"
-            )
-            pale_blue_dot_zip = PaleBlueDotZip()
-            file.write(
-                f"{pale_blue_dot_zip.get_registry_name()} "
-                f"{pale_blue_dot_zip.hash} {pale_blue_dot_zip.url}\n"
-            )
+            for entry in IterablePortfolio("test"):
+                file.write(f"{entry.get_registry_name()} {entry.hash} {entry.url}\n")
 
 
 def update_registry(path: str | Path | None = None) -> None:
-    """Update the registry.txt file."""
+    """Update the registry.txt file from the catalog.
+
+    The registry is derived from `catalog.json`, the single source of the
+    portfolio entries.
+
+    Parameters
+    ----------
+    path : str | Path | None
+        Path to the registry, by default None, in which case the registry of the
+        package is updated.
+    """
+    from .utils.download_utils import get_registry_path
+
     if path is None:
         path = get_registry_path()
 
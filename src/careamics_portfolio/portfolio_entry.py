@@ -1,9 +1,33 @@
+import json
 from pathlib import Path
-from typing import Any, List, Optional, Union
-
-from pooch import Unzip
-
-from .utils import get_poochfolio
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Union
+from urllib.parse import urlparse
+
+from .utils.arrays import (
+    ARRAY_SUFFIXES,
+    LazyArray,
+    load_arrays,
+    open_npy_cache,
+    write_npy_cache,
+)
+from .utils.blob_store import BlobStore
+from .utils.chunked_store import ZarrArray, open_store, write_store
+from .utils.downloaders import RangeDownloader
+from .utils.locking import FileLock
+from .utils.manifest import MANIFEST_SUFFIX, check_manifest, write_manifest
+from .utils.patches import iter_patches
+from .utils.processors import (
+    ArchiveExtractor,
+    ArchiveFormat,
+    ParallelUnzip,
+    StreamingExtractor,
+)
+from .utils.statistics import PERCENTILES, cached_stats, compute_stats
+from .utils.verification_index import get_verification_index
+from .utils.zip_reader import ZipReader
+
+if TYPE_CHECKING:
+    from pooch import Pooch
 
 
 class PortfolioEntry:
@@ -21,9 +45,33 @@ class PortfolioEntry:
         hash (str): SHA256 hash of the downloaded file.
         size (int): Size of the dataset in MB.
         tags (list[str]): List of tags associated to the dataset.
-        is_zip (bool): Whether the dataset is a zip file.
+        is_zip (bool): Whether the dataset is an archive (zip or tar).
+        archive_format (ArchiveFormat): Format of the downloaded file.
+
+    Entries are immutable records, identified by their registry name. Their
+    dictionary, JSON and string representations are computed once, on first
+    use.
     """
 
+    __slots__ = (
+        "_archive_format",
+        "_citation",
+        "_description",
+        "_dict",
+        "_file_name",
+        "_frozen",
+        "_hash",
+        "_json",
+        "_license",
+        "_name",
+        "_portfolio",
+        "_registry_name",
+        "_size",
+        "_str",
+        "_tags",
+        "_url",
+    )
+
     def __init__(
         self,
         portfolio: str,
@@ -37,6 +85,7 @@ class PortfolioEntry:
         size: float,
         tags: List[str],
         is_zip: bool = True,
+        archive_format: Optional[Union[str, ArchiveFormat]] = None,
         **kwargs: str,
     ) -> None:
         self._portfolio = portfolio
@@ -52,8 +101,82 @@ class PortfolioEntry:
         self._file_name = file_name
         self._hash = sha256
         self._size = size
-        self._tags = tags
-        self._is_zip = is_zip
+        self._tags = tuple(tags)
+
+        # `is_zip` predates the archive format and flags any archive
+        if archive_format is not None:
+            self._archive_format = ArchiveFormat(archive_format)
+        elif is_zip:
+            self._archive_format = ArchiveFormat.from_file_name(file_name)
+            if self._archive_format == ArchiveFormat.NONE:
+                self._archive_format = ArchiveFormat.ZIP
+        else:
+            self._archive_format = ArchiveFormat.NONE
+
+        self._registry_name = portfolio + "-" + name
+        self._dict: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
+        self._str: Optional[str] = None
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent modifying an entry once initialized.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute.
+        value : Any
+            Value of the attribute.
+
+        Raises
+        ------
+        AttributeError
+            If the entry is initialized.
+        """
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{type(self).__name__} is immutable.")
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state: Any) -> None:
+        """Restore an entry, e.g. when unpickling or copying it.
+
+        Parameters
+        ----------
+        state : Any
+            Default state of an object with `__slots__`, a tuple of the instance
+            dictionary, if any, and of the slots values.
+        """
+        instance, slots = state if isinstance(state, tuple) else (state, None)
+        for key, value in {**(instance or {}), **(slots or {})}.items():
+            object.__setattr__(self, key, value)
+
+    def __eq__(self, other: object) -> bool:
+        """Whether two entries have the same registry name.
+
+        Parameters
+        ----------
+        other : object
+            Object to compare with.
+
+        Returns
+        -------
+        bool
+            Whether both entries have the same registry name.
+        """
+        if not isinstance(other, PortfolioEntry):
+            return NotImplemented
+        return self._registry_name == other._registry_name
+
+    def __hash__(self) -> int:
+        """Hash of the registry name.
+
+        Returns
+        -------
+        int
+            Hash of the registry name.
+        """
+        return hash(self._registry_name)
 
     @property
     def portfolio(self) -> str:
@@ -163,18 +286,33 @@ class PortfolioEntry:
         List[str]
             List of tags associated to the dataset.
         """
-        return self._tags
+        return list(self._tags)
 
     @property
     def is_zip(self) -> bool:
-        """Whether the dataset is a zip file.
+        """Whether the dataset is an archive, of any format.
+
+        The name predates the support of other archive formats than zip, see
+        `archive_format` for the format itself.
 
         Returns
         -------
         bool
-            Whether the dataset is a zip file.
+            Whether the dataset is an archive.
+        """
+        return self._archive_format is not ArchiveFormat.NONE
+
+    @property
+    def archive_format(self) -> ArchiveFormat:
+        """Format of the downloaded file.
+
+        Returns
+        -------
+        ArchiveFormat
+            Format of the downloaded file, `ArchiveFormat.NONE` if it is not an
+            archive.
         """
-        return self._is_zip
+        return self._archive_format
 
     def __str__(self) -> str:
         """Convert PortfolioEntry to a string.
@@ -183,7 +321,11 @@ class PortfolioEntry:
         -------
         str: A string containing the PortfolioEntry attributes.
         """
-        return str(self.to_dict())
+        string = self._str
+        if string is None:
+            string = str(self._cached_dict())
+            object.__setattr__(self, "_str", string)
+        return string
 
     def get_registry_name(self) -> str:
         """Return the name of the entry in the global registry.
@@ -193,30 +335,68 @@ class PortfolioEntry:
         str
             Name of the entry.
         """
-        return self.portfolio + "-" + self.name
+        return self._registry_name
 
     def to_dict(self) -> dict:
         """Convert PortfolioEntry to a dictionary.
 
+        The dictionary is computed once, and a copy of it is returned.
+
         Returns
         -------
             dict: A dictionary containing the PortfolioEntry attributes.
         """
-        return {
-            "name": self.name,
-            "url": self.url,
-            "description": self.description,
-            "license": self.license,
-            "citation": self.citation,
-            "file_name": self.file_name,
-            "hash": self.hash,
-            "size": self.size,
-            "tags": self.tags,
-        }
+        entry = self._cached_dict()
+        return {**entry, "tags": list(entry["tags"])}
+
+    def _cached_dict(self) -> Dict[str, Any]:
+        """Dictionary representation of the entry, computed once.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary shared by all calls, which must not be modified.
+        """
+        entry = self._dict
+        if entry is None:
+            entry = {
+                "name": self.name,
+                "url": self.url,
+                "description": self.description,
+                "license": self.license,
+                "citation": self.citation,
+                "file_name": self.file_name,
+                "hash": self.hash,
+                "size": self.size,
+                "tags": self.tags,
+            }
+            object.__setattr__(self, "_dict", entry)
+        return entry
+
+    def to_json(self) -> str:
+        """Convert PortfolioEntry to a JSON string, computed once.
+
+        Returns
+        -------
+        str
+            JSON representation of `to_dict`.
+        """
+        string = self._json
+        if string is None:
+            string = json.dumps(self._cached_dict())
+            object.__setattr__(self, "_json", string)
+        return string
 
     def download(
         self,
         path: Optional[Union[str, Path]] = None,
+        connections: int = 1,
+        force_verify: bool = False,
+        stream_extract: bool = False,
+        extract_workers: Optional[int] = None,
+        members: Optional[List[str]] = None,
+        keep_archive: bool = True,
+        deduplicate: bool = False,
     ) -> Union[List[str], Any]:
         """Download dataset in the specified path.
 
@@ -229,23 +409,608 @@ class PortfolioEntry:
         path : str | Path
             Path to the folder in which to download the dataset. Defaults to
             None.
+        connections : int
+            Number of parallel connections used to download the file. If larger
+            than 1, the file is split in byte ranges downloaded in parallel,
+            provided the server supports range requests. Defaults to 1.
+        force_verify : bool
+            Whether to hash an existing file even if it was already verified and
+            did not change since. Defaults to False.
+        stream_extract : bool
+            Whether to extract the archive while it is downloaded, rather than
+            once the download is complete, see `StreamingExtractor`. Defaults to
+            False.
+        extract_workers : int | None
+            Number of threads inflating the members of a zip archive
+            concurrently, see `ParallelUnzip`. Defaults to None, in which case
+            the members are extracted one after the other. Ignored if
+            `stream_extract` is True.
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract (e.g.
+            `["**/test/*.tif"]`), `**` matching any number of folders. Members
+            extracted by a previous call are not extracted again. Defaults to
+            None, in which case all members are extracted.
+        keep_archive : bool
+            Whether to keep the archive once extracted. If False, the extraction
+            is checked against the archive and recorded in a manifest (size and
+            CRC32 of each file) before the archive is deleted. Defaults to True.
+        deduplicate : bool
+            Whether to store the downloaded file and the extracted files in the
+            content-addressed store of the cache folder, see `BlobStore`, so
+            that identical files of different entries are stored once. Defaults
+            to False.
+
+        Notes
+        -----
+        If the server supports range requests, interrupted downloads are
+        resumed by the next call to `download`.
+
+        If the archive was deleted after its extraction, the extraction is
+        checked against its manifest instead of downloading the archive again,
+        by size or, if `force_verify` is True, by checksum. The archive is only
+        downloaded again if selected members are missing or differ.
+
+        Existing files are only hashed if they were modified since they were
+        last verified, see `VerificationIndex`.
 
         Returns
         -------
         List[str]
             List of path(s) to the downloaded file(s).
         """
-        poochfolio = get_poochfolio(path)
+        # lazy import, as pooch does, to speed up import time
+        from .utils.download_utils import get_poochfolio
+
+        return self._fetch(
+            get_poochfolio(path),
+            progressbar=True,
+            connections=connections,
+            force_verify=force_verify,
+            stream_extract=stream_extract,
+            extract_workers=extract_workers,
+            members=members,
+            keep_archive=keep_archive,
+            deduplicate=deduplicate,
+        )
+
+    def _fetch(
+        self,
+        poochfolio: "Pooch",
+        progressbar: Union[bool, Any] = True,
+        connections: int = 1,
+        force_verify: bool = False,
+        stream_extract: bool = False,
+        extract_workers: Optional[int] = None,
+        members: Optional[List[str]] = None,
+        extract: bool = True,
+        keep_archive: bool = True,
+        deduplicate: bool = False,
+    ) -> Union[List[str], Any]:
+        """Fetch the dataset using an existing pooch object.
+
+        Parameters
+        ----------
+        poochfolio : Pooch
+            Pooch object of the portfolio.
+        progressbar : bool | Any
+            Whether to display a progress bar, or a pooch-compatible progress bar
+            object. Defaults to True.
+        connections : int
+            Number of parallel connections used to download the file. Defaults
+            to 1.
+        force_verify : bool
+            Whether to hash an existing file even if it was already verified.
+            Defaults to False.
+        stream_extract : bool
+            Whether to extract the archive while it is downloaded. Defaults to
+            False.
+        extract_workers : int | None
+            Number of threads extracting a zip archive. Defaults to None.
+        members : List[str] | None
+            Glob patterns selecting the members to extract. Defaults to None.
+        extract : bool
+            Whether to extract archives. Defaults to True.
+        keep_archive : bool
+            Whether to keep the archive once extracted. Defaults to True.
+        deduplicate : bool
+            Whether to link the files to the content-addressed store. Defaults
+            to False.
+
+        Returns
+        -------
+        List[str]
+            List of path(s) to the downloaded file(s).
 
-        # download data
-        if self.is_zip:
-            return poochfolio.fetch(
-                fname=self.get_registry_name(),
-                processor=Unzip(),
-                progressbar=True,
+        Raises
+        ------
+        ValueError
+            If `members` is set and the dataset is not an archive.
+        """
+        # lazy import, as pooch does, to speed up import time
+        from .utils.cache_manager import TOUCH_INTERVAL, CacheManager, get_budget
+        from .utils.download_utils import fetch
+
+        if members is not None and self.archive_format == ArchiveFormat.NONE:
+            raise ValueError(f"{self.name} is not an archive, members cannot be set.")
+
+        # partial downloads are kept next to the cached file, in order to be
+        # resumed by the next call
+        registry_name = self.get_registry_name()
+        archive = Path(poochfolio.abspath) / registry_name
+        downloader = RangeDownloader(
+            connections=connections,
+            progressbar=progressbar,
+            partial_file=archive.with_name(f"{registry_name}.part"),
+        )
+
+        # the archive is kept as is if it is not extracted
+        archive_format = self.archive_format if extract else ArchiveFormat.NONE
+
+        processor: Any = None
+        if stream_extract and archive_format != ArchiveFormat.NONE:
+            # the extractor consumes the download and then acts as processor
+            processor = StreamingExtractor(archive, archive_format, members)
+            downloader.sink = processor
+        elif archive_format == ArchiveFormat.ZIP and extract_workers:
+            processor = ParallelUnzip(
+                extract_workers, progressbar=progressbar is True, members=members
             )
+        elif archive_format != ArchiveFormat.NONE:
+            processor = ArchiveExtractor(archive_format, members)
+
+        # pooch action ("download", "update" or "fetch") of the file
+        actions: List[str] = []
+
+        def process(fname: str, action: str, pooch: "Pooch") -> Any:
+            actions.append(action)
+            return fname if processor is None else processor(fname, action, pooch)
+
+        # download data, a single process or thread at a time, the others
+        # reusing the verified file and extraction
+        with FileLock(archive.with_name(f"{registry_name}.lock")):
+            store = BlobStore(poochfolio.abspath)
+            if deduplicate and not archive.exists() and store.link(self.hash, archive):
+                # identical file stored for another registry name
+                get_verification_index(poochfolio.abspath).add(
+                    registry_name, archive, self.hash
+                )
+
+            paths = None
+            extracted = True
+            manifest = archive.with_name(registry_name + MANIFEST_SUFFIX)
+            if archive_format != ArchiveFormat.NONE:
+                extract_dir = archive.with_name(
+                    registry_name + ArchiveExtractor(archive_format).suffix
+                )
+                extracted = extract_dir.exists()
+                if not archive.exists():
+                    # the archive may have been deleted after its extraction
+                    paths = check_manifest(
+                        manifest, extract_dir, self.hash, members, force_verify
+                    )
+
+            if paths is None:
+                manifest.unlink(missing_ok=True)
+                paths = fetch(
+                    poochfolio,
+                    fname=registry_name,
+                    processor=process,
+                    downloader=downloader,
+                    force_verify=force_verify,
+                )
+
+                if deduplicate:
+                    if archive_format != ArchiveFormat.NONE:
+                        store.deduplicate(extract_dir)
+                    if keep_archive or archive_format == ArchiveFormat.NONE:
+                        store.add(archive, self.hash)
+
+                if archive_format != ArchiveFormat.NONE and not keep_archive:
+                    write_manifest(
+                        manifest,
+                        archive,
+                        archive_format,
+                        extract_dir,
+                        self.hash,
+                        members,
+                    )
+                    archive.unlink()
+                    get_verification_index(poochfolio.abspath).remove(registry_name)
+
+        # record the access and, if the data was downloaded or extracted, keep
+        # the cache within its budget, if any; accesses to cached data are only
+        # recorded once in a while, without enforcing the budget
+        cache = CacheManager(poochfolio.abspath)
+        if actions and (actions[0] != "fetch" or not extracted):
+            cache.touch(registry_name)
+            if get_budget() is not None:
+                cache.enforce(keep=[registry_name])
         else:
-            return poochfolio.fetch(
-                fname=self.get_registry_name(),
-                progressbar=True,
+            cache.touch(registry_name, interval=TOUCH_INTERVAL)
+
+        return paths
+
+    def load(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        connections: int = 1,
+        members: Optional[List[str]] = None,
+    ) -> Dict[str, LazyArray]:
+        """Download the dataset and load its arrays lazily.
+
+        The `.tif`, `.tiff`, `.npy` and `.npz` files of the dataset are returned
+        as `LazyArray`, whose shape and dtype are read from the file headers,
+        and whose data is only read when indexed. The headers are cached next to
+        the files and only read again if the files change.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which to download the dataset. Defaults to
+            None, in which case the system's cache folder is used.
+        connections : int
+            Number of parallel connections used to download the file. Defaults
+            to 1.
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract and
+            load, see `download`. Defaults to None.
+
+        Returns
+        -------
+        Dict[str, LazyArray]
+            Arrays indexed by their path relative to the extraction folder,
+            followed by `/<key>` for the arrays of `.npz` files. The arrays of a
+            dataset that is not an archive are indexed by its registry name.
+
+        Raises
+        ------
+        ImportError
+            If numpy, or tifffile for tif files, is not installed.
+        ValueError
+            If the dataset is not an archive and its file is not a `.tif`,
+            `.tiff`, `.npy` or `.npz` file.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        if self.archive_format == ArchiveFormat.NONE:
+            # the file is cached under its registry name, without extension
+            suffix = Path(self.file_name).suffix or Path(urlparse(self.url).path).suffix
+            if suffix.lower() not in ARRAY_SUFFIXES:
+                raise ValueError(
+                    f"{self.name} cannot be loaded from {self.file_name}, only "
+                    f"{', '.join(ARRAY_SUFFIXES)} files are supported."
+                )
+
+            file = Path(
+                str(self.download(path, connections=connections, members=members))
             )
+            return load_arrays([file], file.parent, suffix=suffix)
+
+        files = self.download(path, connections=connections, members=members)
+        suffix = ArchiveExtractor(self.archive_format).suffix
+        root = Path(get_poochfolio(path).abspath) / (self.get_registry_name() + suffix)
+        return load_arrays(files, root)
+
+    def load_cached(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        connections: int = 1,
+        members: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Load the arrays of the dataset from a memory-mapped `.npy` cache.
+
+        The first call decodes the arrays returned by `load` into contiguous
+        `.npy` files, in a `<registry name>.npy` folder next to the downloaded
+        file. Later calls open them with `numpy.load(mmap_mode="r")` without
+        downloading, extracting or decoding anything, and processes opening the
+        same cache share its pages in memory. The cache records the hash of the
+        dataset and the selected members, and is written again if they change.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which to download the dataset. Defaults to
+            None, in which case the system's cache folder is used.
+        connections : int
+            Number of parallel connections used to download the file. Defaults
+            to 1.
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract and
+            cache, see `download`. Defaults to None.
+
+        Returns
+        -------
+        Dict[str, numpy.ndarray]
+            Read-only memory-mapped arrays, indexed as in `load`.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        cache = Path(get_poochfolio(path).abspath) / f"{self.get_registry_name()}.npy"
+        attributes = {
+            "name": self.get_registry_name(),
+            "sha256": self.hash,
+            "members": members,
+        }
+
+        arrays = open_npy_cache(cache, attributes)
+        if arrays is None:
+            with FileLock(cache.with_name(f"{cache.name}.lock")):
+                # the cache may have been written while waiting for the lock
+                arrays = open_npy_cache(cache, attributes)
+                if arrays is None:
+                    arrays = write_npy_cache(
+                        self.load(path, connections=connections, members=members),
+                        cache,
+                        attributes,
+                    )
+        return arrays
+
+    def iter_patches(
+        self,
+        patch_shape: Sequence[int],
+        stride: Optional[Sequence[int]] = None,
+        batch_size: int = 1,
+        shuffle_buffer: int = 0,
+        seed: Optional[int] = None,
+        path: Optional[Union[str, Path]] = None,
+        members: Optional[List[str]] = None,
+        prefetch: int = 2,
+    ) -> Iterator[Any]:
+        """Iterate over batches of patches of the arrays of the dataset.
+
+        The arrays returned by `load` are read one slab of patches at a time by
+        a background thread, so that memory usage does not depend on the size
+        of the dataset, see `careamics_portfolio.utils.patches.iter_patches`.
+        Patches are taken along the last axes of the arrays, e.g. `(64, 64)`
+        patches are taken from each image of a stack of 2D images.
+
+        Parameters
+        ----------
+        patch_shape : Sequence[int]
+            Shape of the patches.
+        stride : Sequence[int] | None
+            Step between patches along each patched axis. Defaults to None, in
+            which case the patches do not overlap.
+        batch_size : int
+            Number of patches per batch. Defaults to 1.
+        shuffle_buffer : int
+            Number of patches from which each patch is drawn at random. Defaults
+            to 0, in which case patches are returned in order.
+        seed : int | None
+            Seed of the random generator. Defaults to None.
+        path : str | Path
+            Path to the folder in which to download the dataset. Defaults to
+            None, in which case the system's cache folder is used.
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract and
+            read, see `download`. Defaults to None.
+        prefetch : int
+            Number of slabs read ahead. Defaults to 2.
+
+        Returns
+        -------
+        Iterator[numpy.ndarray]
+            Batches of patches, of shape `(batch_size, *patch_shape)`.
+        """
+        arrays = self.load(path, members=members)
+        return iter_patches(
+            list(arrays.values()),
+            patch_shape,
+            stride=stride,
+            batch_size=batch_size,
+            shuffle_buffer=shuffle_buffer,
+            seed=seed,
+            prefetch=prefetch,
+        )
+
+    def stats(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        channel_axis: Optional[int] = None,
+        percentiles: Sequence[float] = PERCENTILES,
+        members: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Compute normalization statistics of the arrays of the dataset.
+
+        The mean, standard deviation, minimum, maximum and percentiles of the
+        arrays returned by `load` are computed in a single pass over blocks of
+        their data, see `careamics_portfolio.utils.statistics.compute_stats`.
+        The statistics are cached in a `<registry name>.stats.json` file next to
+        the downloaded file, along with the hash of the dataset, and are only
+        computed again if the dataset or the parameters change.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which to download the dataset. Defaults to
+            None, in which case the system's cache folder is used.
+        channel_axis : int | None
+            Axis of the channels in the arrays, e.g. -1 for RGB images. Defaults
+            to None, in which case the statistics are computed over all values.
+        percentiles : Sequence[float]
+            Percentiles to compute, between 0 and 100. Defaults to (0.1, 1, 50,
+            99, 99.9).
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract and
+            include, see `download`. Defaults to None.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Number of values per channel ("count"), and for each channel "mean",
+            "std", "min", "max" and "percentiles", a mapping from percentile to
+            value.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        sidecar = Path(get_poochfolio(path).abspath) / (
+            f"{self.get_registry_name()}.stats.json"
+        )
+        parameters = {
+            "channel_axis": channel_axis,
+            "percentiles": list(percentiles),
+            "members": members,
+        }
+        with FileLock(sidecar.with_name(f"{sidecar.name}.lock")):
+            return cached_stats(
+                sidecar,
+                self.hash,
+                parameters,
+                lambda: compute_stats(
+                    list(self.load(path, members=members).values()),
+                    channel_axis=channel_axis,
+                    percentiles=percentiles,
+                ),
+            )
+
+    def to_zarr(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        chunks: Optional[Sequence[int]] = None,
+        compressor: Optional[str] = "zlib",
+        connections: int = 1,
+        members: Optional[List[str]] = None,
+    ) -> Dict[str, ZarrArray]:
+        """Convert the arrays of the dataset to a chunked and compressed store.
+
+        The arrays returned by `load` are written to a Zarr (v2) group named
+        `<registry name>.zarr`, next to the downloaded file. Random patches are
+        then read from the few chunks they overlap, instead of decompressing
+        whole images. The group records the hash of the dataset, the selected
+        members and the conversion parameters, and is only written again if
+        they change. Otherwise, its arrays are opened without downloading,
+        extracting or decoding anything.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which to download the dataset. Defaults to
+            None, in which case the system's cache folder is used.
+        chunks : Sequence[int] | None
+            Chunk shape of all arrays. Defaults to None, in which case the last
+            three axes are split in chunks of 64 pixels and the others in chunks
+            of 1, e.g. `(1, 256, 256)` is more adapted to stacks of 2D images.
+        compressor : str | None
+            Compressor of the chunks, "zlib", "zstd" (requires the `zstd` extra)
+            or None. Defaults to "zlib".
+        connections : int
+            Number of parallel connections used to download the file. Defaults
+            to 1.
+        members : List[str] | None
+            Glob patterns selecting the members of the archive to extract and
+            convert, see `download`. Defaults to None.
+
+        Returns
+        -------
+        Dict[str, ZarrArray]
+            Arrays of the store, indexed as in `load`.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        store = Path(get_poochfolio(path).abspath) / f"{self.get_registry_name()}.zarr"
+        attributes = {
+            "name": self.get_registry_name(),
+            "sha256": self.hash,
+            "members": members,
+        }
+
+        arrays = open_store(store, attributes, chunks, compressor)
+        if arrays is None:
+            with FileLock(store.with_name(f"{store.name}.lock")):
+                # the store may have been written while waiting for the lock
+                arrays = open_store(store, attributes, chunks, compressor)
+                if arrays is None:
+                    arrays = write_store(
+                        self.load(path, connections=connections, members=members),
+                        store,
+                        attributes,
+                        chunks=chunks,
+                        compressor=compressor,
+                    )
+        return arrays
+
+    def open_archive(
+        self, path: Optional[Union[str, Path]] = None, connections: int = 1
+    ) -> ZipReader:
+        """Open the zip archive of the dataset without extracting it.
+
+        The archive is downloaded if needed, but not extracted. Members stored
+        without compression are then read in place from the memory-mapped
+        archive, and compressed members are decompressed on the fly, see
+        `ZipReader`. This avoids keeping both the archive and its extracted
+        members on disk.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which the dataset is downloaded. Defaults to
+            None, in which case the system's cache folder is used.
+        connections : int
+            Number of parallel connections used to download the file. Defaults
+            to 1.
+
+        Returns
+        -------
+        ZipReader
+            Reader of the archive, to be closed after use.
+
+        Raises
+        ------
+        ValueError
+            If the dataset is not a zip archive.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        if self.archive_format != ArchiveFormat.ZIP:
+            raise ValueError(f"{self.name} is not a zip archive.")
+
+        poochfolio = get_poochfolio(path)
+        self._fetch(poochfolio, connections=connections, extract=False)
+        return ZipReader(Path(poochfolio.abspath) / self.get_registry_name())
+
+    def verify(
+        self, path: Optional[Union[str, Path]] = None, force_verify: bool = False
+    ) -> bool:
+        """Check the integrity of the downloaded file.
+
+        The file is hashed using large buffered reads and compared to the hash
+        of the entry, unless it was already verified and its size, modification
+        time and inode did not change since.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the folder in which the dataset was downloaded. Defaults to
+            None, in which case the system's cache folder is used.
+        force_verify : bool
+            Whether to hash the file even if it was already verified. Defaults
+            to False.
+
+        Returns
+        -------
+        bool
+            Whether the file was downloaded and matches the hash of the entry.
+            If the archive was deleted after its extraction, whether the
+            extracted files match its manifest, by checksum if `force_verify`
+            is True and by size otherwise.
+        """
+        from .utils.download_utils import get_poochfolio
+
+        root = Path(get_poochfolio(path).abspath)
+        registry_name = self.get_registry_name()
+        archive = root / registry_name
+        if self.archive_format != ArchiveFormat.NONE and not archive.exists():
+            extract_dir = archive.with_name(
+                registry_name + ArchiveExtractor(self.archive_format).suffix
+            )
+            files = check_manifest(
+                archive.with_name(registry_name + MANIFEST_SUFFIX),
+                extract_dir,
+                self.hash,
+                force_verify=force_verify,
+            )
+            return files is not None
+
+        return get_verification_index(root).verify(
+            registry_name, archive, self.hash, force_verify=force_verify
+        )
@@ -1,5 +1,63 @@
 """Utils functions."""
 
-__all__ = ["get_poochfolio", "get_registry_path"]
+__all__ = [
+    "fetch",
+    "get_poochfolio",
+    "get_registry_path",
+    "get_verification_index",
+    "verify",
+]
 
-from .download_utils import get_poochfolio, get_registry_path
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .download_utils import fetch, get_poochfolio, get_registry_path
+    from .hashing import verify
+    from .verification_index import get_verification_index
+
+# attributes imported on first access (PEP 562), see the package __init__
+_LAZY_ATTRIBUTES = {
+    "fetch": ".download_utils",
+    "get_poochfolio": ".download_utils",
+    "get_registry_path": ".download_utils",
+    "get_verification_index": ".verification_index",
+    "verify": ".hashing",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the public attributes of the module on first access.
+
+    Parameters
+    ----------
+    name : str
+        Name of the attribute.
+
+    Returns
+    -------
+    Any
+        Attribute of the module.
+
+    Raises
+    ------
+    AttributeError
+        If the module has no such attribute.
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the attributes of the module, including those not imported yet.
+
+    Returns
+    -------
+    List[str]
+        Attributes of the module.
+    """
+    return sorted(set(globals()) | set(__all__))
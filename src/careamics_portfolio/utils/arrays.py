@@ -0,0 +1,597 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Tuple
+
+from .zip_reader import ZipReader
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# name of the header cache in the folder of the arrays
+HEADERS_NAME = ".headers.json"
+
+# name of the manifest of the `.npy` cache, written once the cache is complete
+CACHE_MANIFEST = "manifest.json"
+
+# bytes copied at once when writing the `.npy` cache
+COPY_SIZE = 64 * 1024 * 1024
+
+# file extensions read as arrays
+ARRAY_SUFFIXES = (".tif", ".tiff", ".npy", ".npz")
+
+# (key, shape, dtype) of an array in a file, key is None for single array files
+_Header = Tuple[Any, Tuple[int, ...], str]
+
+_headers_lock = threading.Lock()
+
+
+def _import_numpy() -> Any:
+    """Import numpy, which is an optional dependency.
+
+    Returns
+    -------
+    module
+        The numpy module.
+
+    Raises
+    ------
+    ImportError
+        If numpy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Loading arrays requires the `numpy` package, install it with "
+            "`pip install careamics-portfolio[load]`."
+        ) from e
+    return numpy
+
+
+def _import_tifffile() -> Any:
+    """Import tifffile, which is an optional dependency.
+
+    Returns
+    -------
+    module
+        The tifffile module.
+
+    Raises
+    ------
+    ImportError
+        If tifffile is not installed.
+    """
+    try:
+        import tifffile  # type: ignore[import-not-found, unused-ignore]
+    except ImportError as e:
+        raise ImportError(
+            "Loading tif files requires the `tifffile` package, install it with "
+            "`pip install careamics-portfolio[load]`."
+        ) from e
+    return tifffile
+
+
+def _read_npy_header(fileobj: Any) -> tuple[tuple[int, ...], bool, np.dtype]:
+    """Read the header of a `.npy` file, leaving the file at the data offset.
+
+    Parameters
+    ----------
+    fileobj : Any
+        Binary file positioned at the start of the `.npy` file.
+
+    Returns
+    -------
+    tuple[tuple[int, ...], bool, np.dtype]
+        Shape, whether the array is in Fortran order and dtype.
+    """
+    np = _import_numpy()
+    version = np.lib.format.read_magic(fileobj)
+    if version == (1, 0):
+        header = np.lib.format.read_array_header_1_0(fileobj)
+    else:
+        header = np.lib.format.read_array_header_2_0(fileobj)
+    return header  # type: ignore[no-any-return]
+
+
+def scan_file(path: str | os.PathLike, suffix: str | None = None) -> list[_Header]:
+    """Read the shape and dtype of the arrays in a file, without their data.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to a `.tif`, `.tiff`, `.npy` or `.npz` file.
+    suffix : str | None
+        Suffix selecting the format of the file, by default None, in which case
+        the suffix of `path` is used.
+
+    Returns
+    -------
+    list[tuple[str | None, tuple[int, ...], str]]
+        Key, shape and dtype of each array in the file. The key is the name of
+        the array in `.npz` files, None otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported.
+    """
+    suffix = (suffix or Path(path).suffix).lower()
+    if suffix in (".tif", ".tiff"):
+        tifffile = _import_tifffile()
+        with tifffile.TiffFile(path) as tif:
+            series = tif.series[0]
+            return [(None, tuple(series.shape), series.dtype.str)]
+    elif suffix == ".npy":
+        with open(path, "rb") as f:
+            shape, _, dtype = _read_npy_header(f)
+        return [(None, tuple(shape), dtype.str)]
+    elif suffix == ".npz":
+        headers = []
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.filename.endswith(".npy"):
+                    with zf.open(info) as f:
+                        shape, _, dtype = _read_npy_header(f)
+                    headers.append((info.filename[:-4], tuple(shape), dtype.str))
+        return headers
+
+    raise ValueError(f"Cannot read arrays from {path}.")
+
+
+def scan_headers(
+    paths: Iterable[str | os.PathLike],
+    root: str | os.PathLike,
+    max_workers: int = 8,
+    suffix: str | None = None,
+) -> dict[str, list[_Header]]:
+    """Read the headers of array files, using a cache in the root folder.
+
+    The headers are cached in `root/.headers.json` along with the size and
+    modification time of each file, and are only read again if the file
+    changed. Uncached files are scanned concurrently.
+
+    Parameters
+    ----------
+    paths : Iterable[str | os.PathLike]
+        Paths to the array files, within `root`.
+    root : str | os.PathLike
+        Folder in which the cache is stored.
+    max_workers : int
+        Maximum number of files scanned concurrently, by default 8.
+    suffix : str | None
+        Suffix selecting the format of the files, by default None, in which case
+        the suffix of each path is used.
+
+    Returns
+    -------
+    dict[str, list[tuple[str | None, tuple[int, ...], str]]]
+        Headers of the arrays in each file, indexed by path relative to `root`.
+    """
+    root = Path(root)
+    cache_path = root / HEADERS_NAME
+    with _headers_lock:
+        try:
+            with open(cache_path) as f:
+                cache: dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+
+    stats = {}
+    for path in paths:
+        name = Path(os.path.relpath(path, root)).as_posix()
+        stat = os.stat(path)
+        stats[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    missing = [
+        name
+        for name, stat in stats.items()
+        if name not in cache
+        or {k: cache[name].get(k) for k in ("size", "mtime_ns")} != stat
+    ]
+    if missing:
+        with ThreadPoolExecutor(max_workers) as executor:
+            scanned = executor.map(lambda name: scan_file(root / name, suffix), missing)
+            for name, headers in zip(missing, scanned):
+                cache[name] = {**stats[name], "arrays": headers}
+
+        with _headers_lock:
+            tmp = cache_path.with_name(f"{HEADERS_NAME}.{os.getpid()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, cache_path)
+
+    return {
+        name: [
+            (key, tuple(shape), dtype) for key, shape, dtype in cache[name]["arrays"]
+        ]
+        for name in stats
+    }
+
+
+class _TiffPages:
+    """Tif stack read page by page when it cannot be memory-mapped.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the tif file.
+    shape : tuple[int, ...]
+        Shape of the first series of the file.
+    """
+
+    def __init__(self, path: Path, shape: tuple[int, ...]) -> None:
+        self.path = path
+        self.shape = shape
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        """Read the pages selected by the first index, then index them.
+
+        Parameters
+        ----------
+        key : Any
+            NumPy index.
+
+        Returns
+        -------
+        np.ndarray
+            Indexed data.
+        """
+        np = _import_numpy()
+        tifffile = _import_tifffile()
+        key = key if isinstance(key, tuple) else (key,)
+        with tifffile.TiffFile(self.path) as tif:
+            series = tif.series[0]
+            n_pages = len(series.pages)
+            page_indexed = (
+                len(self.shape) > 1
+                and n_pages == self.shape[0]
+                and len(key) > 0
+                and key[0] is not Ellipsis
+                and key[0] is not None
+            )
+            if not page_indexed:
+                return tif.asarray(series=0).reshape(self.shape)[key]  # type: ignore
+
+            pages = np.arange(n_pages)[key[0]]
+            if np.ndim(pages) == 0:
+                data = tif.asarray(key=int(pages), series=0)
+                return data.reshape(self.shape[1:])[key[1:]]  # type: ignore
+
+            data = np.empty((len(pages), *self.shape[1:]), dtype=series.dtype)
+            for i, page in enumerate(pages):
+                data[i] = tif.asarray(key=int(page), series=0).reshape(self.shape[1:])
+            return data[(slice(None), *key[1:])]  # type: ignore[no-any-return]
+
+
+class LazyArray:
+    """Array stored in a file, whose data is only read when indexed.
+
+    The shape and dtype are known without reading the file. Indexing reads only
+    the selected data for `.npy` files, uncompressed tif files and `.npz` members
+    stored without compression, which are memory-mapped. Compressed tif stacks
+    are read page by page along their first axis, and compressed `.npz` members
+    are read entirely.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the file.
+    shape : tuple[int, ...]
+        Shape of the array.
+    dtype : Any
+        Data type of the array.
+    key : str | None
+        Name of the array in `.npz` files, by default None.
+    suffix : str | None
+        Suffix selecting the format of the file, by default None, in which case
+        the suffix of `path` is used.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        shape: tuple[int, ...],
+        dtype: Any,
+        key: str | None = None,
+        suffix: str | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.shape = tuple(shape)
+        self.dtype = _import_numpy().dtype(dtype)
+        self.key = key
+        self.suffix = (suffix or self.path.suffix).lower()
+        self._source: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions.
+
+        Returns
+        -------
+        int
+            Number of dimensions.
+        """
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """Number of elements.
+
+        Returns
+        -------
+        int
+            Number of elements.
+        """
+        size = 1
+        for n in self.shape:
+            size *= n
+        return size
+
+    def __len__(self) -> int:
+        """Length of the first axis.
+
+        Returns
+        -------
+        int
+            Length of the first axis.
+        """
+        if not self.shape:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        """Representation of the array.
+
+        Returns
+        -------
+        str
+            Path, shape and dtype of the array.
+        """
+        key = "" if self.key is None else f"[{self.key}]"
+        return f"LazyArray({self.path}{key}, shape={self.shape}, dtype={self.dtype})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        """State of the array, without its opened source.
+
+        Returns
+        -------
+        dict[str, Any]
+            State of the array.
+        """
+        state = self.__dict__.copy()
+        state["_source"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state of the array.
+
+        Parameters
+        ----------
+        state : dict[str, Any]
+            State of the array.
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _open(self) -> Any:
+        """Open the file as an indexable object.
+
+        Returns
+        -------
+        Any
+            Memory-mapped array, or object reading the file when indexed.
+        """
+        np = _import_numpy()
+        if self.suffix == ".npy":
+            return np.load(self.path, mmap_mode="r")
+        elif self.suffix == ".npz":
+            with ZipReader(self.path) as reader:
+                name = f"{self.key}.npy"
+                if not reader.is_stored(name):
+                    return np.load(self.path)[self.key]
+
+                with reader.open(name) as f:
+                    shape, fortran_order, dtype = _read_npy_header(f)
+                    offset = f.tell()
+                view = reader.read(name)
+            data = np.frombuffer(view, dtype=dtype, offset=offset)
+            return data.reshape(shape, order="F" if fortran_order else "C")
+
+        tifffile = _import_tifffile()
+        try:
+            return tifffile.memmap(self.path, mode="r").reshape(self.shape)
+        except ValueError:
+            # compressed or non-contiguous data
+            return _TiffPages(self.path, self.shape)
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        """Read the data selected by a NumPy index.
+
+        Parameters
+        ----------
+        key : Any
+            NumPy index.
+
+        Returns
+        -------
+        np.ndarray
+            Copy of the selected data.
+        """
+        with self._lock:
+            if self._source is None:
+                self._source = self._open()
+            source = self._source
+        return _import_numpy().array(source[key], copy=True)  # type: ignore
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        """Read the whole array.
+
+        Parameters
+        ----------
+        dtype : Any
+            Data type of the returned array, by default None.
+        copy : Any
+            Ignored, the data is always read.
+
+        Returns
+        -------
+        np.ndarray
+            Data of the array.
+        """
+        data = self[...]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+
+def load_arrays(
+    paths: Iterable[str | os.PathLike],
+    root: str | os.PathLike,
+    suffix: str | None = None,
+) -> dict[str, LazyArray]:
+    """Create lazy arrays from the array files among a list of paths.
+
+    Parameters
+    ----------
+    paths : Iterable[str | os.PathLike]
+        Paths to files, within `root`. Files that are not `.tif`, `.tiff`,
+        `.npy` or `.npz` are ignored.
+    root : str | os.PathLike
+        Folder containing the files, in which the header cache is stored.
+    suffix : str | None
+        Suffix selecting the format of all the files, e.g. for files cached
+        without extension, by default None, in which case the suffix of each
+        path is used.
+
+    Returns
+    -------
+    dict[str, LazyArray]
+        Arrays indexed by path relative to `root`, followed by `/<key>` for the
+        arrays of `.npz` files, sorted by name.
+    """
+    _import_numpy()
+    files = sorted(
+        Path(p) for p in paths if (suffix or Path(p).suffix).lower() in ARRAY_SUFFIXES
+    )
+
+    arrays = {}
+    for name, headers in scan_headers(files, root, suffix=suffix).items():
+        for key, shape, dtype in headers:
+            array_name = name if key is None else f"{name}/{key}"
+            arrays[array_name] = LazyArray(
+                Path(root) / name, shape, dtype, key, suffix=suffix
+            )
+    return dict(sorted(arrays.items()))
+
+
+def open_npy_cache(
+    path: str | os.PathLike, attributes: dict[str, Any]
+) -> dict[str, np.ndarray] | None:
+    """Open the arrays of a `.npy` cache as read-only memory maps.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Folder of the cache.
+    attributes : dict[str, Any]
+        JSON attributes identifying the source of the arrays, e.g. its hash.
+
+    Returns
+    -------
+    dict[str, np.ndarray] | None
+        Memory-mapped arrays indexed by name, or None if the cache does not
+        exist, is incomplete or was written with other attributes.
+    """
+    np = _import_numpy()
+    path = Path(path)
+    try:
+        with open(path / CACHE_MANIFEST) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if {k: v for k, v in manifest.items() if k != "arrays"} != attributes:
+        return None
+
+    try:
+        return {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in manifest["arrays"]
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def write_npy_cache(
+    arrays: Mapping[str, Any], path: str | os.PathLike, attributes: dict[str, Any]
+) -> dict[str, np.ndarray]:
+    """Write arrays as contiguous `.npy` files and open them as memory maps.
+
+    The arrays are copied along their first axis in blocks of about 64 MB, so
+    that they are never entirely in memory. The cache is written in a staging
+    folder, with a manifest recording `attributes`, which then replaces the
+    existing cache. Processes opening the cache share its pages through the
+    page cache of the OS.
+
+    Parameters
+    ----------
+    arrays : Mapping[str, Any]
+        Array-like objects indexed by name, e.g. `LazyArray`. Names can contain
+        `/`.
+    path : str | os.PathLike
+        Folder of the cache.
+    attributes : dict[str, Any]
+        JSON attributes identifying the source of the arrays, e.g. its hash.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Memory-mapped arrays indexed by name.
+    """
+    np = _import_numpy()
+    path = Path(path)
+    staging = path.with_name(f"{path.name}.{os.getpid()}.part")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    try:
+        for name, array in arrays.items():
+            destination = staging / f"{name}.npy"
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            dtype = np.dtype(array.dtype)
+            shape = tuple(array.shape)
+            data = np.lib.format.open_memmap(
+                destination, mode="w+", dtype=dtype, shape=shape
+            )
+            if len(shape) == 0:
+                data[...] = array[...]
+            elif data.size > 0:
+                step = max(1, COPY_SIZE // (data[0].nbytes or 1))
+                for start in range(0, shape[0], step):
+                    data[start : start + step] = array[start : start + step]
+            data.flush()
+            del data
+
+        with open(staging / CACHE_MANIFEST, "w") as f:
+            json.dump({**attributes, "arrays": sorted(arrays)}, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.replace(staging, path)
+        except OSError:
+            # another process wrote the cache in the meantime
+            if open_npy_cache(path, attributes) is None:
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    cache = open_npy_cache(path, attributes)
+    if cache is None:
+        raise RuntimeError(f"The cache {path} could not be opened after writing.")
+    return cache
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+from urllib.parse import urlparse
+
+from tqdm import tqdm
+
+from .download_utils import get_poochfolio
+
+if TYPE_CHECKING:
+    from ..portfolio_entry import PortfolioEntry
+
+
+class AggregateProgressBar:
+    """Thread-safe progress bar shared by several concurrent downloads.
+
+    Each download receives its own proxy (see `proxy`), which pooch drives as if
+    it were a standalone progress bar. The proxies forward their increments to a
+    single tqdm bar whose total grows as downloads start.
+
+    Attributes
+    ----------
+    bar : tqdm
+        Underlying tqdm progress bar.
+    """
+
+    def __init__(self, desc: str = "Downloading") -> None:
+        self._lock = threading.Lock()
+        self._total = 0
+        self.bar = tqdm(
+            total=0,
+            desc=desc,
+            ncols=79,
+            ascii=bool(sys.platform == "win32"),
+            unit="B",
+            unit_scale=True,
+            leave=True,
+        )
+
+    def proxy(self) -> _ProgressProxy:
+        """Create a pooch-compatible progress bar forwarding to this one.
+
+        Returns
+        -------
+        _ProgressProxy
+            Progress bar proxy for a single download.
+        """
+        return _ProgressProxy(self)
+
+    def add_total(self, n: int) -> None:
+        """Increase the total number of bytes expected.
+
+        Parameters
+        ----------
+        n : int
+            Number of bytes to add to the total.
+        """
+        with self._lock:
+            self._total += n
+            self.bar.total = self._total
+            self.bar.refresh()
+
+    def update(self, n: int) -> None:
+        """Advance the progress bar.
+
+        Parameters
+        ----------
+        n : int
+            Number of bytes received.
+        """
+        with self._lock:
+            self.bar.update(n)
+
+    def close(self) -> None:
+        """Close the underlying progress bar."""
+        with self._lock:
+            self.bar.close()
+
+
+class _ProgressProxy:
+    """Progress bar handed over to a single pooch download.
+
+    Pooch sets `total`, calls `update` with the chunk size (which may overshoot
+    the actual number of bytes), then calls `reset`, `update(total)` and `close`
+    to fill the bar. Increments are therefore capped by the total so that the
+    aggregate bar never counts a byte twice.
+    """
+
+    def __init__(self, parent: AggregateProgressBar) -> None:
+        self._parent = parent
+        self._total = 0
+        self.n = 0
+
+    @property
+    def total(self) -> int:
+        """Number of bytes expected for this download."""
+        return self._total
+
+    @total.setter
+    def total(self, value: int) -> None:
+        self._parent.add_total(value - self._total)
+        self._total = value
+
+    def update(self, n: int) -> None:
+        """Forward an increment to the aggregate progress bar.
+
+        Parameters
+        ----------
+        n : int
+            Number of bytes received.
+        """
+        if self._total:
+            n = min(n, self._total - self.n)
+        if n > 0:
+            self.n += n
+            self._parent.update(n)
+
+    def reset(self) -> None:
+        """Do nothing, the aggregate bar is only ever topped up."""
+
+    def close(self) -> None:
+        """Do nothing, the aggregate bar is closed by its owner."""
+
+
+def get_host(url: str) -> str:
+    """Return the host serving a URL.
+
+    Parameters
+    ----------
+    url : str
+        URL of a dataset.
+
+    Returns
+    -------
+    str
+        Network location of the URL (e.g. `zenodo.org`).
+    """
+    return urlparse(url).netloc
+
+
+def download_many(
+    entries: Iterable[PortfolioEntry],
+    path: str | Path | None = None,
+    max_workers: int = 4,
+    max_per_host: int = 2,
+    progressbar: bool = True,
+    connections: int = 1,
+    force_verify: bool = False,
+    stream_extract: bool = False,
+    extract_workers: int | None = None,
+) -> dict[str, Any]:
+    """Download several portfolio entries concurrently.
+
+    A single pooch object is shared by all downloads, which run on a thread pool
+    of `max_workers` threads. Since several entries are hosted on the same
+    servers, at most `max_per_host` downloads run against the same host at any
+    time. The entries are queued per host and only submitted to the pool once
+    their host has a free slot, so that entries waiting for a busy host do not
+    hold a thread while entries of other hosts could be downloaded.
+
+    Parameters
+    ----------
+    entries : Iterable[PortfolioEntry]
+        Entries to download.
+    path : str | Path | None
+        Path to the folder in which to download the datasets. Defaults to None,
+        in which case the system's cache folder is used.
+    max_workers : int
+        Maximum number of concurrent downloads, by default 4.
+    max_per_host : int
+        Maximum number of concurrent downloads from the same host, by default 2.
+    progressbar : bool
+        Whether to display a single progress bar aggregating all downloads, by
+        default True.
+    connections : int
+        Number of parallel connections used to download each file, see
+        `RangeDownloader`, by default 1.
+    force_verify : bool
+        Whether to hash existing files even if they were already verified,
+        by default False.
+    stream_extract : bool
+        Whether to extract the archives while they are downloaded, by default
+        False.
+    extract_workers : int | None
+        Number of threads extracting each zip archive, by default None.
+
+    Returns
+    -------
+    dict[str, Any]
+        Dictionary mapping the registry name of each entry to the path(s)
+        returned by its download.
+
+    Raises
+    ------
+    ValueError
+        If `max_workers` or `max_per_host` is smaller than 1.
+    """
+    if max_workers < 1 or max_per_host < 1:
+        raise ValueError("max_workers and max_per_host must be at least 1.")
+
+    # de-duplicate entries, keeping the order
+    unique = {entry.get_registry_name(): entry for entry in entries}
+
+    poochfolio = get_poochfolio(path)
+    progress = AggregateProgressBar() if progressbar else None
+
+    # entries waiting for their host, in order
+    queues: dict[str, deque[tuple[str, PortfolioEntry]]] = {}
+    for name, entry in unique.items():
+        queues.setdefault(get_host(entry.url), deque()).append((name, entry))
+    active = dict.fromkeys(queues, 0)
+
+    futures: dict[str, Future] = {}
+    running: dict[Future, str] = {}
+
+    def _download(entry: PortfolioEntry) -> Any:
+        return entry._fetch(
+            poochfolio,
+            progressbar=progress.proxy() if progress is not None else False,
+            connections=connections,
+            force_verify=force_verify,
+            stream_extract=stream_extract,
+            extract_workers=extract_workers,
+        )
+
+    def _schedule(executor: ThreadPoolExecutor) -> None:
+        # submit the next entry of each host with a free slot, in turn
+        submitted = True
+        while submitted and len(running) < max_workers:
+            submitted = False
+            for host, queue in queues.items():
+                if queue and active[host] < max_per_host:
+                    name, entry = queue.popleft()
+                    futures[name] = executor.submit(_download, entry)
+                    running[futures[name]] = host
+                    active[host] += 1
+                    submitted = True
+                    if len(running) == max_workers:
+                        break
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _schedule(executor)
+
+            # stop scheduling new downloads as soon as one fails
+            failed = False
+            while running and not failed:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    active[running.pop(future)] -= 1
+                    failed = failed or future.exception() is not None
+                if not failed:
+                    _schedule(executor)
+
+        for future in futures.values():
+            error = future.exception()
+            if error is not None:
+                raise error
+
+        return {name: futures[name].result() for name in unique}
+    finally:
+        if progress is not None:
+            progress.close()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .hashing import file_hash
+
+# name of the folder of the store in the cache folder
+BLOBS_NAME = "blobs"
+
+
+def _link(source: Path, destination: Path) -> bool:
+    """Atomically replace a file by a hard link to another file.
+
+    Parameters
+    ----------
+    source : Path
+        Path to the linked file.
+    destination : Path
+        Path to the link, replaced if it exists.
+
+    Returns
+    -------
+    bool
+        Whether the link was created, which fails if the file system does not
+        support hard links or if both paths are on different devices.
+    """
+    tmp = destination.with_name(
+        f".{destination.name}.{os.getpid()}.{threading.get_ident()}.link"
+    )
+    try:
+        os.link(source, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, destination)
+    return True
+
+
+class BlobStore:
+    """Content-addressed store of the files of a cache folder.
+
+    Files are stored once per SHA256 digest in `<cache>/blobs/<xx>/<digest>`,
+    and appear in the cache as hard links to their blob: downloaded files under
+    their registry name, and extracted members in their extraction folder.
+    Identical files, e.g. the same archive under several registry names or
+    the same member in several archives, thus share their data.
+
+    Files in the cache are always replaced rather than written in place, so
+    that modifying a file never modifies its blob. Blobs that are no longer
+    linked from the cache are removed by `gc`. If hard links are not supported,
+    files are left as they are.
+
+    Parameters
+    ----------
+    root : str | os.PathLike
+        Cache folder.
+    """
+
+    def __init__(self, root: str | os.PathLike) -> None:
+        self.root = Path(root) / BLOBS_NAME
+
+    def path(self, digest: str) -> Path:
+        """Path to the blob of a digest.
+
+        Parameters
+        ----------
+        digest : str
+            SHA256 hexadecimal digest.
+
+        Returns
+        -------
+        Path
+            Path to the blob, which may not exist.
+        """
+        digest = digest.lower()
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        """Whether the store holds a blob.
+
+        Parameters
+        ----------
+        digest : str
+            SHA256 hexadecimal digest.
+
+        Returns
+        -------
+        bool
+            Whether the blob exists.
+        """
+        return self.path(digest).is_file()
+
+    def add(self, path: str | os.PathLike, digest: str | None = None) -> bool:
+        """Add a file to the store, linking it to an existing identical blob.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path to the file in the cache.
+        digest : str | None
+            SHA256 digest of the file if known, by default None, in which case
+            the file is hashed.
+
+        Returns
+        -------
+        bool
+            Whether the file is linked to its blob.
+        """
+        path = Path(path)
+        if digest is None:
+            digest = file_hash(path)
+        blob = self.path(digest)
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+            return True
+        except FileExistsError:
+            pass
+        except OSError:
+            return False
+
+        return os.path.samefile(blob, path) or _link(blob, path)
+
+    def link(self, digest: str, path: str | os.PathLike) -> bool:
+        """Link a file of the cache to a blob, if it exists.
+
+        Parameters
+        ----------
+        digest : str
+            SHA256 hexadecimal digest.
+        path : str | os.PathLike
+            Path to the file in the cache, replaced if it exists.
+
+        Returns
+        -------
+        bool
+            Whether the file was linked.
+        """
+        blob = self.path(digest)
+        return blob.is_file() and _link(blob, Path(path))
+
+    def deduplicate(self, folder: str | os.PathLike, max_workers: int = 4) -> int:
+        """Add the files of a folder to the store.
+
+        Files already linked to a blob, i.e. with several links, are skipped, so
+        that the files of a folder are only hashed once. The files are hashed
+        concurrently, since hashing releases the GIL.
+
+        Parameters
+        ----------
+        folder : str | os.PathLike
+            Folder in the cache, e.g. an extraction folder.
+        max_workers : int
+            Maximum number of files hashed concurrently, by default 4.
+
+        Returns
+        -------
+        int
+            Number of files linked to a blob that existed beforehand.
+        """
+        files = [
+            Path(path, name)
+            for path, _, names in os.walk(Path(folder))
+            for name in names
+            if os.lstat(os.path.join(path, name)).st_nlink == 1
+        ]
+
+        def add(file: Path) -> bool:
+            digest = file_hash(file)
+            shared = digest in self
+            return self.add(file, digest) and shared
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return sum(executor.map(add, files))
+
+    def gc(self) -> int:
+        """Remove the blobs that are no longer linked from the cache.
+
+        Returns
+        -------
+        int
+            Number of bytes freed.
+        """
+        freed = 0
+        if not self.root.is_dir():
+            return freed
+
+        for path, _, names in os.walk(self.root):
+            for name in names:
+                blob = Path(path, name)
+                stat = blob.stat()
+                if stat.st_nlink == 1:
+                    blob.unlink()
+                    freed += stat.st_size
+        return freed
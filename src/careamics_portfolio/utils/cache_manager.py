@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pooch
+
+from .blob_store import BlobStore
+from .download_utils import get_poochfolio
+from .locking import FileLock
+from .manifest import MANIFEST_SUFFIX
+from .processors import INDEX_SUFFIX
+from .verification_index import get_verification_index
+
+# name of the file recording access times and pins in the cache folder
+STATE_NAME = ".cache_manager.json"
+
+# environment variable holding the default byte budget of the cache
+BUDGET_ENV = "CAREAMICS_PORTFOLIO_CACHE_BUDGET"
+
+# kinds of cached data, in the order in which they are evicted for an entry
+KINDS = ("derived", "extracted", "archive")
+
+# suffixes of the extraction folders
+_EXTRACTED = (".unzip", ".untar")
+
+# minimum interval (in seconds) between two recorded accesses to a registry name
+# served from the cache, see `PortfolioEntry.download`
+TOUCH_INTERVAL = 3600.0
+
+# time of the last access recorded by this process, per state file and name
+_touched: dict[tuple[Path, str], float] = {}
+_touched_lock = threading.Lock()
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(size: str | int) -> int:
+    """Parse a number of bytes, possibly with a binary unit, e.g. "500M" or "7GB".
+
+    Parameters
+    ----------
+    size : str | int
+        Number of bytes, or string with an optional unit among K, M, G and T,
+        optionally followed by "B" or "iB".
+
+    Returns
+    -------
+    int
+        Number of bytes.
+
+    Raises
+    ------
+    ValueError
+        If the size cannot be parsed.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([KMGT]?)(?:I?B)?\s*", str(size), re.I)
+    if match is None:
+        raise ValueError(f"Invalid size {size!r}.")
+
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def get_budget() -> int | None:
+    """Get the byte budget of the cache from the environment.
+
+    Returns
+    -------
+    int | None
+        Budget set by the `CAREAMICS_PORTFOLIO_CACHE_BUDGET` environment
+        variable, or None if it is not set.
+    """
+    budget = os.environ.get(BUDGET_ENV)
+    return None if not budget else parse_size(budget)
+
+
+def _file_stats(path: Path) -> Iterator[os.stat_result]:
+    """Stat of a file or of the files of a folder, recursively.
+
+    Parameters
+    ----------
+    path : Path
+        Path to a file or folder.
+
+    Yields
+    ------
+    os.stat_result
+        Stat of each file. Symbolic links are not followed.
+    """
+    try:
+        stat = path.lstat()
+    except FileNotFoundError:
+        return
+    if not path.is_dir() or path.is_symlink():
+        yield stat
+        return
+
+    for folder, _, files in os.walk(path):
+        for name in files:
+            try:
+                yield os.lstat(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+
+
+def _disk_usage(path: Path, seen: set[tuple[int, int]] | None = None) -> int:
+    """Size in bytes of a file or of the files of a folder, recursively.
+
+    Parameters
+    ----------
+    path : Path
+        Path to a file or folder.
+    seen : set[tuple[int, int]] | None
+        Device and inode of the files with several links already counted,
+        updated with those of `path`, by default None, in which case all files
+        are counted.
+
+    Returns
+    -------
+    int
+        Size of the file, or total size of the files in the folder. Symbolic
+        links are not followed, and hard links in `seen` are not counted.
+    """
+    total = 0
+    for stat in _file_stats(path):
+        if seen is not None and stat.st_nlink > 1:
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+        total += stat.st_size
+    return total
+
+
+def _freed_size(paths: Iterable[Path]) -> int:
+    """Size in bytes freed by removing files and folders.
+
+    The files of the cache are linked at most once more, by a blob of the
+    `BlobStore` which is removed once it is no longer linked from the cache.
+    Files are therefore only freed when their number of links drops to one.
+
+    Parameters
+    ----------
+    paths : Iterable[Path]
+        Paths to the files or folders to remove.
+
+    Returns
+    -------
+    int
+        Number of bytes freed once the unlinked blobs are removed.
+    """
+    removed: dict[tuple[int, int], list[int]] = {}
+    for path in paths:
+        for stat in _file_stats(path):
+            key = (stat.st_dev, stat.st_ino)
+            if key in removed:
+                removed[key][0] -= 1
+            else:
+                removed[key] = [stat.st_nlink - 1, stat.st_size]
+    return sum(size for links, size in removed.values() if links <= 1)
+
+
+def _remove(path: Path) -> None:
+    """Remove a file or folder, ignoring missing ones.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the file or folder.
+    """
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class CacheManager:
+    """Manager of the disk usage of a portfolio cache folder.
+
+    The data cached for a registry name is split in three kinds: the
+    downloaded "archive" (along with a partial download), its "extracted"
+    folder (along with its manifest, see `write_manifest`, and the index of the
+    archive members, see `ArchiveExtractor`), and "derived" data
+    computed from it, such as `.npy` caches, Zarr stores and statistics
+    sidecars.
+
+    Access times are recorded by `PortfolioEntry.download`, at most once per
+    `TOUCH_INTERVAL` for data served from the cache, and stored along with
+    pinned entries in a JSON file in the cache folder. A byte budget is
+    enforced by evicting the data of the least recently used entries first,
+    derived data and extractions before archives. Pinned entries are never
+    evicted, nor are entries being downloaded by another thread or process.
+    Blobs of the content-addressed store (see `BlobStore`) are removed once no
+    entry links to them.
+
+    Parameters
+    ----------
+    path : str | os.PathLike | None
+        Cache folder, by default None, in which case the default cache folder of
+        the portfolio is used.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        if path is None:
+            path = pooch.os_cache("portfolio")
+        self.root = Path(path)
+        self.path = self.root / STATE_NAME
+
+    def _read(self) -> dict[str, Any]:
+        """Read the access times and pins.
+
+        Returns
+        -------
+        dict[str, Any]
+            Last access time per registry name ("access") and list of pinned
+            registry names ("pinned").
+        """
+        try:
+            with open(self.path) as f:
+                state: dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("access", {})
+        state.setdefault("pinned", [])
+        return state
+
+    def _write(self, state: dict[str, Any]) -> None:
+        """Atomically write the access times and pins.
+
+        Parameters
+        ----------
+        state : dict[str, Any]
+            Access times and pins.
+        """
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def _update(self, name: str, **changes: Any) -> None:
+        """Update the state of a registry name across processes.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+        **changes : Any
+            Access time ("access") or pin status ("pinned").
+        """
+        with FileLock(self.root / f"{STATE_NAME}.lock"):
+            state = self._read()
+            if "access" in changes:
+                state["access"][name] = changes["access"]
+            if "pinned" in changes:
+                pinned = set(state["pinned"])
+                if changes["pinned"]:
+                    pinned.add(name)
+                else:
+                    pinned.discard(name)
+                state["pinned"] = sorted(pinned)
+            self._write(state)
+
+    def names(self) -> list[str]:
+        """Registry names of the portfolio.
+
+        Returns
+        -------
+        list[str]
+            Registry names, sorted.
+        """
+        return sorted(get_poochfolio(self.root).registry)
+
+    def _check(self, name: str) -> None:
+        """Check that a registry name is in the registry.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+
+        Raises
+        ------
+        ValueError
+            If the name is not in the registry.
+        """
+        if name not in self.names():
+            raise ValueError(f"{name} is not in the registry.")
+
+    def touch(self, name: str, interval: float = 0.0) -> None:
+        """Record an access to a registry name.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+        interval : float
+            Minimum number of seconds since the last access recorded by this
+            process, below which the access is not recorded, by default 0.
+        """
+        now = time.time()
+        key = (self.path, name)
+        with _touched_lock:
+            if now - _touched.get(key, -interval) < interval:
+                return
+            _touched[key] = now
+
+        self._update(name, access=now)
+
+    def last_access(self) -> dict[str, float]:
+        """Last access time of the registry names.
+
+        Returns
+        -------
+        dict[str, float]
+            Timestamp of the last access per registry name, for the names
+            accessed since the cache manager was introduced.
+        """
+        return dict(self._read()["access"])
+
+    def pin(self, name: str) -> None:
+        """Pin a registry name, so that its data is never evicted.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+
+        Raises
+        ------
+        ValueError
+            If the name is not in the registry.
+        """
+        self._check(name)
+        self._update(name, pinned=True)
+
+    def unpin(self, name: str) -> None:
+        """Unpin a registry name.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+        """
+        self._update(name, pinned=False)
+
+    @property
+    def pinned(self) -> list[str]:
+        """Pinned registry names.
+
+        Returns
+        -------
+        list[str]
+            Registry names, sorted.
+        """
+        return list(self._read()["pinned"])
+
+    def artifacts(self, name: str) -> dict[str, list[Path]]:
+        """Paths of the data cached for a registry name, by kind.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+
+        Returns
+        -------
+        dict[str, list[Path]]
+            Paths of the "archive", "extracted" and "derived" data. Lock files
+            are not included.
+        """
+        names = self.names()
+        artifacts: dict[str, list[Path]] = {kind: [] for kind in KINDS}
+        if not self.root.is_dir():
+            return artifacts
+
+        for entry in os.scandir(self.root):
+            if entry.name != name and not entry.name.startswith(f"{name}."):
+                continue
+            # another registry name may start with this one
+            owner = max(
+                (n for n in names if entry.name == n or entry.name.startswith(f"{n}.")),
+                key=len,
+                default=name,
+            )
+            rest = entry.name[len(name) :]
+            if owner != name or rest.endswith(".lock"):
+                continue
+
+            if rest in ("", ".part"):
+                kind = "archive"
+            elif rest.startswith(_EXTRACTED) or rest in (MANIFEST_SUFFIX, INDEX_SUFFIX):
+                kind = "extracted"
+            else:
+                kind = "derived"
+            artifacts[kind].append(Path(entry.path))
+
+        return artifacts
+
+    def usage(self) -> dict[str, dict[str, int]]:
+        """Disk usage of the registry names present in the cache.
+
+        Files with several links, e.g. deduplicated with the `BlobStore`, are
+        counted once, for the first registry name linking them.
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            Bytes used by the "archive", "extracted" and "derived" data of each
+            registry name with cached data, along with their "total".
+        """
+        # hard links, e.g. to a deduplicated file, are counted once
+        seen: set[tuple[int, int]] = set()
+        usage = {}
+        for name in self.names():
+            sizes = {
+                kind: sum(_disk_usage(path, seen) for path in paths)
+                for kind, paths in self.artifacts(name).items()
+            }
+            if any(sizes.values()):
+                sizes["total"] = sum(sizes.values())
+                usage[name] = sizes
+        return usage
+
+    def total_size(self) -> int:
+        """Disk usage of the cached data of all registry names.
+
+        Returns
+        -------
+        int
+            Number of bytes.
+        """
+        return sum(sizes["total"] for sizes in self.usage().values())
+
+    def evict(self, name: str, kinds: Iterable[str] = KINDS) -> int:
+        """Remove the data cached for a registry name, even if it is pinned.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+        kinds : Iterable[str]
+            Kinds of data to remove among "archive", "extracted" and "derived",
+            by default all of them.
+
+        Returns
+        -------
+        int
+            Number of bytes freed.
+
+        Raises
+        ------
+        ValueError
+            If the name is not in the registry, or if a kind is unknown.
+        TimeoutError
+            If the entry is being downloaded.
+        """
+        self._check(name)
+        kinds = set(kinds)
+        if not kinds <= set(KINDS):
+            raise ValueError(f"Unknown kinds {kinds - set(KINDS)}, use {KINDS}.")
+
+        # wait for no thread or process to be downloading or extracting it
+        with FileLock(self.root / f"{name}.lock", timeout=0):
+            freed = self._evict(name, kinds)
+        BlobStore(self.root).gc()
+        return freed
+
+    def _evict(self, name: str, kinds: set[str]) -> int:
+        """Remove the data cached for a registry name, with its lock held.
+
+        Parameters
+        ----------
+        name : str
+            Registry name.
+        kinds : set[str]
+            Kinds of data to remove.
+
+        Returns
+        -------
+        int
+            Number of bytes freed.
+        """
+        paths = [
+            path
+            for kind, paths in self.artifacts(name).items()
+            if kind in kinds
+            for path in paths
+        ]
+        freed = _freed_size(paths)
+        for path in paths:
+            _remove(path)
+        if "archive" in kinds:
+            get_verification_index(self.root).remove(name)
+        return freed
+
+    def enforce(
+        self, budget: int | str | None = None, keep: Iterable[str] = ()
+    ) -> list[tuple[str, str]]:
+        """Evict the least recently used data until the cache fits in a budget.
+
+        The data of the least recently used registry names is evicted first,
+        names never accessed through the portfolio being the oldest. For each
+        name, derived data is evicted first, then the extraction, then the
+        archive, so that the data can be restored without downloading it
+        again for as long as possible.
+
+        Parameters
+        ----------
+        budget : int | str | None
+            Maximum number of bytes used by the cache, e.g. 5000000 or "5G", by
+            default None, in which case the `CAREAMICS_PORTFOLIO_CACHE_BUDGET`
+            environment variable is used.
+        keep : Iterable[str]
+            Registry names that must not be evicted, in addition to the pinned
+            ones, by default none.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            Registry name and kind of the evicted data, in order.
+
+        Raises
+        ------
+        ValueError
+            If no budget is given or set in the environment.
+        """
+        if budget is None:
+            budget = get_budget()
+            if budget is None:
+                raise ValueError(f"No budget given, nor set in {BUDGET_ENV}.")
+        budget = parse_size(budget)
+
+        state = self._read()
+        protected = set(state["pinned"]) | set(keep)
+        usage = self.usage()
+        total = sum(sizes["total"] for sizes in usage.values())
+
+        candidates = sorted(
+            (
+                (state["access"].get(name, 0.0), KINDS.index(kind), name, kind)
+                for name, sizes in usage.items()
+                for kind in KINDS
+                if name not in protected and sizes[kind] > 0
+            )
+        )
+
+        evicted = []
+        for *_, name, kind in candidates:
+            if total <= budget:
+                break
+            try:
+                with FileLock(self.root / f"{name}.lock", timeout=0):
+                    total -= self._evict(name, {kind})
+            except TimeoutError:
+                # being downloaded or extracted
+                continue
+            evicted.append((name, kind))
+
+        BlobStore(self.root).gc()
+        return evicted
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from ..portfolio_entry import PortfolioEntry
+
+# name of the catalog, next to the registry
+CATALOG_NAME = "catalog.json"
+
+# words of the names and descriptions, e.g. "N2V_SEM" is split into "n2v" and "sem"
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_catalogs: dict[str | os.PathLike | None, Catalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog_path() -> Path:
+    """Get the path to the catalog.json file.
+
+    Returns
+    -------
+    Path
+        Path to the catalog.json file.
+    """
+    return Path(__file__).parent / "../registry" / CATALOG_NAME
+
+
+def tokenize(text: str) -> set[str]:
+    """Lowercase words of a text.
+
+    Parameters
+    ----------
+    text : str
+        Text.
+
+    Returns
+    -------
+    set[str]
+        Words of the text.
+    """
+    return set(_TOKEN.findall(text.lower()))
+
+
+def to_record(entry: PortfolioEntry) -> dict[str, Any]:
+    """Record of a portfolio entry in the catalog.
+
+    Parameters
+    ----------
+    entry : PortfolioEntry
+        Portfolio entry.
+
+    Returns
+    -------
+    dict[str, Any]
+        Arguments of `PortfolioEntry` describing the entry.
+    """
+    return {
+        "portfolio": entry.portfolio,
+        "name": entry.name,
+        "url": entry.url,
+        "description": entry.description,
+        "license": entry.license,
+        "citation": entry.citation,
+        "file_name": entry.file_name,
+        "sha256": entry.hash,
+        "size": entry.size,
+        "tags": list(entry.tags),
+        "archive_format": entry.archive_format.value,
+    }
+
+
+def write_catalog(entries: Iterable[PortfolioEntry], path: str | os.PathLike) -> None:
+    """Write portfolio entries to a catalog.
+
+    The catalog is a JSON object mapping the registry name of each entry to its
+    record, with one compact record per line so that it remains readable.
+
+    Parameters
+    ----------
+    entries : Iterable[PortfolioEntry]
+        Entries of the catalog, in order.
+    path : str | os.PathLike
+        Path to the catalog.
+    """
+    lines = [
+        json.dumps(entry.get_registry_name())
+        + ":"
+        + json.dumps(to_record(entry), ensure_ascii=False, separators=(",", ":"))
+        for entry in entries
+    ]
+
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{\n" + ",\n".join(lines) + "\n}\n")
+    os.replace(tmp, path)
+
+
+class Catalog:
+    """Records of the portfolio entries, indexed by registry name.
+
+    The catalog is read when first accessed, and read again if the file was
+    modified since, which increments its `version`. It lists the entries of each
+    portfolio in the order of the file. Searches use inverted indices, mapping
+    each tag and each word of the names and descriptions to the entries, which
+    are built on the first search.
+
+    Use `get_catalog` to share a single catalog per file.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the catalog.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, Any]] | None = None
+        self._mtime_ns: int | None = None
+        self._version = 0
+        self._portfolios: dict[str, list[str]] = {}
+        self._tags: dict[str, set[str]] | None = None
+        self._words: dict[str, set[str]] = {}
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Read the catalog if it was not read yet or was modified since.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Records indexed by registry name.
+        """
+        with self._lock:
+            mtime_ns = self.path.stat().st_mtime_ns
+            if self._records is None or mtime_ns != self._mtime_ns:
+                with open(self.path, encoding="utf-8") as f:
+                    records: dict[str, dict[str, Any]] = json.load(f)
+
+                portfolios: dict[str, list[str]] = {}
+                for record in records.values():
+                    portfolios.setdefault(record["portfolio"], []).append(
+                        record["name"]
+                    )
+                self._records, self._portfolios = records, portfolios
+                self._mtime_ns = mtime_ns
+                self._version += 1
+
+                # rebuilt on the next search
+                self._tags, self._words = None, {}
+            return self._records
+
+    @property
+    def version(self) -> int:
+        """Number of times the catalog was read, to invalidate derived caches.
+
+        Returns
+        -------
+        int
+            Version of the catalog.
+        """
+        self._load()
+        return self._version
+
+    def __contains__(self, registry_name: str) -> bool:
+        """Whether the catalog holds an entry.
+
+        Parameters
+        ----------
+        registry_name : str
+            Registry name of the entry.
+
+        Returns
+        -------
+        bool
+            Whether the entry is in the catalog.
+        """
+        return registry_name in self._load()
+
+    def record(self, portfolio: str, name: str) -> dict[str, Any]:
+        """Record of an entry.
+
+        Parameters
+        ----------
+        portfolio : str
+            Name of the portfolio of the entry.
+        name : str
+            Name of the entry.
+
+        Returns
+        -------
+        dict[str, Any]
+            Copy of the arguments of `PortfolioEntry` describing the entry.
+
+        Raises
+        ------
+        KeyError
+            If the catalog has no such entry.
+        """
+        record = self._load()[f"{portfolio}-{name}"]
+        return {**record, "tags": list(record["tags"])}
+
+    def names(self, portfolio: str) -> list[str]:
+        """Names of the entries of a portfolio.
+
+        Parameters
+        ----------
+        portfolio : str
+            Name of the portfolio.
+
+        Returns
+        -------
+        list[str]
+            Names of the entries, in the order of the catalog.
+        """
+        self._load()
+        return list(self._portfolios.get(portfolio, []))
+
+    def _indices(
+        self,
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, set[str]], dict[str, set[str]]]:
+        """Build the inverted indices if they were not built yet.
+
+        Returns
+        -------
+        tuple[dict[str, dict[str, Any]], dict[str, set[str]], dict[str, set[str]]]
+            Records indexed by registry name, and registry names indexed by
+            lowercase tag and by word of their names, descriptions and tags.
+        """
+        self._load()
+        with self._lock:
+            # the indices are reset whenever the records are read again
+            records = self._records or {}
+            if self._tags is None:
+                tags: dict[str, set[str]] = {}
+                words: dict[str, set[str]] = {}
+                for registry_name, record in records.items():
+                    text = " ".join(
+                        [record["name"], record["description"], *record["tags"]]
+                    )
+                    for word in tokenize(text):
+                        words.setdefault(word, set()).add(registry_name)
+                    for tag in record["tags"]:
+                        tags.setdefault(tag.lower(), set()).add(registry_name)
+                self._tags, self._words = tags, words
+            return records, self._tags, self._words
+
+    def search(
+        self,
+        tags: Iterable[str] | None = None,
+        max_size_mb: float | None = None,
+        text: str | None = None,
+        portfolios: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Search the entries of the catalog.
+
+        Parameters
+        ----------
+        tags : Iterable[str] | None
+            Tags that the entries must all have, case insensitive, by default
+            None.
+        max_size_mb : float | None
+            Maximum size of the entries in MB, by default None.
+        text : str | None
+            Words that must all appear in the name, description or tags of the
+            entries, case insensitive, by default None.
+        portfolios : Iterable[str] | None
+            Portfolios of the entries, by default None, in which case all
+            portfolios are searched.
+
+        Returns
+        -------
+        list[str]
+            Registry names of the matching entries, in the order of the catalog.
+        """
+        records, tag_index, word_index = self._indices()
+
+        # intersection of the entries matching each tag and word
+        matches: set[str] | None = None
+        keys = [(tag_index, tag.lower()) for tag in tags or ()]
+        keys += [(word_index, word) for word in tokenize(text or "")]
+        for index, key in keys:
+            found = index.get(key, set())
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        selected = None if portfolios is None else set(portfolios)
+        return [
+            registry_name
+            for registry_name, record in records.items()
+            if (matches is None or registry_name in matches)
+            and (max_size_mb is None or record["size"] <= max_size_mb)
+            and (selected is None or record["portfolio"] in selected)
+        ]
+
+
+def get_catalog(path: str | os.PathLike | None = None) -> Catalog:
+    """Get a catalog.
+
+    Parameters
+    ----------
+    path : str | os.PathLike | None
+        Path to the catalog, by default None, in which case the catalog shipped
+        with the package is used.
+
+    Returns
+    -------
+    Catalog
+        Catalog shared by all callers using the same file.
+    """
+    # looked up by argument first, since resolving the path is comparatively slow
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        key = Path(get_catalog_path() if path is None else path).resolve()
+        with _catalogs_lock:
+            catalog = _catalogs.setdefault(key, Catalog(key))
+            _catalogs[path] = catalog
+    return catalog
@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from .arrays import _import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# default chunk size along the last three axes
+CHUNK_SIZE = 64
+
+# compressors supported by the store, with their default level
+COMPRESSORS = {"zlib": 1, "zstd": 3}
+
+
+def _import_zstandard() -> Any:
+    """Import zstandard, which is an optional dependency.
+
+    Returns
+    -------
+    module
+        The zstandard module.
+
+    Raises
+    ------
+    ImportError
+        If zstandard is not installed.
+    """
+    try:
+        import zstandard  # type: ignore[import-not-found, unused-ignore]
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires the `zstandard` package, install it with "
+            "`pip install careamics-portfolio[zstd]`."
+        ) from e
+    return zstandard
+
+
+def _compress(data: bytes, compressor: dict[str, Any] | None) -> bytes:
+    """Compress a chunk.
+
+    Parameters
+    ----------
+    data : bytes
+        Raw chunk.
+    compressor : dict[str, Any] | None
+        Zarr compressor configuration, None for uncompressed chunks.
+
+    Returns
+    -------
+    bytes
+        Compressed chunk.
+    """
+    if compressor is None:
+        return data
+    elif compressor["id"] == "zlib":
+        return zlib.compress(data, compressor["level"])
+    elif compressor["id"] == "zstd":
+        zstandard = _import_zstandard()
+        return zstandard.ZstdCompressor(  # type: ignore[no-any-return]
+            level=compressor["level"]
+        ).compress(data)
+    raise ValueError(f"Unsupported compressor {compressor['id']}.")
+
+
+def _decompress(data: bytes, compressor: dict[str, Any] | None) -> bytes:
+    """Decompress a chunk.
+
+    Parameters
+    ----------
+    data : bytes
+        Compressed chunk.
+    compressor : dict[str, Any] | None
+        Zarr compressor configuration, None for uncompressed chunks.
+
+    Returns
+    -------
+    bytes
+        Raw chunk.
+    """
+    if compressor is None:
+        return data
+    elif compressor["id"] == "zlib":
+        return zlib.decompress(data)
+    elif compressor["id"] == "zstd":
+        zstandard = _import_zstandard()
+        return zstandard.ZstdDecompressor().decompress(  # type: ignore[no-any-return]
+            data
+        )
+    raise ValueError(f"Unsupported compressor {compressor['id']}.")
+
+
+def default_chunks(shape: Sequence[int]) -> tuple[int, ...]:
+    """Chunk shape used if none is specified.
+
+    The last three axes are split in chunks of 64 pixels, and the other axes in
+    chunks of 1, all clipped to the shape of the array.
+
+    Parameters
+    ----------
+    shape : Sequence[int]
+        Shape of the array.
+
+    Returns
+    -------
+    tuple[int, ...]
+        Chunk shape.
+    """
+    ndim = len(shape)
+    return tuple(
+        max(1, min(n, CHUNK_SIZE if axis >= ndim - 3 else 1))
+        for axis, n in enumerate(shape)
+    )
+
+
+class ZarrArray:
+    """Array of a Zarr (v2) store, whose chunks are read when indexed.
+
+    Indexing follows the orthogonal semantics of Zarr: each axis is indexed
+    independently by an integer, a slice or a list of integers, and only the
+    chunks overlapping the selection are read.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Folder of the array, containing its `.zarray` metadata.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        with open(self.path / ".zarray") as f:
+            self._meta: dict[str, Any] = json.load(f)
+
+        np = _import_numpy()
+        self.shape: tuple[int, ...] = tuple(self._meta["shape"])
+        self.chunks: tuple[int, ...] = tuple(self._meta["chunks"])
+        self.dtype = np.dtype(self._meta["dtype"])
+        self._separator = self._meta.get("dimension_separator", ".")
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions.
+
+        Returns
+        -------
+        int
+            Number of dimensions.
+        """
+        return len(self.shape)
+
+    @property
+    def compressor(self) -> str | None:
+        """Name of the compressor of the chunks.
+
+        Returns
+        -------
+        str | None
+            Name of the compressor, None if the chunks are not compressed.
+        """
+        compressor = self._meta["compressor"]
+        return None if compressor is None else str(compressor["id"])
+
+    def __len__(self) -> int:
+        """Length of the first axis.
+
+        Returns
+        -------
+        int
+            Length of the first axis.
+        """
+        if not self.shape:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        """Representation of the array.
+
+        Returns
+        -------
+        str
+            Path, shape, chunks and dtype of the array.
+        """
+        return (
+            f"ZarrArray({self.path}, shape={self.shape}, chunks={self.chunks}, "
+            f"dtype={self.dtype})"
+        )
+
+    def _read_chunk(self, index: tuple[int, ...]) -> np.ndarray:
+        """Read a chunk.
+
+        Parameters
+        ----------
+        index : tuple[int, ...]
+            Index of the chunk in the chunk grid.
+
+        Returns
+        -------
+        np.ndarray
+            Chunk, filled with the fill value if it was not written.
+        """
+        np = _import_numpy()
+        name = self._separator.join(map(str, index)) if index else "0"
+        try:
+            with open(self.path / name, "rb") as f:
+                data = _decompress(f.read(), self._meta["compressor"])
+        except FileNotFoundError:
+            chunk = np.full(self.chunks, self._meta["fill_value"] or 0, self.dtype)
+        else:
+            chunk = np.frombuffer(data, dtype=self.dtype)
+        return chunk.reshape(  # type: ignore[no-any-return]
+            self.chunks, order=self._meta["order"]
+        )
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        """Read the data selected by an orthogonal index.
+
+        Parameters
+        ----------
+        key : Any
+            Index, with an integer, a slice or a list of integers per axis.
+
+        Returns
+        -------
+        np.ndarray
+            Selected data.
+        """
+        np = _import_numpy()
+        key = key if isinstance(key, tuple) else (key,)
+        if any(k is None for k in key):
+            raise IndexError("New axes are not supported.")
+        ellipses = [i for i, k in enumerate(key) if k is Ellipsis]
+        if len(ellipses) > 1:
+            raise IndexError("An index can only have a single ellipsis.")
+        if ellipses:
+            i = ellipses[0]
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1 :]
+        if len(key) > self.ndim:
+            raise IndexError(f"Too many indices for an array of shape {self.shape}.")
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        # indices selected along each axis, and the bounding box of the selection
+        indices = [np.arange(n)[k] for n, k in zip(self.shape, key)]
+        if any(np.size(idx) == 0 for idx in indices):
+            shape = [len(idx) for idx in indices if np.ndim(idx) > 0]
+            return np.empty(shape, dtype=self.dtype)  # type: ignore[no-any-return]
+        lows = [int(np.min(idx)) for idx in indices]
+        highs = [int(np.max(idx)) + 1 for idx in indices]
+
+        box = np.empty([h - lo for lo, h in zip(lows, highs)], dtype=self.dtype)
+        grid = [
+            range(lo // c, (h - 1) // c + 1)
+            for lo, h, c in zip(lows, highs, self.chunks)
+        ]
+        for index in itertools.product(*grid):
+            chunk = self._read_chunk(index)
+            source, target = [], []
+            for i, lo, h, c in zip(index, lows, highs, self.chunks):
+                start, stop = max(lo, i * c), min(h, (i + 1) * c)
+                source.append(slice(start - i * c, stop - i * c))
+                target.append(slice(start - lo, stop - lo))
+            box[tuple(target)] = chunk[tuple(source)]
+
+        # select the indices within the box, last axes first since integers
+        # remove their axis
+        for axis in reversed(range(self.ndim)):
+            idx = indices[axis] - lows[axis]
+            if np.ndim(idx) > 0 and np.array_equal(idx, np.arange(box.shape[axis])):
+                continue
+            box = np.take(box, idx, axis=axis)
+        return box  # type: ignore[no-any-return]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        """Read the whole array.
+
+        Parameters
+        ----------
+        dtype : Any
+            Data type of the returned array, by default None.
+        copy : Any
+            Ignored, the data is always read.
+
+        Returns
+        -------
+        np.ndarray
+            Data of the array.
+        """
+        data = self[...]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+
+def write_zarr(
+    array: Any,
+    path: str | os.PathLike,
+    chunks: Sequence[int] | None = None,
+    compressor: str | None = "zlib",
+    max_workers: int = 4,
+) -> ZarrArray:
+    """Write an array-like object as a Zarr (v2) array.
+
+    The source is read one slab of chunks along the first axis at a time, and
+    the chunks of a slab are compressed and written concurrently.
+
+    Parameters
+    ----------
+    array : Any
+        Object with `shape` and `dtype` attributes, supporting NumPy slicing,
+        e.g. a `LazyArray`.
+    path : str | os.PathLike
+        Folder of the array.
+    chunks : Sequence[int] | None
+        Chunk shape, by default None, in which case `default_chunks` is used.
+    compressor : str | None
+        Compressor of the chunks, "zlib", "zstd" or None, by default "zlib".
+    max_workers : int
+        Maximum number of chunks compressed concurrently, by default 4.
+
+    Returns
+    -------
+    ZarrArray
+        The written array.
+
+    Raises
+    ------
+    ValueError
+        If the chunk shape does not match the array, or if the compressor is
+        unknown.
+    """
+    np = _import_numpy()
+    shape = tuple(array.shape)
+    chunks = default_chunks(shape) if chunks is None else tuple(chunks)
+    if len(chunks) != len(shape) or any(c < 1 for c in chunks):
+        raise ValueError(f"Invalid chunks {chunks} for an array of shape {shape}.")
+    if compressor is not None and compressor not in COMPRESSORS:
+        raise ValueError(
+            f"Unknown compressor {compressor}, use one of {list(COMPRESSORS)}."
+        )
+    config = (
+        None
+        if compressor is None
+        else {"id": compressor, "level": COMPRESSORS[compressor]}
+    )
+    if compressor == "zstd":
+        _import_zstandard()
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    dtype = np.dtype(array.dtype)
+    with open(path / ".zarray", "w") as f:
+        json.dump(
+            {
+                "zarr_format": 2,
+                "shape": shape,
+                "chunks": chunks,
+                "dtype": dtype.str,
+                "compressor": config,
+                "fill_value": 0,
+                "order": "C",
+                "filters": None,
+                "dimension_separator": ".",
+            },
+            f,
+        )
+
+    def write_chunk(slab: Any, offset: int, index: tuple[int, ...]) -> None:
+        # edge chunks are padded to the full chunk shape
+        chunk = np.zeros(chunks, dtype=dtype)
+        starts = [i * c for i, c in zip(index, chunks)]
+        starts[0] -= offset
+        selection = tuple(slice(s, s + c) for s, c in zip(starts, chunks))
+        data = slab[selection]
+        chunk[tuple(slice(0, n) for n in data.shape)] = data
+        name = ".".join(map(str, index)) if index else "0"
+        with open(path / name, "wb") as f:
+            f.write(_compress(chunk.tobytes(), config))
+
+    grid = [range(-(-n // c)) for n, c in zip(shape, chunks)]
+    if not shape:
+        write_chunk(np.asarray(array[...]), 0, ())
+    elif all(len(g) > 0 for g in grid):
+        with ThreadPoolExecutor(max_workers) as executor:
+            for i in grid[0]:
+                offset = i * chunks[0]
+                slab = np.asarray(array[offset : offset + chunks[0]])
+                futures = [
+                    executor.submit(write_chunk, slab, offset, (i, *index))
+                    for index in itertools.product(*grid[1:])
+                ]
+                for future in futures:
+                    future.result()
+
+    return ZarrArray(path)
+
+
+def open_store(
+    path: str | os.PathLike,
+    attributes: dict[str, Any],
+    chunks: Sequence[int] | None = None,
+    compressor: str | None = "zlib",
+) -> dict[str, ZarrArray] | None:
+    """Open the arrays of a Zarr (v2) group written by `write_store`.
+
+    Only the attributes of the group are read, so that the arrays written for
+    the same source and parameters are opened without the source arrays.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Folder of the group.
+    attributes : dict[str, Any]
+        JSON attributes identifying the source of the arrays, e.g. its hash.
+    chunks : Sequence[int] | None
+        Chunk shape of all arrays, by default None, see `default_chunks`.
+    compressor : str | None
+        Compressor of the chunks, "zlib", "zstd" or None, by default "zlib".
+
+    Returns
+    -------
+    dict[str, ZarrArray] | None
+        Arrays of the group indexed by name, or None if the group does not
+        exist, is incomplete or was written with other attributes or parameters.
+    """
+    path = Path(path)
+    try:
+        with open(path / ".zattrs") as f:
+            current = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    expected = {
+        **attributes,
+        "chunks": None if chunks is None else list(chunks),
+        "compressor": compressor,
+    }
+    if {k: v for k, v in current.items() if k != "arrays"} != expected:
+        return None
+
+    try:
+        return {name: ZarrArray(path / name) for name in current["arrays"]}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_store(
+    arrays: Mapping[str, Any],
+    path: str | os.PathLike,
+    attributes: dict[str, Any],
+    chunks: Sequence[int] | None = None,
+    compressor: str | None = "zlib",
+) -> dict[str, ZarrArray]:
+    """Write arrays in a Zarr (v2) group, unless it was already written.
+
+    The group records `attributes` along with the chunks, compressor and array
+    names. If an existing group has the same attributes, its arrays are returned
+    as is. Otherwise the group is written in a staging folder, which then
+    replaces the existing group.
+
+    Parameters
+    ----------
+    arrays : Mapping[str, Any]
+        Array-like objects indexed by name, names can contain `/`.
+    path : str | os.PathLike
+        Folder of the group.
+    attributes : dict[str, Any]
+        JSON attributes identifying the source of the arrays, e.g. its hash.
+    chunks : Sequence[int] | None
+        Chunk shape of all arrays, by default None, see `default_chunks`.
+    compressor : str | None
+        Compressor of the chunks, "zlib", "zstd" or None, by default "zlib".
+
+    Returns
+    -------
+    dict[str, ZarrArray]
+        Arrays of the group, indexed by name.
+    """
+    path = Path(path)
+    attributes = {
+        **attributes,
+        "chunks": None if chunks is None else list(chunks),
+        "compressor": compressor,
+        "arrays": sorted(arrays),
+    }
+
+    try:
+        with open(path / ".zattrs") as f:
+            current = json.load(f)
+    except (OSError, ValueError):
+        current = None
+
+    if current != attributes:
+        staging = path.with_name(path.name + ".part")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for name, array in arrays.items():
+            write_zarr(array, staging / name, chunks, compressor)
+
+        # intermediate folders are groups
+        for folder in [staging, *(p for p in staging.rglob("*") if p.is_dir())]:
+            if not (folder / ".zarray").exists():
+                with open(folder / ".zgroup", "w") as f:
+                    json.dump({"zarr_format": 2}, f)
+        with open(staging / ".zattrs", "w") as f:
+            json.dump(attributes, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+
+    return {name: ZarrArray(path / name) for name in sorted(arrays)}
@@ -1,9 +1,28 @@
+import os
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import pooch
 from pooch import Pooch
 
+from .downloaders import LocalDownloader, local_path, tar_member
+from .hashing import file_hash, split_hash
+from .verification_index import get_verification_index
+
+# environment variable listing mirrors of the portfolio
+MIRRORS_ENV = "CAREAMICS_PORTFOLIO_MIRRORS"
+
+# parsed registries, indexed by path, along with the stat of the file
+_registries: Dict[Path, Tuple[Tuple[int, int], Dict[str, str], Dict[str, str]]] = {}
+_registries_lock = threading.Lock()
+
+# pooch objects, indexed by cache folder and mirrors
+_poochfolios: Dict[Tuple[str, Tuple[str, ...]], "MirroredPooch"] = {}
+_poochfolios_lock = threading.Lock()
+
 
 def get_registry_path() -> Path:
     """Get the path to the registry.txt file.
@@ -16,34 +35,407 @@ def get_registry_path() -> Path:
     return Path(__file__).parent / "../registry/registry.txt"
 
 
-def get_poochfolio(path: Optional[Union[str, Path]] = None) -> Pooch:
-    """Create the pooch object for the whole portfolio.
+class MirroredPooch(Pooch):
+    """Pooch object trying mirrors before the URLs of the registry.
+
+    A mirror is a base URL, a local folder (path or `file://` URL) or a local
+    tar file, e.g. built by `PortfolioManager.build_mirror`, whose registry gives
+    the hash and relative URL of each file. Mirrors without registry hold the
+    files under their registry name. Mirrors are tried in order by `fetch`,
+    before the URL of the file in the registry.
+
+    Parameters
+    ----------
+    *args : Any
+        Arguments of `pooch.Pooch`.
+    mirrors : Sequence[str]
+        Base URLs, local folders or local tar files of the mirrors, by default
+        none.
+    **kwargs : Any
+        Keyword arguments of `pooch.Pooch`.
+    """
+
+    def __init__(self, *args: Any, mirrors: Sequence[str] = (), **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.mirrors = [str(mirror) for mirror in mirrors]
+
+        # parsed registry from which `registry` was copied, see `get_poochfolio`
+        self._source: Optional[Dict[str, str]] = None
+
+        # registries of the mirrors, with the size and modification time of the
+        # local ones, see `get_urls`
+        self._mirror_registries: Dict[
+            str,
+            Tuple[Optional[Tuple[int, int]], Optional[Dict[str, Tuple[str, str]]]],
+        ] = {}
+        self._mirrors_lock = threading.Lock()
+
+    def get_urls(self, fname: str) -> List[str]:
+        """Get the URLs of a file, mirrors first.
+
+        Mirrors with a registry (see `build_mirror`) are only used for the files
+        listed in it with the same hash, at the URL given by the registry.
+        Mirrors without registry are expected to hold the files under their
+        registry name.
+
+        Parameters
+        ----------
+        fname : str
+            Name of the file in the registry.
+
+        Returns
+        -------
+        List[str]
+            URLs or local paths of the file in each mirror, followed by its URL
+            in the registry.
+        """
+        known_hash = self.registry.get(fname)
+        urls = []
+        for mirror in self.mirrors:
+            registry = self._mirror_registry(mirror)
+            if registry is not None:
+                if fname in registry and (
+                    known_hash is None
+                    or split_hash(known_hash) == ("sha256", registry[fname][0])
+                ):
+                    urls.append(registry[fname][1])
+                continue
+
+            path = local_path(mirror)
+            if path is None:
+                urls.append(mirror.rstrip("/") + "/" + fname)
+            else:
+                urls.append(os.path.join(path, fname))
+        urls.append(self.get_url(fname))
+        return urls
+
+    def _mirror_registry(self, mirror: str) -> Optional[Dict[str, Tuple[str, str]]]:
+        """Registry of a mirror, read once unless a local registry changed.
+
+        Parameters
+        ----------
+        mirror : str
+            Mirror.
+
+        Returns
+        -------
+        Dict[str, Tuple[str, str]] | None
+            SHA256 and URL of the files of the mirror, or None if it has no
+            registry.
+        """
+        # imported here, the mirror module imports this one
+        from .mirror import REGISTRY_NAME, read_registry
+
+        path = local_path(mirror)
+        signature = None
+        if path is not None:
+            if not os.path.isfile(path):
+                path = os.path.join(path, REGISTRY_NAME)
+            try:
+                stat = os.stat(path)
+                signature = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                signature = (-1, -1)
+
+        with self._mirrors_lock:
+            cached = self._mirror_registries.get(mirror)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        registry = read_registry(mirror)
+        with self._mirrors_lock:
+            self._mirror_registries[mirror] = (signature, registry)
+        return registry
+
+
+def get_mirrors() -> List[str]:
+    """Get the mirrors set in the environment.
+
+    Returns
+    -------
+    List[str]
+        Base URLs or local folders listed in the `CAREAMICS_PORTFOLIO_MIRRORS`
+        environment variable, separated by `;`.
+    """
+    mirrors = os.environ.get(MIRRORS_ENV, "")
+    return [mirror.strip() for mirror in mirrors.split(";") if mirror.strip()]
+
+
+def load_registry(path: Union[str, Path]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Parse a registry file, unless it was already parsed and did not change.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to the registry file.
+
+    Returns
+    -------
+    Tuple[Dict[str, str], Dict[str, str]]
+        Hashes and URLs of the files of the registry, indexed by file name,
+        shared by all callers and therefore not to be modified.
+    """
+    path = Path(path)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _registries_lock:
+        cached = _registries.get(path)
+        if cached is None or cached[0] != signature:
+            parser = Pooch(path=path.parent, base_url="")
+            parser.load_registry(path)
+            cached = (signature, parser.registry, parser.urls)
+            _registries[path] = cached
+    return cached[1], cached[2]
+
+
+def get_poochfolio(
+    path: Optional[Union[str, Path]] = None,
+    mirrors: Optional[Sequence[Union[str, Path]]] = None,
+) -> MirroredPooch:
+    """Get the pooch object for the whole portfolio.
 
     By default the files will be downloaded and cached in the user's
     cache folder and can be retrieved automatically without downloading
     the file anew (thanks pooch!).
 
+    A single pooch object is created per cache folder and mirrors, and shared by
+    all threads. The registry is parsed once and parsed again only when the file
+    is modified, see `load_registry`.
+
 
     Attributes
     ----------
     path : Path
         Path to the folder in which to download the dataset. Defaults to None.
+    mirrors : Sequence[str | Path] | None
+        Base URLs or local folders of mirrors tried before the URLs of the
+        registry, see `MirroredPooch`. Defaults to None, in which case the
+        mirrors listed in the `CAREAMICS_PORTFOLIO_MIRRORS` environment
+        variable are used, if any.
 
     Returns
     -------
-    Pooch
+    MirroredPooch
         Pooch object for the whole portfolio.
 
     """
+    mirror_list = (
+        [str(mirror) for mirror in mirrors] if mirrors is not None else get_mirrors()
+    )
+
+    # Path to the registry.txt file
+    registry, urls = load_registry(get_registry_path())
+
+    # keyed by resolved folder, so that equivalent paths share the pooch object
     if path is None:
         path = pooch.os_cache("portfolio")
+    location = Path(pooch.utils.cache_location(path)).resolve()
 
-    poochfolio = pooch.create(
-        path=path,
-        base_url="",
-    )
+    key = (str(location), tuple(mirror_list))
+    with _poochfolios_lock:
+        poochfolio = _poochfolios.get(key)
+        if poochfolio is None:
+            poochfolio = MirroredPooch(
+                path=location,
+                base_url="",
+                mirrors=mirror_list,
+            )
+            _poochfolios[key] = poochfolio
 
-    # Path to the registry.txt file
-    poochfolio.load_registry(get_registry_path())
+        # copied, so that modifying the registry of a pooch object does not
+        # modify the others
+        if poochfolio._source is not registry:
+            poochfolio.registry = dict(registry)
+            poochfolio.urls = dict(urls)
+            poochfolio._source = registry
 
     return poochfolio
+
+
+def fetch(
+    poochfolio: Pooch,
+    fname: str,
+    processor: Optional[Callable[[str, str, Pooch], Any]] = None,
+    downloader: Optional[Callable[..., Any]] = None,
+    progressbar: Union[bool, Any] = False,
+    force_verify: bool = False,
+) -> Any:
+    """Get the path to a file of the registry, downloading it if necessary.
+
+    This function follows `pooch.Pooch.fetch`, with the exception that the hash
+    of a new download is not computed by reading the file once it is written. If
+    the downloader exposes the SHA256 computed while streaming the file in its
+    `digest` attribute, it is compared to the registry directly. The downloaded
+    file is then atomically moved to its final location.
+
+    If the pooch object has mirrors (see `MirroredPooch`), they are tried in
+    order before the URL of the registry, moving on to the next URL if the file
+    is missing, cannot be downloaded or does not match its hash. Files of local
+    mirrors, including members of tar mirrors, are copied with `LocalDownloader`.
+
+    Existing files are checked against the verification index of the cache
+    folder (see `VerificationIndex`): files that were verified and whose size,
+    modification time and inode did not change since are not hashed again.
+
+    Parameters
+    ----------
+    poochfolio : Pooch
+        Pooch object of the portfolio.
+    fname : str
+        Name of the file in the registry.
+    processor : Callable[[str, str, Pooch], Any] | None
+        Pooch processor called with the path to the file, by default None.
+    downloader : Callable | None
+        Pooch downloader of remote URLs, by default None, in which case pooch
+        chooses the downloader according to the URL.
+    progressbar : bool | Any
+        Progress bar passed to the default downloader, by default False.
+    force_verify : bool
+        Whether to hash an existing file even if it is in the verification index,
+        by default False.
+
+    Returns
+    -------
+    Any
+        Path to the file, or output of the processor.
+
+    Raises
+    ------
+    ValueError
+        If the file is not in the registry, if it needs an update and updates are
+        disallowed, or if the hash of the downloaded file does not match.
+    """
+    url = poochfolio.get_url(fname)
+    full_path = Path(poochfolio.abspath) / fname
+    known_hash = poochfolio.registry[fname]
+    index = get_verification_index(poochfolio.abspath)
+
+    if not full_path.exists():
+        action, verb = "download", "Downloading"
+    elif known_hash is None or index.verify(
+        fname, full_path, known_hash, force_verify=force_verify
+    ):
+        action, verb = "fetch", "Fetching"
+    else:
+        action, verb = "update", "Updating"
+        if not poochfolio.allow_updates:
+            raise ValueError(
+                f"{fname} needs to update {full_path} but updates are disallowed."
+            )
+
+    if action in ("download", "update"):
+        if not full_path.parent.exists():
+            os.makedirs(full_path.parent)
+
+        # mirrors first, then the URL of the registry
+        urls = (
+            poochfolio.get_urls(fname)
+            if isinstance(poochfolio, MirroredPooch)
+            else [url]
+        )
+        for i, url in enumerate(urls):
+            last = i == len(urls) - 1
+            pooch.get_logger().info(
+                "%s file '%s' from '%s' to '%s'.",
+                verb,
+                fname,
+                url,
+                str(full_path.parent),
+            )
+
+            if local_path(url) is not None or tar_member(url) is not None:
+                url_downloader: Callable[..., Any] = LocalDownloader()
+            elif downloader is not None:
+                url_downloader = downloader
+            else:
+                url_downloader = pooch.downloaders.choose_downloader(
+                    url, progressbar=progressbar
+                )
+
+            try:
+                _stream_download(
+                    url,
+                    full_path,
+                    known_hash,
+                    url_downloader,
+                    poochfolio,
+                    poochfolio.retry_if_failed if last else 0,
+                )
+                break
+            except (ValueError, OSError) as e:
+                # network errors are OSError
+                if last:
+                    raise
+                pooch.get_logger().info("Failed to fetch '%s' (%s).", url, e)
+
+        if known_hash is not None:
+            index.add(fname, full_path, known_hash)
+
+    if processor is not None:
+        return processor(str(full_path), action, poochfolio)
+
+    return str(full_path)
+
+
+def _stream_download(
+    url: str,
+    full_path: Path,
+    known_hash: Optional[str],
+    downloader: Callable[..., Any],
+    poochfolio: Pooch,
+    retry_if_failed: int = 0,
+) -> None:
+    """Download a file to a temporary file, check its hash and move it in place.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    full_path : Path
+        Final path of the file.
+    known_hash : str | None
+        Expected hash of the file, no check is performed if None.
+    downloader : Callable
+        Pooch downloader.
+    poochfolio : Pooch
+        Pooch object calling the downloader.
+    retry_if_failed : int
+        Number of times the download is retried after a failure, by default 0.
+    """
+    # lazy import, as pooch does, to speed up import time
+    import requests
+
+    for attempt in range(1 + retry_if_failed):
+        fd, tmp = tempfile.mkstemp(prefix="tmp", dir=full_path.parent)
+        os.close(fd)
+        try:
+            downloader(url, tmp, poochfolio)
+
+            if known_hash is not None:
+                algorithm, expected = split_hash(known_hash)
+                digest = getattr(downloader, "digest", None)
+                if digest is None or algorithm != "sha256":
+                    digest = file_hash(tmp, algorithm)
+
+                if digest != expected:
+                    raise ValueError(
+                        f"{algorithm.upper()} hash of downloaded file "
+                        f"({full_path.name}) does not match the known hash: "
+                        f"expected {expected}, got {digest}. The file may have been "
+                        "corrupted or the known hash may be outdated."
+                    )
+
+            os.replace(tmp, full_path)
+            return
+        except (ValueError, requests.exceptions.RequestException):
+            if attempt == retry_if_failed:
+                raise
+
+            pooch.get_logger().info(
+                "Failed to download '%s'. Will attempt the download again.",
+                full_path.name,
+            )
+            time.sleep(min(attempt + 1, 10))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
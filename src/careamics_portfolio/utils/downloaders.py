@@ -0,0 +1,897 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from .hashing import BUFFER_SIZE, OrderedHasher
+
+if TYPE_CHECKING:
+    from pooch import Pooch
+
+# timeout (in seconds) of the HTTP requests
+TIMEOUT = 30
+
+
+class RangeNotSupportedError(Exception):
+    """Raised when a server ignores an HTTP range request."""
+
+
+class _ThreadSafeProgress:
+    """Serialize the calls to a progress bar shared by several connections."""
+
+    def __init__(self, progressbar: bool | Any, total: int) -> None:
+        self._lock = threading.Lock()
+        self._bar: Any
+        if progressbar is True:
+            # lazy import, as pooch does, to speed up import time
+            from tqdm import tqdm
+
+            self._bar = tqdm(
+                total=total,
+                ncols=79,
+                ascii=bool(sys.platform == "win32"),
+                unit="B",
+                unit_scale=True,
+                leave=True,
+            )
+        elif progressbar:
+            self._bar = progressbar
+            self._bar.total = total
+        else:
+            self._bar = None
+
+    def update(self, n: int) -> None:
+        if self._bar is not None:
+            with self._lock:
+                self._bar.update(n)
+
+    def close(self, fill: bool = True) -> None:
+        if self._bar is not None:
+            if fill:
+                # same sequence as pooch, to fill the bar
+                self._bar.reset()
+                self._bar.update(self._bar.total)
+            self._bar.close()
+
+
+class DownloadJournal:
+    """Sidecar journal recording the progress of a partial download.
+
+    The journal is a small JSON file stored next to the partial file. It records
+    the byte ranges the file was split in, the number of bytes received in each
+    range, as well as the size and validators (`ETag`, `Last-Modified`) of the
+    remote file. A download is only resumed if the remote file did not change.
+
+    Attributes
+    ----------
+    path : Path
+        Path to the journal.
+    url : str
+        URL of the file being downloaded.
+    size : int
+        Size of the file in bytes.
+    validators : dict[str, str]
+        `ETag` and `Last-Modified` headers of the remote file.
+    ranges : list[list[int]]
+        List of `[start, end, received]` triplets, where `[start, end)` is a byte
+        range and `received` the number of bytes already written at `start`.
+    hashed : tuple[int, str] | None
+        Offset up to which the file was hashed and SHA256 digest of the data
+        preceding it, used to check the partial file before resuming.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        url: str,
+        size: int,
+        validators: dict[str, str],
+        ranges: list[list[int]],
+        hashed: tuple[int, str] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.url = url
+        self.size = size
+        self.validators = validators
+        self.ranges = ranges
+        self.hashed = hashed
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> DownloadJournal | None:
+        """Load a journal from disk.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path to the journal.
+
+        Returns
+        -------
+        DownloadJournal | None
+            Journal, or None if it does not exist or cannot be read.
+        """
+        try:
+            with open(path) as f:
+                content = json.load(f)
+
+            hashed = content.get("hashed")
+            return cls(
+                path,
+                url=content["url"],
+                size=content["size"],
+                validators=content["validators"],
+                ranges=content["ranges"],
+                hashed=(hashed[0], hashed[1]) if hashed else None,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @property
+    def received(self) -> int:
+        """Total number of bytes received."""
+        return sum(received for _, _, received in self.ranges)
+
+    def matches(self, url: str, size: int, validators: dict[str, str]) -> bool:
+        """Check whether the journal describes a download of the same file.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file.
+        size : int
+            Size of the remote file in bytes.
+        validators : dict[str, str]
+            `ETag` and `Last-Modified` headers of the remote file.
+
+        Returns
+        -------
+        bool
+            Whether the partial download can be resumed.
+        """
+        return self.url == url and self.size == size and self.validators == validators
+
+    def update(
+        self, index: int, received: int, hashed: tuple[int, str] | None = None
+    ) -> None:
+        """Record the bytes received in a range and save the journal.
+
+        The data must have been written to the partial file beforehand.
+
+        Parameters
+        ----------
+        index : int
+            Index of the range.
+        received : int
+            Number of bytes received in the range.
+        hashed : tuple[int, str] | None
+            Offset up to which the file was hashed and digest of the data
+            preceding it, by default None.
+        """
+        with self._lock:
+            self.ranges[index][2] = received
+            if hashed is not None:
+                self.hashed = hashed
+            self.save()
+
+    def save(self) -> None:
+        """Atomically write the journal to disk."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "url": self.url,
+                    "size": self.size,
+                    "validators": self.validators,
+                    "ranges": self.ranges,
+                    "hashed": self.hashed,
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        """Delete the journal."""
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+class RangeDownloader:
+    """Download manager fetching a file over several HTTP connections.
+
+    The file is split in contiguous byte ranges that are downloaded in parallel
+    using HTTP `Range` requests, and written directly at their offset in a
+    preallocated file. If the server does not advertise `Accept-Ranges`, the file
+    is downloaded over a single stream.
+
+    If `partial_file` is set, the ranges are downloaded into this file and their
+    progress is recorded in a journal (`<partial_file>.json`). If the download
+    is interrupted, the next call resumes each range where it stopped, provided
+    the remote file did not change. The partial file is moved to the output file
+    once complete.
+
+    The SHA256 of the file is computed while the data arrives and is available
+    in the `digest` attribute after the download, which spares reading the file
+    a second time to verify it (see `fetch`).
+
+    A `sink` (e.g. `StreamingExtractor`) can consume the file while it is
+    downloaded. Its `start` method is called with the path to the file being
+    written, the size of the file and, if the server supports range requests, a
+    function fetching any byte range of the remote file. The data is then
+    passed in order to its `write` method, with its offset, once written to
+    disk. Finally, `close` is called once the download is complete, or `abort`
+    if it is interrupted.
+
+    Parameters
+    ----------
+    connections : int
+        Number of parallel connections, by default 4.
+    progressbar : bool | Any
+        Whether to display a progress bar, or a pooch-compatible progress bar
+        object, by default False.
+    chunk_size : int
+        Size in bytes of the chunks streamed by each connection, by default 1 MiB.
+    min_range_size : int
+        Minimum size in bytes of the ranges, small files are downloaded over fewer
+        connections, by default 4 MiB.
+    timeout : float
+        Timeout of the HTTP requests in seconds, by default 30.
+    partial_file : str | os.PathLike | None
+        Path to the partial file allowing resuming interrupted downloads, by
+        default None.
+    journal_interval : int
+        Number of bytes received by a connection between two journal updates, by
+        default 16 MiB.
+    sink : Any
+        Object consuming the data while it is downloaded, by default None.
+
+    Attributes
+    ----------
+    digest : str | None
+        SHA256 hexadecimal digest of the last downloaded file.
+    """
+
+    def __init__(
+        self,
+        connections: int = 4,
+        progressbar: bool | Any = False,
+        chunk_size: int = 1024 * 1024,
+        min_range_size: int = 4 * 1024 * 1024,
+        timeout: float = TIMEOUT,
+        partial_file: str | os.PathLike | None = None,
+        journal_interval: int = 16 * 1024 * 1024,
+        sink: Any = None,
+    ) -> None:
+        if connections < 1:
+            raise ValueError("The number of connections must be at least 1.")
+
+        self.connections = connections
+        self.progressbar = progressbar
+        self.chunk_size = chunk_size
+        self.min_range_size = min_range_size
+        self.timeout = timeout
+        self.partial_file = Path(partial_file) if partial_file is not None else None
+        self.journal_interval = journal_interval
+        self.sink = sink
+        self.digest: str | None = None
+
+    @property
+    def journal_file(self) -> Path | None:
+        """Path to the journal of the partial file, if any."""
+        if self.partial_file is None:
+            return None
+        return self.partial_file.with_name(self.partial_file.name + ".json")
+
+    def __call__(
+        self,
+        url: str,
+        output_file: str | Any,
+        pooch: Pooch | None,
+        check_only: bool = False,
+    ) -> bool | None:
+        """Download the given URL to the given output file.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file to download.
+        output_file : str | Any
+            Path to the output file, file-like objects are downloaded over a
+            single stream.
+        pooch : Pooch | None
+            Pooch instance calling this method.
+        check_only : bool
+            If True, only check whether the file exists on the server, by default
+            False.
+
+        Returns
+        -------
+        bool | None
+            Whether the file is available if `check_only` is True, None
+            otherwise.
+        """
+        # lazy import, as pooch does, to speed up import time
+        import requests
+
+        self.digest = None
+        response = requests.head(url, timeout=self.timeout, allow_redirects=True)
+        if check_only:
+            return bool(response.status_code == 200)
+
+        # some servers do not answer HEAD requests, in which case the single
+        # stream will raise any meaningful error
+        size = int(response.headers.get("Content-Length", 0))
+        accepts_ranges = response.headers.get("Accept-Ranges", "none") == "bytes"
+        n_ranges = max(1, min(self.connections, size // self.min_range_size))
+        validators = {
+            key: response.headers[key]
+            for key in ("ETag", "Last-Modified")
+            if key in response.headers
+        }
+
+        if (
+            response.ok
+            and accepts_ranges
+            and size > 0
+            and (n_ranges > 1 or self.partial_file is not None)
+            and not hasattr(output_file, "write")
+        ):
+            try:
+                # skip the redirections for each range
+                self._download_ranges(
+                    url, response.url, output_file, size, n_ranges, validators
+                )
+                return None
+            except RangeNotSupportedError:
+                pass
+
+        # the partial file cannot be resumed without range requests
+        self._discard_partial()
+        self._download_stream(url, output_file)
+        return None
+
+    def _discard_partial(self) -> None:
+        """Delete the partial file and its journal, if any."""
+        for path in (self.partial_file, self.journal_file):
+            if path is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+
+    def _download_stream(self, url: str, output_file: str | Any) -> None:
+        """Download and hash the file over a single stream.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file to download.
+        output_file : str | Any
+            Path to the output file or file-like object.
+        """
+        import requests
+
+        hasher = hashlib.sha256()
+        with requests.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            total = int(response.headers.get("Content-Length", 0))
+            progress = _ThreadSafeProgress(self.progressbar, total)
+
+            ispath = not hasattr(output_file, "write")
+            if self.sink is not None:
+                self.sink.start(output_file if ispath else None, total)
+
+            f: Any = open(output_file, "w+b") if ispath else output_file
+            try:
+                offset = 0
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    if self.sink is not None:
+                        self.sink.write(offset, chunk)
+                    offset += len(chunk)
+                    progress.update(len(chunk))
+            except BaseException:
+                progress.close(fill=False)
+                if self.sink is not None:
+                    self.sink.abort()
+                raise
+            finally:
+                if ispath:
+                    f.close()
+
+        progress.close()
+        if self.sink is not None:
+            self.sink.close()
+        self.digest = hasher.hexdigest()
+
+    def _load_journal(
+        self, url: str, size: int, n_ranges: int, validators: dict[str, str]
+    ) -> tuple[DownloadJournal, OrderedHasher] | None:
+        """Load the journal of a resumable download, or start a new one.
+
+        The data already on disk is hashed and checked against the journal, the
+        download starts from scratch if they do not match.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file.
+        size : int
+            Size of the file in bytes.
+        n_ranges : int
+            Number of ranges of a new download.
+        validators : dict[str, str]
+            `ETag` and `Last-Modified` headers of the remote file.
+
+        Returns
+        -------
+        tuple[DownloadJournal, OrderedHasher] | None
+            Journal of the download and hasher of the partial file, or None if
+            the download is not resumable.
+        """
+        if self.partial_file is None or self.journal_file is None:
+            return None
+
+        journal = DownloadJournal.load(self.journal_file)
+        if (
+            journal is not None
+            and journal.matches(url, size, validators)
+            and self.partial_file.exists()
+            and self.partial_file.stat().st_size == size
+        ):
+            try:
+                return journal, OrderedHasher(
+                    self.partial_file, journal.ranges, journal.hashed
+                )
+            except (OSError, ValueError):
+                # corrupted partial file
+                pass
+
+        # start from scratch
+        self._discard_partial()
+        bounds = [size * i // n_ranges for i in range(n_ranges + 1)]
+        journal = DownloadJournal(
+            self.journal_file,
+            url=url,
+            size=size,
+            validators=validators,
+            ranges=[[start, end, 0] for start, end in zip(bounds[:-1], bounds[1:])],
+        )
+        preallocate(self.partial_file, size)
+        journal.save()
+        return journal, OrderedHasher(self.partial_file, journal.ranges)
+
+    def _download_ranges(
+        self,
+        url: str,
+        resolved_url: str,
+        output_file: str,
+        size: int,
+        n_ranges: int,
+        validators: dict[str, str],
+    ) -> None:
+        """Download the file in parallel byte ranges.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file to download.
+        resolved_url : str
+            URL of the file after redirections.
+        output_file : str
+            Path to the output file.
+        size : int
+            Size of the file in bytes.
+        n_ranges : int
+            Number of ranges.
+        validators : dict[str, str]
+            `ETag` and `Last-Modified` headers of the remote file.
+        """
+        resumable = self._load_journal(url, size, n_ranges, validators)
+        journal: DownloadJournal | None
+        if resumable is not None:
+            journal, hasher = resumable
+            target = str(self.partial_file)
+            ranges = journal.ranges
+        else:
+            journal = None
+            target = output_file
+            bounds = [size * i // n_ranges for i in range(n_ranges + 1)]
+            ranges = [[start, end, 0] for start, end in zip(bounds[:-1], bounds[1:])]
+            preallocate(target, size)
+            hasher = OrderedHasher(target, ranges)
+
+        progress = _ThreadSafeProgress(self.progressbar, size)
+        progress.update(sum(received for _, _, received in ranges))
+        try:
+            if self.sink is not None:
+                self._start_sink(target, size, resolved_url, hasher)
+
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [
+                    executor.submit(
+                        self._download_range,
+                        resolved_url,
+                        target,
+                        index,
+                        ranges[index],
+                        validators,
+                        progress,
+                        hasher,
+                        journal,
+                    )
+                    for index in range(len(ranges))
+                    if ranges[index][2] < ranges[index][1] - ranges[index][0]
+                ]
+
+                # raise the first error, if any
+                for future in futures:
+                    future.result()
+        except RangeNotSupportedError:
+            progress.close(fill=False)
+            if self.sink is not None:
+                self.sink.abort()
+            self._discard_partial()
+            raise
+        except BaseException:
+            progress.close(fill=False)
+            if self.sink is not None:
+                self.sink.abort()
+            raise
+
+        progress.close()
+        if self.sink is not None:
+            self.sink.close()
+        if journal is not None:
+            os.replace(target, output_file)
+            journal.remove()
+
+        if hasher.offset == size:
+            self.digest = hasher.hexdigest()
+
+    def _start_sink(
+        self, path: str, size: int, url: str, hasher: OrderedHasher
+    ) -> None:
+        """Start the sink and pass it the data already on disk.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file being written.
+        size : int
+            Size of the file in bytes.
+        url : str
+            URL of the file after redirections.
+        hasher : OrderedHasher
+            Hasher of the file, whose consumer is set to the sink.
+        """
+        self.sink.start(path, size, partial(self._read_range, url))
+
+        # data of a resumed download, hashed when the hasher was created
+        with open(path, "rb") as f:
+            offset = 0
+            while offset < hasher.offset:
+                block = f.read(min(BUFFER_SIZE, hasher.offset - offset))
+                self.sink.write(offset, block)
+                offset += len(block)
+
+        hasher.consumer = self.sink.write
+
+    def _read_range(self, url: str, start: int, end: int) -> bytes:
+        """Fetch a byte range of a remote file.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file.
+        start : int
+            Offset of the first byte.
+        end : int
+            Offset after the last byte.
+
+        Returns
+        -------
+        bytes
+            Content of the range.
+
+        Raises
+        ------
+        RangeNotSupportedError
+            If the server answers with the whole file.
+        """
+        import requests
+
+        response = requests.get(
+            url, headers={"Range": f"bytes={start}-{end - 1}"}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise RangeNotSupportedError(f"{url} does not support range requests.")
+        return bytes(response.content)
+
+    def _download_range(
+        self,
+        url: str,
+        output_file: str,
+        index: int,
+        byte_range: list[int],
+        validators: dict[str, str],
+        progress: _ThreadSafeProgress,
+        hasher: OrderedHasher,
+        journal: DownloadJournal | None,
+    ) -> None:
+        """Download the missing bytes of a range at the same offset.
+
+        Parameters
+        ----------
+        url : str
+            URL of the file to download.
+        output_file : str
+            Path to the preallocated output file.
+        index : int
+            Index of the range.
+        byte_range : list[int]
+            `[start, end, received]` triplet, where `[start, end)` is the byte
+            range and `received` the number of bytes already written.
+        validators : dict[str, str]
+            `ETag` and `Last-Modified` headers of the remote file.
+        progress : _ThreadSafeProgress
+            Progress bar.
+        hasher : OrderedHasher
+            Hasher of the file.
+        journal : DownloadJournal | None
+            Journal in which to record the progress, if any.
+
+        Raises
+        ------
+        RangeNotSupportedError
+            If the server answers with the whole file.
+        requests.exceptions.RequestException
+            If the server sends fewer bytes than requested.
+        """
+        import requests
+
+        start, end, received = byte_range
+        headers = {"Range": f"bytes={start + received}-{end - 1}"}
+        if received > 0 and validators:
+            # the server sends the whole file if it changed in the meantime
+            headers["If-Range"] = validators.get("ETag") or validators["Last-Modified"]
+
+        with requests.get(
+            url, headers=headers, stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeNotSupportedError(f"{url} does not support range requests.")
+
+            unsaved = 0
+
+            # unbuffered, so that the hasher can read back data written
+            with open(output_file, "r+b", buffering=0) as f:
+                f.seek(start + received)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    write_all(f, chunk)
+                    hasher.feed(index, start + received, chunk)
+                    received += len(chunk)
+                    unsaved += len(chunk)
+                    progress.update(len(chunk))
+
+                    if journal is not None and unsaved >= self.journal_interval:
+                        journal.update(index, received, hasher.checkpoint())
+                        unsaved = 0
+
+                if journal is not None:
+                    journal.update(index, received, hasher.checkpoint())
+
+        if received != end - start:
+            raise requests.exceptions.RequestException(
+                f"Incomplete range {start}-{end - 1} for {url} (received "
+                f"{received} bytes)."
+            )
+
+
+def preallocate(path: str | os.PathLike, size: int) -> None:
+    """Create a file of `size` bytes, reserving the disk space when possible.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the file.
+    size : int
+        Size of the file in bytes.
+    """
+    with open(path, "wb") as f:
+        if size > 0 and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                # not supported by the file system
+                pass
+        f.truncate(size)
+
+
+def write_all(f: Any, data: bytes) -> None:
+    """Write all the data to an unbuffered file.
+
+    Unbuffered writes may write only part of the data.
+
+    Parameters
+    ----------
+    f : Any
+        File opened in unbuffered binary mode.
+    data : bytes
+        Data to write.
+    """
+    view = memoryview(data)
+    while view:
+        n = f.write(view)
+        view = view[n:]
+
+
+def local_path(url: str) -> str | None:
+    """Path of a local file given as path or `file://` URL.
+
+    Parameters
+    ----------
+    url : str
+        Path or URL.
+
+    Returns
+    -------
+    str | None
+        Path to the local file, or None if `url` is a remote URL.
+    """
+    if url.startswith("file://"):
+        # lazy import, urllib.request imports http.client and ssl
+        from urllib.request import url2pathname
+
+        return url2pathname(urlparse(url).path)
+    if "://" in url:
+        return None
+    return url
+
+
+def tar_member_url(archive: str | os.PathLike, member: str) -> str:
+    """URL of a member of a local tar file, e.g. of a tar mirror.
+
+    Parameters
+    ----------
+    archive : str | os.PathLike
+        Path to the tar file.
+    member : str
+        Name of the member in the tar file.
+
+    Returns
+    -------
+    str
+        URL of the member, `tar+file://<absolute path>#<member>`.
+    """
+    return f"tar+{Path(archive).absolute().as_uri()}#{member}"
+
+
+def tar_member(url: str) -> tuple[str, str] | None:
+    """Path of the tar file and name of the member given by a tar member URL.
+
+    Parameters
+    ----------
+    url : str
+        URL, see `tar_member_url`.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        Path to the tar file and name of the member, or None if `url` is not a
+        tar member URL.
+    """
+    if not url.startswith("tar+file://") or "#" not in url:
+        return None
+
+    archive, member = url[len("tar+") :].split("#", 1)
+    path = local_path(archive)
+    assert path is not None
+    return path, member
+
+
+class LocalDownloader:
+    """Pooch downloader copying a local file, e.g. from a mirror on a shared drive.
+
+    Members of local tar files (see `tar_member_url`) are read from the tar file
+    directly, without extracting it.
+
+    The SHA256 of the file is computed while it is copied and exposed in the
+    `digest` attribute, so that the copy does not need to be read again.
+
+    Attributes
+    ----------
+    digest : str | None
+        SHA256 of the last copied file, or None.
+    """
+
+    def __init__(self) -> None:
+        self.digest: str | None = None
+
+    def __call__(
+        self,
+        url: str,
+        output_file: str | Any,
+        pooch: Pooch | None,
+        check_only: bool = False,
+    ) -> bool | None:
+        """Copy a local file to the given output file.
+
+        Parameters
+        ----------
+        url : str
+            Path or `file://` URL of the file, or URL of a member of a local tar
+            file.
+        output_file : str | Any
+            Path to the output file, or writable file-like object.
+        pooch : Pooch | None
+            Pooch instance calling this method.
+        check_only : bool
+            If True, only check whether the file exists, by default False.
+
+        Returns
+        -------
+        bool | None
+            Whether the file exists if `check_only` is True, None otherwise.
+
+        Raises
+        ------
+        ValueError
+            If `url` is a remote URL.
+        """
+        member = tar_member(url)
+        path = local_path(url) if member is None else member[0]
+        if path is None:
+            raise ValueError(f"{url} is not a local file.")
+        if member is not None:
+            # lazy import, tar mirrors are seldom used
+            import tarfile
+
+        if check_only:
+            if member is None:
+                return os.path.isfile(path)
+            try:
+                with tarfile.open(path) as tar:
+                    return tar.getmember(member[1]).isfile()
+            except (OSError, KeyError, tarfile.TarError):
+                return False
+
+        self.digest = None
+        hasher = hashlib.sha256()
+        with contextlib.ExitStack() as stack:
+            if member is None:
+                source: IO[bytes] = stack.enter_context(open(path, "rb"))
+            else:
+                tar = stack.enter_context(tarfile.open(path))
+                try:
+                    extracted = tar.extractfile(member[1])
+                except KeyError as e:
+                    # missing from the mirror, same error as a missing file
+                    raise FileNotFoundError(f"{url} does not exist.") from e
+                if extracted is None:
+                    raise ValueError(f"{url} is not a file.")
+                source = stack.enter_context(extracted)
+            target = (
+                stack.enter_context(open(output_file, "wb"))
+                if isinstance(output_file, (str, os.PathLike))
+                else output_file
+            )
+            while True:
+                block = source.read(BUFFER_SIZE)
+                if not block:
+                    break
+                hasher.update(block)
+                target.write(block)
+
+        self.digest = hasher.hexdigest()
+        return None
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+# size of the buffer used to read files when hashing them
+BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def split_hash(known_hash: str) -> tuple[str, str]:
+    """Split a pooch-style hash into algorithm and hexadecimal digest.
+
+    Parameters
+    ----------
+    known_hash : str
+        Hash, optionally prefixed by the algorithm (e.g. `md5:...`). Defaults to
+        SHA256 if no algorithm is specified.
+
+    Returns
+    -------
+    tuple[str, str]
+        Algorithm and lower case hexadecimal digest.
+    """
+    if ":" in known_hash:
+        algorithm, digest = known_hash.split(":", 1)
+        return algorithm.lower(), digest.lower()
+
+    return "sha256", known_hash.lower()
+
+
+def file_hash(
+    path: str | os.PathLike, algorithm: str = "sha256", buffer_size: int = BUFFER_SIZE
+) -> str:
+    """Compute the hash of a file.
+
+    The file is read in large blocks into a single preallocated buffer, which
+    avoids allocating a new bytes object for every block and lets hashlib
+    release the GIL while hashing.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the file.
+    algorithm : str
+        Hashing algorithm, by default "sha256".
+    buffer_size : int
+        Size of the read buffer in bytes, by default 8 MiB.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the file.
+    """
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hasher.update(view[:n])
+
+    return hasher.hexdigest()
+
+
+def verify(path: str | os.PathLike, known_hash: str) -> bool:
+    """Check that a file exists and that its hash matches the known hash.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the file.
+    known_hash : str
+        Expected hash, optionally prefixed by the algorithm (e.g. `md5:...`).
+
+    Returns
+    -------
+    bool
+        Whether the file exists and matches the hash.
+    """
+    if not Path(path).is_file():
+        return False
+
+    algorithm, digest = split_hash(known_hash)
+    return file_hash(path, algorithm) == digest
+
+
+class OrderedHasher:
+    """SHA256 of a file written concurrently at different offsets.
+
+    The file is split in contiguous byte ranges, each written sequentially by
+    its own writer. Writers report their chunks with `feed` once written. The
+    chunk at the hashing frontier is hashed directly from memory, then the
+    hasher catches up on data already written further in the file, reading it
+    back while it is still in the page cache. With a single range, the file is
+    therefore hashed entirely from memory as it arrives.
+
+    Since the state of a hash cannot be serialized, data already present on disk
+    (e.g. a resumed download) is hashed when the hasher is created. If a
+    `checkpoint` is given, the digest of the data is compared to it when the
+    frontier reaches the checkpoint offset.
+
+    The data can also be passed in order to a `consumer` (e.g. to extract an
+    archive while it is downloaded), which is called with the offset and content
+    of each block as it is hashed.
+
+    Parameters
+    ----------
+    path : str | os.PathLike | None
+        Path to the file being written, used to catch up on data written out of
+        order. Can be None if the file is written in a single range.
+    ranges : list[list[int]]
+        List of `[start, end, written]` triplets, where `[start, end)` is a byte
+        range and `written` the number of bytes already on disk at `start`.
+    checkpoint : tuple[int, str] | None
+        Offset and expected SHA256 hexadecimal digest of the data preceding it,
+        by default None.
+
+    Attributes
+    ----------
+    offset : int
+        Offset up to which the file was hashed.
+    consumer : Callable[[int, bytes], None] | None
+        Function called with the offset and content of each block hashed, by
+        default None. It is called with the lock of the hasher held, so that a
+        slow consumer slows down the writers.
+
+    Raises
+    ------
+    ValueError
+        If the data on disk does not match the checkpoint.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None,
+        ranges: list[list[int]],
+        checkpoint: tuple[int, str] | None = None,
+    ) -> None:
+        self.path = path
+        self._starts = [start for start, _, _ in ranges]
+        self._ends = [end for _, end, _ in ranges]
+        self._written = [written for _, _, written in ranges]
+        self._checkpoint = checkpoint
+        self._hasher: Any = hashlib.sha256()
+        self._lock = threading.Lock()
+        self.offset = self._starts[0] if ranges else 0
+        self.consumer: Callable[[int, bytes], None] | None = None
+
+        # hash the data already on disk (e.g. resumed download)
+        with self._lock:
+            self._catch_up()
+
+        # the checkpoint was not reached, it cannot be checked anymore
+        self._checkpoint = None
+
+    def feed(self, index: int, offset: int, chunk: bytes) -> None:
+        """Report a chunk written at `offset` in the range `index`.
+
+        Parameters
+        ----------
+        index : int
+            Index of the range.
+        offset : int
+            Offset of the chunk in the file.
+        chunk : bytes
+            Data written.
+        """
+        with self._lock:
+            self._written[index] = offset + len(chunk) - self._starts[index]
+            if offset == self.offset:
+                self._consume(chunk)
+            self._catch_up()
+
+    def _catch_up(self) -> None:
+        """Hash data already written beyond the frontier."""
+        while True:
+            # range containing the frontier
+            index = next(
+                (i for i, end in enumerate(self._ends) if self.offset < end), None
+            )
+            if index is None:
+                break
+
+            available = self._starts[index] + self._written[index]
+            if self.offset >= available:
+                break
+
+            # stop at the checkpoint to compare the digests
+            if self._checkpoint is not None and self.offset < self._checkpoint[0]:
+                available = min(available, self._checkpoint[0])
+
+            self._hash_from_disk(available)
+            self._check()
+
+    def _hash_from_disk(self, until: int) -> None:
+        """Hash the data on disk from the frontier to `until`.
+
+        Parameters
+        ----------
+        until : int
+            Offset up to which to hash the file.
+        """
+        if self.path is None:
+            raise RuntimeError("Data written out of order cannot be hashed.")
+
+        with open(self.path, "rb", buffering=0) as f:
+            f.seek(self.offset)
+            while self.offset < until:
+                block = f.read(min(BUFFER_SIZE, until - self.offset))
+                if not block:
+                    raise OSError(f"Unexpected end of file in {self.path}.")
+                self._consume(block)
+
+    def _consume(self, block: bytes) -> None:
+        """Hash the block at the frontier and pass it to the consumer.
+
+        Parameters
+        ----------
+        block : bytes
+            Data starting at the frontier.
+        """
+        self._hasher.update(block)
+        if self.consumer is not None:
+            self.consumer(self.offset, block)
+        self.offset += len(block)
+
+    def _check(self) -> None:
+        """Compare the digest to the checkpoint if the frontier reached it."""
+        if self._checkpoint is not None and self.offset == self._checkpoint[0]:
+            if self._hasher.hexdigest() != self._checkpoint[1]:
+                raise ValueError(
+                    f"Data in {self.path} does not match its checkpoint at offset "
+                    f"{self.offset}."
+                )
+            self._checkpoint = None
+
+    def checkpoint(self) -> tuple[int, str]:
+        """Offset of the frontier and digest of the data preceding it.
+
+        Returns
+        -------
+        tuple[int, str]
+            Offset and SHA256 hexadecimal digest.
+        """
+        with self._lock:
+            return self.offset, str(self._hasher.hexdigest())
+
+    def hexdigest(self) -> str:
+        """Hexadecimal digest of the data hashed so far.
+
+        Returns
+        -------
+        str
+            SHA256 hexadecimal digest.
+        """
+        return self.checkpoint()[1]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import TracebackType
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# locks of the paths held by the threads of this process, since advisory locks
+# on files are held per process
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    """Get the thread lock of a path, shared by the whole process.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the lock file.
+
+    Returns
+    -------
+    threading.Lock
+        Lock of the path.
+    """
+    key = os.path.realpath(path)
+    with _thread_locks_lock:
+        return _thread_locks.setdefault(key, threading.Lock())
+
+
+def _try_lock(fd: int) -> bool:
+    """Try to take an exclusive advisory lock on a file, without blocking.
+
+    Parameters
+    ----------
+    fd : int
+        File descriptor of the lock file.
+
+    Returns
+    -------
+    bool
+        Whether the lock was taken.
+    """
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            # record locks are supported by NFS, unlike flock on some systems
+            fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    """Release the advisory lock on a file.
+
+    Parameters
+    ----------
+    fd : int
+        File descriptor of the lock file.
+    """
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.lockf(fd, fcntl.LOCK_UN)
+
+
+class FileLock:
+    """Exclusive lock shared by processes, possibly on different hosts.
+
+    The lock is an advisory lock on a file, e.g. in a shared cache folder, and
+    is also exclusive between the threads of a process. Waiting processes poll
+    the lock with an exponential backoff. The lock file is left in place when
+    the lock is released.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the lock file, created if needed.
+    timeout : float | None
+        Maximum number of seconds to wait for the lock, by default None, in
+        which case the lock is waited for indefinitely.
+    poll_interval : float
+        Initial number of seconds between attempts to take the lock, by default
+        0.05.
+    max_interval : float
+        Maximum number of seconds between attempts, by default 1.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        timeout: float | None = None,
+        poll_interval: float = 0.05,
+        max_interval: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self._fd: int | None = None
+
+    @property
+    def is_locked(self) -> bool:
+        """Whether the lock is held by this object.
+
+        Returns
+        -------
+        bool
+            Whether the lock is held.
+        """
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        """Take the lock, waiting for other threads and processes to release it.
+
+        Raises
+        ------
+        TimeoutError
+            If the lock could not be taken within the timeout.
+        RuntimeError
+            If the lock is already held by this object.
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"The lock {self.path} is already held.")
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        thread_lock = _thread_lock(self.path)
+        if not thread_lock.acquire(
+            timeout=-1 if self.timeout is None else self.timeout
+        ):
+            raise TimeoutError(f"Timeout while waiting for the lock {self.path}.")
+
+        try:
+            if not self.path.parent.exists():
+                os.makedirs(self.path.parent, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            interval = self.poll_interval
+            while not _try_lock(fd):
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(
+                        f"Timeout while waiting for the lock {self.path}."
+                    )
+
+                wait = interval
+                if deadline is not None:
+                    wait = min(wait, max(deadline - time.monotonic(), 0))
+                time.sleep(wait)
+                interval = min(interval * 2, self.max_interval)
+        except BaseException:
+            thread_lock.release()
+            raise
+
+        self._fd = fd
+
+    def release(self) -> None:
+        """Release the lock.
+
+        Raises
+        ------
+        RuntimeError
+            If the lock is not held by this object.
+        """
+        if self._fd is None:
+            raise RuntimeError(f"The lock {self.path} is not held.")
+
+        fd, self._fd = self._fd, None
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+            _thread_lock(self.path).release()
+
+    def __enter__(self) -> FileLock:
+        """Take the lock.
+
+        Returns
+        -------
+        FileLock
+            The lock itself.
+        """
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Release the lock.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            Type of the exception raised in the context, if any.
+        exc_value : BaseException | None
+            Exception raised in the context, if any.
+        traceback : TracebackType | None
+            Traceback of the exception, if any.
+        """
+        self.release()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import os
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Any, Sequence
+
+from .processors import ArchiveFormat, _destination, compile_members, open_tar
+
+# suffix of the manifest file, next to the archive
+MANIFEST_SUFFIX = ".manifest.json"
+
+# size of the blocks read to compute checksums
+BLOCK_SIZE = 1024 * 1024
+
+
+def _crc32(fileobj: Any) -> int:
+    """Compute the CRC32 checksum of a file-like object.
+
+    Parameters
+    ----------
+    fileobj : Any
+        Readable file-like object, read until its end.
+
+    Returns
+    -------
+    int
+        CRC32 checksum.
+    """
+    crc = 0
+    while True:
+        block = fileobj.read(BLOCK_SIZE)
+        if not block:
+            return crc
+        crc = zlib.crc32(block, crc)
+
+
+def archive_members(
+    archive: str | os.PathLike, archive_format: ArchiveFormat
+) -> dict[str, dict[str, int]]:
+    """Size and CRC32 checksum of the files of an archive.
+
+    The checksums of zip members are read from the central directory, while
+    tar archives are read entirely to compute them. Members lying outside of
+    the extraction folder are ignored.
+
+    Parameters
+    ----------
+    archive : str | os.PathLike
+        Path to the archive.
+    archive_format : ArchiveFormat
+        Format of the archive.
+
+    Returns
+    -------
+    dict[str, dict[str, int]]
+        Size ("size") and checksum ("crc32") of each file, indexed by its path
+        relative to the extraction folder.
+    """
+    # only used to normalize the member names
+    root = Path(archive).resolve().with_name("root")
+
+    def relative(name: str) -> str | None:
+        destination = _destination(root, name)
+        return None if destination is None else destination.relative_to(root).as_posix()
+
+    members = {}
+    if archive_format == ArchiveFormat.ZIP:
+        with zipfile.ZipFile(archive) as f:
+            for info in f.infolist():
+                name = relative(info.filename)
+                if not info.is_dir() and name is not None:
+                    members[name] = {"size": info.file_size, "crc32": info.CRC}
+    else:
+        with open(archive, "rb") as fileobj, open_tar(fileobj, archive_format) as tar:
+            for member in tar:
+                name = relative(member.name)
+                source = tar.extractfile(member) if member.isfile() else None
+                if source is not None and name is not None:
+                    with source:
+                        members[name] = {"size": member.size, "crc32": _crc32(source)}
+
+    return members
+
+
+def write_manifest(
+    path: str | os.PathLike,
+    archive: str | os.PathLike,
+    archive_format: ArchiveFormat,
+    extract_dir: str | os.PathLike,
+    sha256: str,
+    members: Sequence[str] | None = None,
+) -> None:
+    """Check an extraction against its archive and record it in a manifest.
+
+    The size and checksum of each extracted file are compared to the archive,
+    and recorded in the manifest along with the names of all the files of the
+    archive, so that the extraction can later be checked without the archive.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the manifest.
+    archive : str | os.PathLike
+        Path to the archive.
+    archive_format : ArchiveFormat
+        Format of the archive.
+    extract_dir : str | os.PathLike
+        Extraction folder.
+    sha256 : str
+        Hash of the archive.
+    members : Sequence[str] | None
+        Glob patterns of the extracted members, by default None, in which case
+        all members were extracted.
+
+    Raises
+    ------
+    OSError
+        If an extracted file is missing or differs from the archive.
+    """
+    path, extract_dir = Path(path), Path(extract_dir)
+    select = compile_members(members)
+    expected = archive_members(archive, archive_format)
+
+    files = {}
+    for name, record in expected.items():
+        if not select(name):
+            continue
+        with open(extract_dir / name, "rb") as f:
+            crc32 = _crc32(f)
+            size = f.tell()
+        if {"size": size, "crc32": crc32} != record:
+            raise OSError(f"{extract_dir / name} differs from its archive {archive}.")
+        files[name] = record
+
+    manifest = {"sha256": sha256, "names": sorted(expected), "files": files}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def check_manifest(
+    path: str | os.PathLike,
+    extract_dir: str | os.PathLike,
+    sha256: str,
+    members: Sequence[str] | None = None,
+    force_verify: bool = False,
+) -> list[str] | None:
+    """Check that an extraction is intact according to its manifest.
+
+    The extracted files are compared to the manifest by size, and by checksum
+    if `force_verify` is True.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the manifest.
+    extract_dir : str | os.PathLike
+        Extraction folder.
+    sha256 : str
+        Hash of the archive.
+    members : Sequence[str] | None
+        Glob patterns of the members to check, by default None, in which case
+        all members are checked.
+    force_verify : bool
+        Whether to compute the checksums of the extracted files, by default
+        False.
+
+    Returns
+    -------
+    list[str] | None
+        Paths to the selected files, or None if the manifest is missing, was
+        written for another archive, or if a selected file was not extracted or
+        differs from the manifest.
+    """
+    extract_dir = Path(extract_dir)
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("sha256") != sha256:
+        return None
+
+    select = compile_members(members)
+    files = []
+    for name in manifest["names"]:
+        if not select(name):
+            continue
+
+        record = manifest["files"].get(name)
+        file = extract_dir / name
+        try:
+            if record is None or file.stat().st_size != record["size"]:
+                return None
+            if force_verify:
+                with open(file, "rb") as f:
+                    if _crc32(f) != record["crc32"]:
+                        return None
+        except OSError:
+            return None
+        files.append(str(file))
+
+    return files
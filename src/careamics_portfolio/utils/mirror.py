@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import tarfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from .download_utils import get_poochfolio
+from .downloaders import TIMEOUT, local_path, tar_member_url
+
+if TYPE_CHECKING:
+    from ..portfolio_entry import PortfolioEntry
+
+# name of the registry of a mirror
+REGISTRY_NAME = "registry.txt"
+
+
+def _registry(entries: list[PortfolioEntry]) -> str:
+    """Registry of a mirror, whose URLs are relative to the mirror.
+
+    Parameters
+    ----------
+    entries : list[PortfolioEntry]
+        Entries of the mirror.
+
+    Returns
+    -------
+    str
+        Content of the registry.
+    """
+    lines = ["# Portfolio mirror - pooch registry, URLs relative to the mirror\n"]
+    for entry in entries:
+        name = entry.get_registry_name()
+        lines.append(f"{name} {entry.hash} {name}\n")
+    return "".join(lines)
+
+
+def read_registry(mirror: str) -> dict[str, tuple[str, str]] | None:
+    """Read the registry of a mirror.
+
+    Parameters
+    ----------
+    mirror : str
+        Base URL, local folder (path or `file://` URL) or local tar file of the
+        mirror.
+
+    Returns
+    -------
+    dict[str, tuple[str, str]] | None
+        SHA256 and URL of the files of the mirror, indexed by registry name, or
+        None if the mirror has no readable registry.
+    """
+    path = local_path(mirror)
+    resolve: Callable[[str], str]
+    try:
+        if path is None:
+            # lazy import, urllib.request imports http.client and ssl
+            from urllib.request import urlopen
+
+            base = mirror.rstrip("/") + "/"
+            with urlopen(base + REGISTRY_NAME, timeout=TIMEOUT) as response:
+                text = response.read().decode()
+
+            def resolve(url: str) -> str:
+                return base + url
+
+        elif os.path.isfile(path):
+            # the registry is the first member, see `build_mirror`
+            with tarfile.open(path) as tar:
+                info = tar.next()
+                member = tar.extractfile(info) if info is not None else None
+                if info is None or info.name != REGISTRY_NAME or member is None:
+                    return None
+                text = member.read().decode()
+
+            def resolve(url: str) -> str:
+                return tar_member_url(path, url)
+
+        else:
+            text = Path(path, REGISTRY_NAME).read_text()
+
+            def resolve(url: str) -> str:
+                return os.path.join(path, *url.split("/"))
+
+    except (OSError, ValueError, tarfile.TarError):
+        # network errors are OSError
+        return None
+
+    files = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) != 3 or fields[0].startswith("#"):
+            continue
+        name, sha256, url = fields
+        files[name] = (sha256.lower(), resolve(url))
+    return files
+
+
+def build_mirror(
+    entries: Iterable[PortfolioEntry],
+    path: str | os.PathLike,
+    cache: str | Path | None = None,
+    as_tar: bool = False,
+    connections: int = 1,
+    progressbar: bool = True,
+) -> Path:
+    """Write the files of portfolio entries to a mirror.
+
+    The files are downloaded to the cache folder, unless they are already
+    there, and written to the mirror under their registry name, along with a
+    registry whose URLs are relative to the mirror. Archives are not extracted.
+
+    Parameters
+    ----------
+    entries : Iterable[PortfolioEntry]
+        Entries to include in the mirror.
+    path : str | os.PathLike
+        Folder of the mirror, or path to the tar file if `as_tar` is True.
+    cache : str | Path | None
+        Cache folder in which the files are downloaded, by default None, in
+        which case the system's cache is used.
+    as_tar : bool
+        Whether to write the mirror as a single uncompressed tar file, by
+        default False.
+    connections : int
+        Number of parallel connections used to download each file, by default
+        1.
+    progressbar : bool
+        Whether to display the progress of the downloads, by default True.
+
+    Returns
+    -------
+    Path
+        Path to the mirror.
+    """
+    path = Path(path)
+    unique = list({entry.get_registry_name(): entry for entry in entries}.values())
+
+    poochfolio = get_poochfolio(cache)
+    registry = _registry(unique).encode()
+
+    def fetch(entry: PortfolioEntry) -> Path:
+        entry._fetch(
+            poochfolio,
+            progressbar=progressbar,
+            connections=connections,
+            extract=False,
+        )
+        return Path(poochfolio.abspath) / entry.get_registry_name()
+
+    # each file is written right after its download, before a cache budget may
+    # evict it
+    if as_tar:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.part")
+        with tarfile.open(tmp, "w") as tar:
+            # registry first, it is read without scanning the tar file
+            info = tarfile.TarInfo(REGISTRY_NAME)
+            info.size = len(registry)
+            tar.addfile(info, io.BytesIO(registry))
+            for entry in unique:
+                file = fetch(entry)
+                tar.add(file, arcname=file.name)
+        os.replace(tmp, path)
+        return path
+
+    path.mkdir(parents=True, exist_ok=True)
+    for entry in unique:
+        file = fetch(entry)
+        destination = path / file.name
+        if destination.exists() and os.path.samefile(file, destination):
+            continue
+
+        # linked if possible, since archives are never modified in place
+        tmp = destination.with_name(f".{destination.name}.{os.getpid()}.part")
+        try:
+            os.link(file, tmp)
+        except OSError:
+            shutil.copyfile(file, tmp)
+        os.replace(tmp, destination)
+
+    tmp = path / f".{REGISTRY_NAME}.{os.getpid()}.part"
+    tmp.write_bytes(registry)
+    os.replace(tmp, path / REGISTRY_NAME)
+    return path
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import itertools
+import queue
+import random
+import threading
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from .arrays import _import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# seconds between checks of the stop event while the queue is full
+POLL_INTERVAL = 0.1
+
+# marks the end of the patches in the queue
+_DONE = object()
+
+
+def _slabs(
+    arrays: Sequence[Any], patch_shape: tuple[int, ...], stride: tuple[int, ...]
+) -> list[tuple[int, tuple[int, ...], int]]:
+    """List the slabs containing a row of patches.
+
+    A slab spans a patch along the first patched axis and the whole array along
+    the others, for a given index of the leading (non-patched) axes.
+
+    Parameters
+    ----------
+    arrays : Sequence[Any]
+        Array-like objects.
+    patch_shape : tuple[int, ...]
+        Shape of the patches, along the last axes of the arrays.
+    stride : tuple[int, ...]
+        Step between patches along each patched axis.
+
+    Returns
+    -------
+    list[tuple[int, tuple[int, ...], int]]
+        Index of the array, index along its leading axes and start of the slab
+        along the first patched axis.
+    """
+    slabs: list[tuple[int, tuple[int, ...], int]] = []
+    for i, array in enumerate(arrays):
+        shape = tuple(array.shape)
+        if len(shape) < len(patch_shape):
+            continue
+
+        leading = shape[: len(shape) - len(patch_shape)]
+        patched = shape[len(leading) :]
+        if any(n < p for n, p in zip(patched, patch_shape)):
+            continue
+
+        starts = range(0, patched[0] - patch_shape[0] + 1, stride[0])
+        for index in itertools.product(*(range(n) for n in leading)):
+            slabs.extend((i, index, start) for start in starts)
+    return slabs
+
+
+def _cut(
+    slab: np.ndarray, patch_shape: tuple[int, ...], stride: tuple[int, ...]
+) -> list[np.ndarray]:
+    """Cut a slab into patches.
+
+    Parameters
+    ----------
+    slab : np.ndarray
+        Slab whose first axis has the size of the patches.
+    patch_shape : tuple[int, ...]
+        Shape of the patches.
+    stride : tuple[int, ...]
+        Step between patches along each axis.
+
+    Returns
+    -------
+    list[np.ndarray]
+        Patches, copied out of the slab.
+    """
+    ranges = [
+        range(0, n - p + 1, s)
+        for n, p, s in zip(slab.shape[1:], patch_shape[1:], stride[1:])
+    ]
+    return [
+        slab[
+            (slice(None), *(slice(o, o + p) for o, p in zip(origin, patch_shape[1:])))
+        ].copy()
+        for origin in itertools.product(*ranges)
+    ]
+
+
+def iter_patches(
+    arrays: Sequence[Any],
+    patch_shape: Sequence[int],
+    stride: Sequence[int] | None = None,
+    batch_size: int = 1,
+    shuffle_buffer: int = 0,
+    seed: int | None = None,
+    prefetch: int = 2,
+    drop_last: bool = False,
+) -> Iterator[np.ndarray]:
+    """Iterate over batches of patches of arrays, reading them in the background.
+
+    Patches are taken along the last axes of the arrays, with the same number of
+    dimensions as `patch_shape`, for each index of the leading axes (e.g. each
+    image of a stack of 2D images). Only patches fully contained in the arrays
+    are returned.
+
+    The arrays are read one slab at a time, spanning a patch along the first
+    patched axis and the whole array along the others, by a background thread
+    holding at most `prefetch` slabs ahead of the consumer. Memory usage is
+    therefore bounded by the size of a few slabs and of the shuffle buffer,
+    regardless of the size of the arrays.
+
+    If `shuffle_buffer` is positive, the slabs are read in random order and the
+    patches are drawn at random from a buffer of `shuffle_buffer` patches.
+
+    Parameters
+    ----------
+    arrays : Sequence[Any]
+        Array-like objects supporting NumPy slicing, e.g. `LazyArray`.
+    patch_shape : Sequence[int]
+        Shape of the patches.
+    stride : Sequence[int] | None
+        Step between patches along each patched axis, by default None, in which
+        case the patches do not overlap.
+    batch_size : int
+        Number of patches per batch, by default 1.
+    shuffle_buffer : int
+        Number of patches from which each patch is drawn at random, by default
+        0, in which case patches are returned in order.
+    seed : int | None
+        Seed of the random generator, by default None.
+    prefetch : int
+        Number of slabs read ahead, by default 2.
+    drop_last : bool
+        Whether to drop the last batch if it is incomplete, by default False.
+
+    Yields
+    ------
+    np.ndarray
+        Batch of patches, of shape `(batch_size, *patch_shape)`.
+
+    Raises
+    ------
+    ValueError
+        If the patch shape, stride, batch size or prefetch are invalid.
+    """
+    np = _import_numpy()
+    patch_shape = tuple(patch_shape)
+    stride = patch_shape if stride is None else tuple(stride)
+    if not patch_shape or any(p < 1 for p in patch_shape):
+        raise ValueError(f"Invalid patch shape {patch_shape}.")
+    if len(stride) != len(patch_shape) or any(s < 1 for s in stride):
+        raise ValueError(f"Invalid stride {stride} for patches of {patch_shape}.")
+    if batch_size < 1 or prefetch < 1:
+        raise ValueError("The batch size and prefetch must be at least 1.")
+
+    rng = random.Random(seed)
+    slabs = _slabs(arrays, patch_shape, stride)
+    if shuffle_buffer > 0:
+        rng.shuffle(slabs)
+
+    chunks: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read() -> None:
+        try:
+            for i, index, start in slabs:
+                slab = np.asarray(
+                    arrays[i][(*index, slice(start, start + patch_shape[0]))]
+                )
+                if not put(_cut(slab, patch_shape, stride)):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    def patches() -> Iterator[Any]:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                return
+            elif isinstance(item, BaseException):
+                raise item
+            yield from item
+
+    def shuffled(source: Iterator[Any]) -> Iterator[Any]:
+        buffer: list[Any] = []
+        for patch in source:
+            if len(buffer) < shuffle_buffer:
+                buffer.append(patch)
+            else:
+                i = rng.randrange(shuffle_buffer)
+                buffer[i], patch = patch, buffer[i]
+                yield patch
+        rng.shuffle(buffer)
+        yield from buffer
+
+    thread = threading.Thread(target=read, daemon=True)
+    thread.start()
+    try:
+        source = patches()
+        if shuffle_buffer > 0:
+            source = shuffled(source)
+
+        while True:
+            batch = list(itertools.islice(source, batch_size))
+            if not batch or (drop_last and len(batch) < batch_size):
+                return
+            yield np.stack(batch)
+    finally:
+        stop.set()
+        thread.join()
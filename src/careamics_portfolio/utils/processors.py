@@ -0,0 +1,1078 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import queue
+import re
+import shutil
+import struct
+import sys
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Literal, Sequence
+
+from .downloaders import preallocate
+
+if TYPE_CHECKING:
+    from pooch import Pooch
+
+# maximum number of chunks buffered between the download and the extraction
+QUEUE_SIZE = 64
+
+# interval (in seconds) at which blocked threads check for an abort
+POLL_INTERVAL = 0.1
+
+# size of the blocks copied from an archive member to its file
+COPY_SIZE = 1024 * 1024
+
+# suffix of the index of the archive members, next to the archive
+INDEX_SUFFIX = ".index.json"
+
+# modes of `tarfile` reading each format as a stream, zstd is decompressed
+# beforehand
+_TAR_MODES: dict[str, Literal["r|", "r|gz"]] = {
+    "tar": "r|",
+    "tar.gz": "r|gz",
+    "tar.zst": "r|",
+}
+
+# zip end of central directory records, see the zip specification (APPNOTE)
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_EOCD_STRUCT = "<4s4H2LH"
+_EOCD_SIZE = 22
+_ZIP64_LOCATOR_STRUCT = "<4sLQL"
+_ZIP64_LOCATOR_SIZE = 20
+_ZIP64_EOCD_SIZE = 56
+_MAX_COMMENT_SIZE = 65535
+
+
+class ArchiveFormat(str, Enum):
+    """Format of the file of a portfolio entry."""
+
+    ZIP = "zip"
+    TAR = "tar"
+    TAR_GZ = "tar.gz"
+    TAR_ZST = "tar.zst"
+    NONE = "none"
+
+    @classmethod
+    def from_file_name(cls, file_name: str) -> ArchiveFormat:
+        """Infer the format of a file from its extension.
+
+        Parameters
+        ----------
+        file_name : str
+            Name of the file.
+
+        Returns
+        -------
+        ArchiveFormat
+            Format of the file, `NONE` if it is not a known archive format.
+        """
+        name = file_name.lower()
+        if name.endswith(".zip"):
+            return cls.ZIP
+        elif name.endswith((".tar.gz", ".tgz")):
+            return cls.TAR_GZ
+        elif name.endswith((".tar.zst", ".tzst")):
+            return cls.TAR_ZST
+        elif name.endswith(".tar"):
+            return cls.TAR
+
+        return cls.NONE
+
+
+def read_zip_tail(
+    read_range: Callable[[int, int], bytes], size: int
+) -> tuple[int, bytes]:
+    """Fetch the end of a remote zip archive, including its central directory.
+
+    The end of central directory record, at the very end of the archive, gives
+    the offset of the central directory. The tail is first fetched assuming the
+    longest possible archive comment, then extended to the start of the
+    central directory if needed.
+
+    Parameters
+    ----------
+    read_range : Callable[[int, int], bytes]
+        Function returning the bytes in `[start, end)` of the archive.
+    size : int
+        Size of the archive in bytes.
+
+    Returns
+    -------
+    tuple[int, bytes]
+        Offset of the tail and its content.
+
+    Raises
+    ------
+    zipfile.BadZipFile
+        If the end of central directory record cannot be found.
+    """
+    start = max(0, size - _EOCD_SIZE - _MAX_COMMENT_SIZE - _ZIP64_LOCATOR_SIZE)
+    tail = read_range(start, size)
+
+    position = tail.rfind(_EOCD_SIGNATURE)
+    if position < 0 or position + _EOCD_SIZE > len(tail):
+        raise zipfile.BadZipFile("End of central directory record not found.")
+    *_, cd_size, cd_offset, _ = struct.unpack(
+        _EOCD_STRUCT, tail[position : position + _EOCD_SIZE]
+    )
+
+    if 0xFFFFFFFF in (cd_size, cd_offset) and position >= _ZIP64_LOCATOR_SIZE:
+        # zip64, the offset of the central directory is in the zip64 record
+        _, _, zip64_offset, _ = struct.unpack(
+            _ZIP64_LOCATOR_STRUCT,
+            tail[position - _ZIP64_LOCATOR_SIZE : position],
+        )
+        if zip64_offset < start:
+            tail = read_range(zip64_offset, start) + tail
+            start = zip64_offset
+        record = tail[zip64_offset - start : zip64_offset - start + _ZIP64_EOCD_SIZE]
+        (cd_offset,) = struct.unpack("<Q", record[48:56])
+
+    if cd_offset < start:
+        tail = read_range(cd_offset, start) + tail
+        start = cd_offset
+
+    return start, tail
+
+
+class _OverlayFile(io.RawIOBase):
+    """Read-only file whose end is served from memory.
+
+    Used to open a zip archive whose central directory was fetched before the
+    rest of the archive is downloaded.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the (partially written) file.
+    size : int
+        Size of the file.
+    tail_offset : int
+        Offset of the data held in memory.
+    tail : bytes
+        Data at the end of the file.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, size: int, tail_offset: int, tail: bytes
+    ) -> None:
+        super().__init__()
+        self._file = open(path, "rb")
+        self._size = size
+        self._tail_offset = tail_offset
+        self._tail = tail
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        if self._position >= self._tail_offset:
+            start = self._position - self._tail_offset
+            data = self._tail[start : start + len(view)]
+        else:
+            n = min(len(view), self._tail_offset - self._position)
+            self._file.seek(self._position)
+            data = self._file.read(n)
+
+        view[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class _QueueReader(io.RawIOBase):
+    """Readable stream over the chunks put in a queue, None ending the stream.
+
+    Parameters
+    ----------
+    chunks : queue.Queue
+        Queue of chunks.
+    aborted : threading.Event
+        Event set if the stream is interrupted.
+    """
+
+    def __init__(self, chunks: queue.Queue, aborted: threading.Event) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._aborted = aborted
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer and not self._eof:
+            try:
+                chunk = self._chunks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if self._aborted.is_set():
+                    raise InterruptedError("The download was interrupted.") from None
+                continue
+
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer = memoryview(chunk)
+
+        view = memoryview(buffer).cast("B")
+        n = min(len(view), len(self._buffer))
+        view[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def drain(self) -> None:
+        """Discard the remaining chunks, e.g. the padding at the end of a tar."""
+        while self.readinto(bytearray(1024 * 1024)):
+            pass
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """Translate a glob pattern matching archive members to a regular expression.
+
+    `*` matches any characters but `/`, `?` a single character but `/`, `[...]`
+    a character class and `**` any number of folders. A pattern matching a
+    folder also matches all the members it contains.
+
+    Parameters
+    ----------
+    pattern : str
+        Glob pattern, relative to the root of the archive (e.g. `**/test/*.tif`).
+
+    Returns
+    -------
+    re.Pattern
+        Compiled regular expression.
+    """
+    i, n = 0, len(pattern)
+    regex = []
+    while i < n:
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            j = pattern.index("]", i + 2)
+            content = pattern[i + 1 : j]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex.append(f"[{content}]")
+            i = j + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+
+    return re.compile("".join(regex).rstrip("/") + r"(?:/.*)?\Z", re.DOTALL)
+
+
+def compile_members(patterns: Sequence[str] | None) -> Callable[[str], bool]:
+    """Build a filter of archive members from glob patterns.
+
+    Parameters
+    ----------
+    patterns : Sequence[str] | None
+        Glob patterns (see `glob_to_regex`), None to select all members.
+
+    Returns
+    -------
+    Callable[[str], bool]
+        Function returning whether a member, given its name, is selected.
+    """
+    if patterns is None:
+        return lambda name: True
+
+    regexes = [glob_to_regex(pattern) for pattern in patterns]
+    return lambda name: any(regex.match(name) for regex in regexes)
+
+
+def _destination(root: Path, name: str) -> Path | None:
+    """Path of an archive member, or None if it lies outside of the folder.
+
+    Parameters
+    ----------
+    root : Path
+        Extraction folder.
+    name : str
+        Name of the member in the archive.
+
+    Returns
+    -------
+    Path | None
+        Path to the extracted member.
+    """
+    destination = (root / name).resolve()
+    if destination == root or root not in destination.parents:
+        return None
+    return destination
+
+
+def _write_member(source: Any, destination: Path, size: int | None = None) -> None:
+    """Atomically write an archive member to its destination.
+
+    The member is written to a temporary file next to its destination, which
+    is then renamed, so that an existing file is always complete.
+
+    Parameters
+    ----------
+    source : Any
+        Readable file-like object with the content of the member.
+    destination : Path
+        Path to the extracted member.
+    size : int | None
+        Size of the member, used to preallocate the file, by default None.
+    """
+    tmp = destination.with_name(f".{destination.name}.part")
+    if size is not None:
+        preallocate(tmp, size)
+    with open(tmp, "r+b" if size is not None else "wb") as f:
+        shutil.copyfileobj(source, f, COPY_SIZE)
+    os.replace(tmp, destination)
+
+
+def open_tar(fileobj: Any, archive_format: ArchiveFormat) -> tarfile.TarFile:
+    """Open a tar stream through the decompressor of its format.
+
+    Parameters
+    ----------
+    fileobj : Any
+        Readable file-like object, read sequentially.
+    archive_format : ArchiveFormat
+        Format of the archive, one of the tar formats.
+
+    Returns
+    -------
+    tarfile.TarFile
+        Archive, whose members must be read in order.
+
+    Raises
+    ------
+    ImportError
+        If the archive is compressed with zstd and `zstandard` is not installed.
+    """
+    if archive_format == ArchiveFormat.TAR_ZST:
+        # optional dependency
+        try:
+            import zstandard  # type: ignore[import-not-found, unused-ignore]
+        except ImportError as e:
+            raise ImportError(
+                "Extracting tar.zst archives requires the `zstandard` package, "
+                "install it with `pip install careamics-portfolio[zstd]`."
+            ) from e
+
+        fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+
+    return tarfile.open(fileobj=fileobj, mode=_TAR_MODES[archive_format])
+
+
+def extract_tar(
+    fileobj: Any,
+    extract_dir: Path,
+    archive_format: ArchiveFormat,
+    select: Callable[[str], bool] | None = None,
+) -> list[str]:
+    """Extract a tar stream member after member.
+
+    The stream is read sequentially through the decompressor of the archive
+    format, without seeking or writing a decompressed copy of the archive. Only
+    regular files and folders are extracted, members pointing outside of the
+    extraction folder are ignored.
+
+    Parameters
+    ----------
+    fileobj : Any
+        Readable file-like object, read sequentially.
+    extract_dir : Path
+        Folder in which to extract the members.
+    archive_format : ArchiveFormat
+        Format of the archive, one of the tar formats.
+    select : Callable[[str], bool] | None
+        Function returning whether to extract a member given its name, by
+        default None, in which case all members are extracted.
+
+    Returns
+    -------
+    list[str]
+        Names of all the files in the archive, extracted or not.
+
+    Raises
+    ------
+    ImportError
+        If the archive is compressed with zstd and `zstandard` is not installed.
+    """
+    root = extract_dir.resolve()
+    names = []
+    with open_tar(fileobj, archive_format) as tar:
+        for member in tar:
+            if member.isfile():
+                names.append(member.name)
+            if select is not None and not select(member.name):
+                continue
+
+            destination = _destination(root, member.name)
+            if destination is None:
+                continue
+
+            if member.isdir():
+                destination.mkdir(parents=True, exist_ok=True)
+            elif member.isfile():
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                source = tar.extractfile(member)
+                if source is not None:
+                    with source:
+                        _write_member(source, destination, member.size)
+
+    return names
+
+
+class ArchiveExtractor:
+    """Pooch processor extracting an archive according to its format.
+
+    Zip archives are extracted with `zipfile`, tar archives are streamed member
+    by member through the decompressor of their format (see `extract_tar`). The
+    members are extracted in a staging folder, which is moved in place once the
+    extraction is complete, so that an interrupted extraction never leaves an
+    incomplete folder behind.
+
+    A subset of the members can be selected with glob patterns (see
+    `glob_to_regex`). If the archive was already extracted, the selected members
+    missing from the extraction folder are extracted, e.g. after a previous call
+    with a narrower selection. After each pass over the archive, the files of
+    the archive and those present in the extraction folder are saved next to it
+    (`<archive>.index.json`), along with the size and modification time of the
+    archive. As long as the archive does not change, a selection that was
+    already extracted neither opens the archive nor checks the extracted files,
+    and the archive is only read entirely if the index is missing or outdated.
+
+    Parameters
+    ----------
+    archive_format : ArchiveFormat | str
+        Format of the archive, by default zip.
+    members : Sequence[str] | None
+        Glob patterns selecting the members to extract, by default None, in
+        which case all members are extracted.
+
+    Raises
+    ------
+    ValueError
+        If the format is not an archive format.
+    """
+
+    def __init__(
+        self,
+        archive_format: ArchiveFormat | str = ArchiveFormat.ZIP,
+        members: Sequence[str] | None = None,
+    ):
+        self.archive_format = ArchiveFormat(archive_format)
+        if self.archive_format == ArchiveFormat.NONE:
+            raise ValueError("Files that are not archives cannot be extracted.")
+
+        self.members = list(members) if members is not None else None
+        self._select = compile_members(self.members)
+
+        # whether the members were already extracted in the staging folder
+        self._extracted = False
+
+        # names of the files in the archive, if it was read entirely
+        self._index: list[str] | None = None
+
+    @property
+    def suffix(self) -> str:
+        """Suffix of the extraction folder, following pooch's naming."""
+        return ".unzip" if self.archive_format == ArchiveFormat.ZIP else ".untar"
+
+    def _extract_file(
+        self, fname: str, extract_dir: Path, select: Callable[[str], bool]
+    ) -> None:
+        """Extract the selected members of the archive.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the archive.
+        extract_dir : Path
+            Folder in which to extract the members.
+        select : Callable[[str], bool]
+            Function returning whether to extract a member given its name.
+        """
+        if self.archive_format == ArchiveFormat.ZIP:
+            with zipfile.ZipFile(fname) as archive:
+                self._index = _zip_names(archive)
+                for info, destination in _zip_members(archive, extract_dir, select):
+                    with archive.open(info) as source:
+                        _write_member(source, destination, info.file_size)
+        else:
+            with open(fname, "rb") as f:
+                self._index = extract_tar(f, extract_dir, self.archive_format, select)
+
+    def _missing(self, fname: str, extract_dir: Path) -> Callable[[str], bool] | None:
+        """Filter of the selected members missing from the extraction folder.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the archive.
+        extract_dir : Path
+            Folder in which the archive was extracted.
+
+        Returns
+        -------
+        Callable[[str], bool] | None
+            Function returning whether to extract a member given its name, or
+            None if no selected member is missing.
+        """
+        index = self._read_index(fname)
+        if index is not None:
+            # the files present after the last pass are trusted, to avoid
+            # opening the archive and checking each file
+            extracted = set(index["extracted"])
+            if all(
+                name in extracted for name in index["members"] if self._select(name)
+            ):
+                return None
+            return lambda name: self._select(name) and name not in extracted
+
+        if self.archive_format != ArchiveFormat.ZIP and self.members is None:
+            # the folder was fully extracted, avoid reading the whole archive
+            return None
+
+        def missing(name: str) -> bool:
+            return self._select(name) and not (extract_dir / name).exists()
+
+        return missing
+
+    @staticmethod
+    def _stat(fname: str) -> dict[str, int]:
+        """Size and modification time of the archive, as recorded in the index.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the archive.
+
+        Returns
+        -------
+        dict[str, int]
+            Size and modification time (ns) of the archive.
+        """
+        stat = os.stat(fname)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _read_index(self, fname: str) -> dict[str, Any] | None:
+        """Read the index of the archive, if it matches the archive.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the archive.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Names of the files of the archive ("members") and of those present
+            in the extraction folder ("extracted"), or None if the index is
+            missing or was saved for another version of the archive.
+        """
+        try:
+            with open(fname + INDEX_SUFFIX) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # indices of previous versions only listed the members of tar archives
+        if not isinstance(index, dict) or index.get("archive") != self._stat(fname):
+            return None
+        return index
+
+    def __call__(self, fname: str, action: str, pooch: Pooch) -> list[str]:
+        """Extract the archive, unless it was already extracted, and list files.
+
+        Parameters
+        ----------
+        fname : str
+            Full path to the archive.
+        action : str
+            Action taken by `fetch`, either "download", "update" or "fetch".
+        pooch : Pooch
+            Pooch instance calling this method.
+
+        Returns
+        -------
+        list[str]
+            List of paths to the extracted files matching the selection.
+        """
+        extract_dir = Path(fname + self.suffix)
+        staging = extract_dir.with_name(extract_dir.name + ".part")
+
+        if action in ("download", "update") or not extract_dir.exists():
+            if not self._extracted:
+                shutil.rmtree(staging, ignore_errors=True)
+                staging.mkdir(parents=True)
+                self._extract_file(fname, staging, self._select)
+
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            os.replace(staging, extract_dir)
+            self._extracted = False
+        else:
+            missing = self._missing(fname, extract_dir)
+            if missing is not None:
+                self._extract_file(fname, extract_dir, missing)
+
+        files = []
+        present = set()
+        for path, _, names in os.walk(extract_dir):
+            for name in names:
+                file = os.path.join(path, name)
+                relative = Path(os.path.relpath(file, extract_dir)).as_posix()
+                present.add(relative)
+                if self._select(relative):
+                    files.append(file)
+
+        if self._index is not None:
+            index = {
+                "archive": self._stat(fname),
+                "members": self._index,
+                "extracted": [name for name in self._index if name in present],
+            }
+            with open(fname + INDEX_SUFFIX, "w") as f:
+                json.dump(index, f)
+            self._index = None
+
+        return files
+
+
+def _zip_names(archive: zipfile.ZipFile) -> list[str]:
+    """Names of the files of a zip archive.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        Open archive.
+
+    Returns
+    -------
+    list[str]
+        Names of the files, folders excluded.
+    """
+    return [info.filename for info in archive.infolist() if not info.is_dir()]
+
+
+def _zip_members(
+    archive: zipfile.ZipFile, extract_dir: Path, select: Callable[[str], bool]
+) -> list[tuple[zipfile.ZipInfo, Path]]:
+    """Select the files to extract from a zip archive and create the folders.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        Open archive.
+    extract_dir : Path
+        Folder in which to extract the members.
+    select : Callable[[str], bool]
+        Function returning whether to extract a member given its name.
+
+    Returns
+    -------
+    list[tuple[zipfile.ZipInfo, Path]]
+        Selected files and their destination.
+    """
+    root = extract_dir.resolve()
+    members = []
+    for info in archive.infolist():
+        if not select(info.filename):
+            continue
+
+        destination = _destination(root, info.filename)
+        if destination is None:
+            continue
+
+        if info.is_dir():
+            destination.mkdir(parents=True, exist_ok=True)
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            members.append((info, destination))
+
+    return members
+
+
+class ParallelUnzip(ArchiveExtractor):
+    """Pooch processor inflating the members of a zip archive concurrently.
+
+    The central directory is read once, then the members are inflated on a
+    thread pool, largest first. Each thread opens the archive once, so that the
+    threads do not share a file handle whose reads `zipfile` would serialize,
+    and zlib releases the GIL while decompressing. Each file is preallocated
+    to its uncompressed size before being written.
+
+    Parameters
+    ----------
+    workers : int | None
+        Number of threads, by default None, in which case the number of CPUs is
+        used.
+    progressbar : bool
+        Whether to display a progress bar counting the extracted members, by
+        default False.
+    members : Sequence[str] | None
+        Glob patterns selecting the members to extract, by default None.
+
+    Raises
+    ------
+    ValueError
+        If `workers` is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        progressbar: bool = False,
+        members: Sequence[str] | None = None,
+    ):
+        super().__init__(ArchiveFormat.ZIP, members)
+        if workers is not None and workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.progressbar = progressbar
+
+    def _extract_file(
+        self, fname: str, extract_dir: Path, select: Callable[[str], bool]
+    ) -> None:
+        """Extract the selected members of the archive concurrently.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the archive.
+        extract_dir : Path
+            Folder in which to extract the members.
+        select : Callable[[str], bool]
+            Function returning whether to extract a member given its name.
+        """
+        with zipfile.ZipFile(fname) as archive:
+            self._index = _zip_names(archive)
+
+            # the folders are created beforehand
+            members = _zip_members(archive, extract_dir, select)
+
+        # largest first, to balance the load between the threads
+        members.sort(key=lambda member: member[0].file_size, reverse=True)
+
+        # lazy import, as pooch does, to speed up import time
+        from tqdm import tqdm
+
+        progress = tqdm(
+            total=len(members),
+            ncols=79,
+            ascii=bool(sys.platform == "win32"),
+            unit="file",
+            disable=not self.progressbar,
+        )
+
+        # one handle per thread, closed once all members are extracted
+        handles = threading.local()
+        opened: list[zipfile.ZipFile] = []
+        opened_lock = threading.Lock()
+
+        def extract(info: zipfile.ZipInfo, destination: Path) -> str:
+            archive = getattr(handles, "archive", None)
+            if archive is None:
+                archive = handles.archive = zipfile.ZipFile(fname)
+                with opened_lock:
+                    opened.append(archive)
+            return self._extract_member(archive, info, destination)
+
+        try:
+            with progress, ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(extract, *member) for member in members]
+                for future in as_completed(futures):
+                    progress.set_postfix_str(future.result(), refresh=False)
+                    progress.update()
+        finally:
+            for archive in opened:
+                archive.close()
+
+    @staticmethod
+    def _extract_member(
+        archive: zipfile.ZipFile, info: zipfile.ZipInfo, destination: Path
+    ) -> str:
+        """Inflate a member into a preallocated file.
+
+        Parameters
+        ----------
+        archive : zipfile.ZipFile
+            Open archive, not shared with other threads.
+        info : zipfile.ZipInfo
+            Member to extract.
+        destination : Path
+            Path to the extracted file.
+
+        Returns
+        -------
+        str
+            Name of the member.
+        """
+        with archive.open(info) as source:
+            _write_member(source, destination, info.file_size)
+        return info.filename
+
+
+class StreamingExtractor(ArchiveExtractor):
+    """Pooch processor extracting an archive while it is downloaded.
+
+    The extractor is passed to `RangeDownloader` as a sink, which hands it the
+    bytes of the archive in order as they arrive:
+
+    - tar archives are streamed through their decompressor and `tarfile` on a
+      background thread.
+    - for zip archives, the central directory is fetched first with a range
+      request, and each member is extracted as soon as all its bytes are on
+      disk. If the server does not support range requests, the members are
+      extracted once the download is complete.
+
+    The members are extracted in the staging folder, which is moved in place by
+    the processor once the hash of the archive was verified. If the extraction
+    could not run during the download, the processor extracts the archive
+    itself.
+
+    Parameters
+    ----------
+    archive : str | os.PathLike
+        Final path to the archive in the cache.
+    archive_format : ArchiveFormat | str
+        Format of the archive, by default zip.
+    members : Sequence[str] | None
+        Glob patterns selecting the members to extract, by default None.
+
+    Attributes
+    ----------
+    extract_dir : Path
+        Folder in which the archive is extracted (`<archive>.unzip` or
+        `<archive>.untar`).
+    """
+
+    def __init__(
+        self,
+        archive: str | os.PathLike,
+        archive_format: ArchiveFormat | str = ArchiveFormat.ZIP,
+        members: Sequence[str] | None = None,
+    ):
+        super().__init__(archive_format, members)
+        self.archive = Path(archive)
+        self.extract_dir = self.archive.with_name(self.archive.name + self.suffix)
+        self._staging = self.extract_dir.with_name(self.extract_dir.name + ".part")
+
+        self._worker: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._aborted = threading.Event()
+        self._done = False
+        self._frontier = 0
+        self._condition = threading.Condition()
+        self._chunks: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+
+    # sink API, called by the downloader
+    def start(
+        self,
+        path: str | None,
+        size: int,
+        read_range: Callable[[int, int], bytes] | None = None,
+    ) -> None:
+        """Start extracting a new download.
+
+        Parameters
+        ----------
+        path : str | None
+            Path to the file the archive is written to, None if it is not
+            written to a file.
+        size : int
+            Size of the archive in bytes, 0 if unknown.
+        read_range : Callable[[int, int], bytes] | None
+            Function fetching the bytes in `[start, end)` of the remote archive,
+            None if the server does not support range requests.
+        """
+        self.abort()
+        shutil.rmtree(self._staging, ignore_errors=True)
+        self._staging.mkdir(parents=True)
+
+        self._error = None
+        self._extracted = False
+        self._index = None
+        self._aborted = threading.Event()
+        self._done = False
+        self._frontier = 0
+        self._chunks = queue.Queue(maxsize=QUEUE_SIZE)
+
+        target: Callable[..., None]
+        args: tuple[Any, ...]
+        if self.archive_format != ArchiveFormat.ZIP:
+            target, args = self._run_tar, ()
+        elif path is None:
+            # nothing to read the members from, the processor will extract them
+            self._error = RuntimeError("The archive is not written to a file.")
+            return
+        else:
+            tail = None
+            if read_range is not None and size > 0:
+                with contextlib.suppress(Exception):
+                    tail = read_zip_tail(read_range, size)
+            target, args = self._run_zip, (path, size, tail)
+
+        self._worker = threading.Thread(target=self._run, args=(target, *args))
+        self._worker.daemon = True
+        self._worker.start()
+
+    def write(self, offset: int, data: bytes) -> None:
+        """Receive the next bytes of the archive.
+
+        Parameters
+        ----------
+        offset : int
+            Offset of the data in the archive.
+        data : bytes
+            Data, already written to the file at `offset`.
+        """
+        if self._worker is None or self._error is not None:
+            return
+
+        if self.archive_format != ArchiveFormat.ZIP:
+            self._put(data)
+        else:
+            with self._condition:
+                self._frontier = offset + len(data)
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        """Finish the extraction once the download is complete."""
+        if self._worker is None:
+            return
+
+        if self.archive_format != ArchiveFormat.ZIP:
+            self._put(None)
+        else:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+        self._worker.join()
+        self._worker = None
+        self._extracted = self._error is None
+
+    def abort(self) -> None:
+        """Stop the extraction of an interrupted download."""
+        if self._worker is None:
+            return
+
+        self._aborted.set()
+        with self._condition:
+            self._condition.notify_all()
+        self._worker.join()
+        self._worker = None
+
+    def _put(self, chunk: bytes | None) -> None:
+        """Queue a chunk for the tar extraction, None ending the stream.
+
+        Parameters
+        ----------
+        chunk : bytes | None
+            Data to extract.
+        """
+        # block while the extraction lags behind, unless it failed
+        while self._error is None:
+            try:
+                self._chunks.put(chunk, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    # extraction threads
+    def _run(self, target: Callable[..., None], *args: Any) -> None:
+        try:
+            target(*args)
+        except BaseException as e:
+            self._error = e
+
+    def _run_tar(self) -> None:
+        reader = _QueueReader(self._chunks, self._aborted)
+        self._index = extract_tar(
+            reader, self._staging, self.archive_format, self._select
+        )
+
+        # tarfile does not read the padding at the end of the archive
+        reader.drain()
+
+    def _wait_for(self, offset: int) -> bool:
+        """Wait until the archive is on disk up to `offset`.
+
+        Parameters
+        ----------
+        offset : int
+            Offset in the archive.
+
+        Returns
+        -------
+        bool
+            Whether the data is available, False if the download was aborted.
+        """
+        with self._condition:
+            while (
+                self._frontier < offset
+                and not self._done
+                and not self._aborted.is_set()
+            ):
+                self._condition.wait(POLL_INTERVAL)
+            return not self._aborted.is_set()
+
+    def _run_zip(self, path: str, size: int, tail: tuple[int, bytes] | None) -> None:
+        if tail is None:
+            # the members cannot be located before the download completes
+            if self._wait_for(size or sys.maxsize):
+                self._extract_file(path, self._staging, self._select)
+            return
+
+        with zipfile.ZipFile(_OverlayFile(path, size, *tail)) as archive:
+            # each member ends where the next one starts, the data beyond the
+            # tail offset is already in memory
+            offsets = sorted(info.header_offset for info in archive.infolist())
+            ends = dict(zip(offsets, [*offsets[1:], tail[0]]))
+
+            members = _zip_members(archive, self._staging, self._select)
+            members.sort(key=lambda member: member[0].header_offset)
+            for info, destination in members:
+                if not self._wait_for(min(ends[info.header_offset], tail[0])):
+                    return
+                with archive.open(info) as source:
+                    _write_member(source, destination, info.file_size)
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Sequence
+
+from .arrays import _import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# elements read at once per array
+BLOCK_SIZE = 2**23
+
+# default percentiles
+PERCENTILES = (0.1, 1.0, 50.0, 99.0, 99.9)
+
+# values kept per channel to estimate the percentiles of non-integer arrays
+SAMPLE_SIZE = 1_000_000
+
+
+class _ChannelStats:
+    """Running statistics of the channels of a stream of blocks.
+
+    The mean and variance are merged block by block using the parallel
+    algorithm of Chan et al. Percentiles are exact for integer types of at most
+    16 bits, which are counted in histograms. Otherwise, they are estimated from
+    a uniform sample of the values, kept by assigning random priorities to the
+    values and retaining the ones with the highest priorities.
+
+    Parameters
+    ----------
+    channels : int
+        Number of channels.
+    dtype : np.dtype
+        Data type of the values.
+    sample_size : int
+        Number of values sampled per channel for non-integer types.
+    seed : int
+        Seed of the random generator used for sampling.
+    """
+
+    def __init__(
+        self, channels: int, dtype: np.dtype, sample_size: int, seed: int
+    ) -> None:
+        np = _import_numpy()
+        self.channels = channels
+        self.count = 0
+        self.mean = np.zeros(channels)
+        self.m2 = np.zeros(channels)
+        self.min = np.full(channels, np.inf)
+        self.max = np.full(channels, -np.inf)
+
+        self.histogram = dtype.kind in "ui" and dtype.itemsize <= 2
+        if self.histogram:
+            self.offset = int(np.iinfo(dtype).min)
+            bins = int(np.iinfo(dtype).max) - self.offset + 1
+            self.counts = np.zeros((channels, bins), dtype=np.int64)
+        else:
+            self.rng = np.random.default_rng(seed)
+            self.sample_size = sample_size
+            self.samples = np.empty((0, channels))
+            self.priorities = np.empty((0, channels))
+
+    def update(self, block: np.ndarray) -> None:
+        """Update the statistics with a block of values.
+
+        Parameters
+        ----------
+        block : np.ndarray
+            Values of shape `(n, channels)`.
+        """
+        np = _import_numpy()
+        n = len(block)
+        if n == 0:
+            return
+
+        mean = block.mean(axis=0, dtype=np.float64)
+        m2 = ((block - mean) ** 2).sum(axis=0)
+        delta = mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = np.minimum(self.min, block.min(axis=0))
+        self.max = np.maximum(self.max, block.max(axis=0))
+
+        if self.histogram:
+            for c in range(self.channels):
+                values = block[:, c].astype(np.int64) - self.offset
+                self.counts[c] += np.bincount(values, minlength=self.counts.shape[1])
+        else:
+            samples = np.concatenate([self.samples, block.astype(np.float64)])
+            priorities = np.concatenate(
+                [self.priorities, self.rng.random((n, self.channels))]
+            )
+            if len(samples) > self.sample_size:
+                kept = np.argpartition(-priorities, self.sample_size - 1, axis=0)
+                kept = kept[: self.sample_size]
+                samples = np.take_along_axis(samples, kept, axis=0)
+                priorities = np.take_along_axis(priorities, kept, axis=0)
+            self.samples, self.priorities = samples, priorities
+
+    def percentiles(self, q: Sequence[float]) -> list[list[float]]:
+        """Percentiles of each channel.
+
+        Parameters
+        ----------
+        q : Sequence[float]
+            Percentiles to compute, between 0 and 100.
+
+        Returns
+        -------
+        list[list[float]]
+            Values of each percentile, for each channel.
+        """
+        np = _import_numpy()
+        if not self.histogram:
+            return np.percentile(  # type: ignore[no-any-return]
+                self.samples, q, axis=0
+            ).tolist()
+
+        # same linear interpolation between ranks as numpy.percentile
+        values = []
+        for p in q:
+            rank = (self.count - 1) * p / 100
+            low, high = math.floor(rank), math.ceil(rank)
+            channel_values = []
+            for counts in np.cumsum(self.counts, axis=1):
+                v_low = np.searchsorted(counts, low, side="right") + self.offset
+                v_high = np.searchsorted(counts, high, side="right") + self.offset
+                channel_values.append(float(v_low + (v_high - v_low) * (rank - low)))
+            values.append(channel_values)
+        return values
+
+
+def compute_stats(
+    arrays: Sequence[Any],
+    channel_axis: int | None = None,
+    percentiles: Sequence[float] = PERCENTILES,
+    sample_size: int = SAMPLE_SIZE,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Compute statistics of arrays in a single pass over blocks of their data.
+
+    The arrays are read in blocks of about 8M elements, and the statistics of
+    each block are computed with vectorized NumPy operations before being
+    merged, see `_ChannelStats`.
+
+    Parameters
+    ----------
+    arrays : Sequence[Any]
+        Array-like objects supporting NumPy slicing, e.g. `LazyArray`, with the
+        same number of channels and compatible data types.
+    channel_axis : int | None
+        Axis of the channels in each array, by default None, in which case the
+        statistics are computed over all values.
+    percentiles : Sequence[float]
+        Percentiles to compute, between 0 and 100, by default (0.1, 1, 50, 99,
+        99.9).
+    sample_size : int
+        Number of values sampled per channel to estimate the percentiles of
+        non-integer arrays, by default 1,000,000.
+    seed : int
+        Seed of the random generator used for sampling, by default 0.
+
+    Returns
+    -------
+    dict[str, Any]
+        Number of values per channel ("count"), and for each channel "mean",
+        "std", "min", "max" and "percentiles", a mapping from percentile to
+        value. Percentiles are exact for integer types of at most 16 bits,
+        estimated otherwise.
+
+    Raises
+    ------
+    ValueError
+        If there are no values, or if the number of channels of the arrays
+        differ.
+    """
+    np = _import_numpy()
+    if len(arrays) == 0:
+        raise ValueError("No values to compute statistics from.")
+
+    channels = {
+        1 if channel_axis is None else array.shape[channel_axis] for array in arrays
+    }
+    if len(channels) > 1:
+        raise ValueError(f"The arrays have different numbers of channels {channels}.")
+
+    dtype = np.result_type(*(array.dtype for array in arrays))
+    stats = _ChannelStats(channels.pop(), dtype, sample_size, seed)
+    for array in arrays:
+        shape = tuple(array.shape)
+        axis = None if channel_axis is None else channel_axis % len(shape)
+
+        # blocks along the first axis, or the second if it holds the channels
+        block_axis = 1 if axis == 0 else 0
+        blocks: Iterable[Any]
+        if len(shape) <= block_axis:
+            blocks = [np.asarray(array[...])]
+        else:
+            row = math.prod(shape[:block_axis] + shape[block_axis + 1 :])
+            step = max(1, BLOCK_SIZE // max(row, 1))
+            blocks = (
+                np.asarray(
+                    array[(slice(None),) * block_axis + (slice(start, start + step),)]
+                )
+                for start in range(0, shape[block_axis], step)
+            )
+
+        for block in blocks:
+            if axis is None:
+                stats.update(block.reshape(-1, 1))
+            else:
+                stats.update(np.moveaxis(block, axis, -1).reshape(-1, stats.channels))
+
+    if stats.count == 0:
+        raise ValueError("No values to compute statistics from.")
+
+    return {
+        "count": stats.count,
+        "mean": stats.mean.tolist(),
+        "std": np.sqrt(stats.m2 / max(stats.count, 1)).tolist(),
+        "min": stats.min.tolist(),
+        "max": stats.max.tolist(),
+        "percentiles": dict(zip(map(str, percentiles), stats.percentiles(percentiles))),
+    }
+
+
+def cached_stats(
+    path: str | os.PathLike,
+    sha256: str,
+    parameters: dict[str, Any],
+    compute: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    """Read statistics from a JSON sidecar, or compute and add them to it.
+
+    The sidecar holds the statistics computed with different parameters for the
+    same source, and is discarded if the hash of the source changes.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the JSON sidecar.
+    sha256 : str
+        Hash of the source of the statistics.
+    parameters : dict[str, Any]
+        JSON parameters of the computation.
+    compute : Callable[[], dict[str, Any]]
+        Function computing the statistics.
+
+    Returns
+    -------
+    dict[str, Any]
+        Statistics.
+    """
+    path = Path(path)
+    key = json.dumps(parameters, sort_keys=True)
+    try:
+        with open(path) as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        sidecar = {}
+
+    if sidecar.get("sha256") != sha256:
+        sidecar = {"sha256": sha256, "stats": {}}
+    if key not in sidecar["stats"]:
+        sidecar["stats"][key] = compute()
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(sidecar, f)
+        os.replace(tmp, path)
+
+    return sidecar["stats"][key]  # type: ignore[no-any-return]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from .hashing import verify
+from .locking import FileLock
+
+# name of the index file in the cache folder
+INDEX_NAME = ".verification_index.json"
+
+_indices: dict[Path, VerificationIndex] = {}
+_indices_lock = threading.Lock()
+
+
+class VerificationIndex:
+    """Index of the files whose hash was successfully checked.
+
+    For each registry name, the index records the hash that was checked along
+    with the size, modification time (ns) and inode of the file at the time. As
+    long as the file keeps the same stat, it is considered verified without
+    reading it again. The index is stored as JSON in the cache folder, and
+    modified under a `FileLock` so that concurrent processes do not lose each
+    other's records.
+
+    Use `get_verification_index` to share a single index per cache folder.
+
+    Parameters
+    ----------
+    root : str | os.PathLike
+        Cache folder.
+    """
+
+    def __init__(self, root: str | os.PathLike) -> None:
+        self.path = Path(root) / INDEX_NAME
+        self._lock_path = self.path.with_name(f"{INDEX_NAME}.lock")
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, Any]] = {}
+        self._mtime_ns: int | None = None
+
+    def _reload(self, force: bool = False) -> None:
+        """Reload the index if it was modified by another process.
+
+        Parameters
+        ----------
+        force : bool
+            Whether to read the index even if its modification time did not
+            change, which may be too coarse to detect concurrent writes, by
+            default False.
+        """
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._records, self._mtime_ns = {}, None
+            return
+
+        if force or mtime_ns != self._mtime_ns:
+            try:
+                with open(self.path) as f:
+                    self._records = json.load(f)
+            except (OSError, ValueError):
+                self._records = {}
+            self._mtime_ns = mtime_ns
+
+    def _save(self) -> None:
+        """Atomically write the index."""
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._records, f)
+        os.replace(tmp, self.path)
+        self._mtime_ns = self.path.stat().st_mtime_ns
+
+    @staticmethod
+    def _stat(path: str | os.PathLike) -> dict[str, int] | None:
+        """Stat of a file as recorded in the index.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Path to the file.
+
+        Returns
+        -------
+        dict[str, int] | None
+            Size, modification time and inode of the file, or None if it does not
+            exist.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+        }
+
+    def is_verified(self, name: str, path: str | os.PathLike, known_hash: str) -> bool:
+        """Check whether a file was verified and did not change since.
+
+        Parameters
+        ----------
+        name : str
+            Registry name of the file.
+        path : str | os.PathLike
+            Path to the file.
+        known_hash : str
+            Expected hash of the file.
+
+        Returns
+        -------
+        bool
+            Whether the file was verified against `known_hash` and has the same
+            stat as then.
+        """
+        stat = self._stat(path)
+        if stat is None:
+            return False
+
+        with self._lock:
+            self._reload()
+            record = self._records.get(name)
+
+        return record is not None and record == {"hash": known_hash, **stat}
+
+    def add(self, name: str, path: str | os.PathLike, known_hash: str) -> None:
+        """Record that a file matches its hash.
+
+        Parameters
+        ----------
+        name : str
+            Registry name of the file.
+        path : str | os.PathLike
+            Path to the file.
+        known_hash : str
+            Hash of the file.
+        """
+        stat = self._stat(path)
+        if stat is None:
+            return
+
+        with self._lock, FileLock(self._lock_path):
+            self._reload(force=True)
+            self._records[name] = {"hash": known_hash, **stat}
+            self._save()
+
+    def remove(self, name: str) -> None:
+        """Remove a file from the index.
+
+        Parameters
+        ----------
+        name : str
+            Registry name of the file.
+        """
+        with self._lock, FileLock(self._lock_path):
+            self._reload(force=True)
+            if self._records.pop(name, None) is not None:
+                self._save()
+
+    def verify(
+        self,
+        name: str,
+        path: str | os.PathLike,
+        known_hash: str,
+        force_verify: bool = False,
+    ) -> bool:
+        """Check a file against its hash, skipping unchanged verified files.
+
+        Parameters
+        ----------
+        name : str
+            Registry name of the file.
+        path : str | os.PathLike
+            Path to the file.
+        known_hash : str
+            Expected hash of the file.
+        force_verify : bool
+            Whether to hash the file even if it is in the index, by default
+            False.
+
+        Returns
+        -------
+        bool
+            Whether the file exists and matches the hash.
+        """
+        if not force_verify and self.is_verified(name, path, known_hash):
+            return True
+
+        if verify(path, known_hash):
+            self.add(name, path, known_hash)
+            return True
+
+        self.remove(name)
+        return False
+
+
+def get_verification_index(root: str | os.PathLike) -> VerificationIndex:
+    """Get the verification index of a cache folder.
+
+    Parameters
+    ----------
+    root : str | os.PathLike
+        Cache folder.
+
+    Returns
+    -------
+    VerificationIndex
+        Index shared by all callers using the same folder.
+    """
+    key = Path(root).resolve()
+    with _indices_lock:
+        if key not in _indices:
+            _indices[key] = VerificationIndex(key)
+        return _indices[key]
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+# local file header, see section 4.3.7 of the zip specification
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+
+class _ViewFile(io.RawIOBase):
+    """Seekable binary file reading a memoryview without copying it.
+
+    Parameters
+    ----------
+    view : memoryview
+        Content of the file.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        """Whether the file is readable.
+
+        Returns
+        -------
+        bool
+            Always True.
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """Whether the file supports random access.
+
+        Returns
+        -------
+        bool
+            Always True.
+        """
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Change the position in the file.
+
+        Parameters
+        ----------
+        offset : int
+            Offset relative to `whence`.
+        whence : int
+            Reference position, by default io.SEEK_SET.
+
+        Returns
+        -------
+        int
+            New absolute position.
+        """
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        """Current position in the file.
+
+        Returns
+        -------
+        int
+            Absolute position.
+        """
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        """Read bytes into a pre-allocated buffer.
+
+        Parameters
+        ----------
+        buffer : Any
+            Writable buffer.
+
+        Returns
+        -------
+        int
+            Number of bytes read, 0 at the end of the file.
+        """
+        data = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        """Close the file and release the view."""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class ZipReader:
+    """Read the members of a zip archive in place, without extracting them.
+
+    The archive is memory-mapped and the members stored without compression are
+    returned as read-only `memoryview` slices of the mapping, starting at the
+    data offset following their local header. These views do not copy the data
+    and can be wrapped in NumPy arrays using `numpy.frombuffer`. Compressed
+    members are decompressed on the fly by `zipfile`.
+
+    The reader can be shared by several threads. Views returned by `read` keep
+    the mapping alive after the reader is closed, until they are released.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Path to the zip archive.
+
+    Raises
+    ------
+    zipfile.BadZipFile
+        If the file is not a zip archive.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._zipfile = zipfile.ZipFile(self.path)
+        self._infos = {info.filename: info for info in self._zipfile.infolist()}
+        self._offsets: dict[str, int] = {}
+
+        with open(self.path, "rb") as f:
+            # empty files cannot be mapped, but are not valid archives either
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+    def __enter__(self) -> ZipReader:
+        """Enter the runtime context.
+
+        Returns
+        -------
+        ZipReader
+            The reader itself.
+        """
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the reader when exiting the runtime context.
+
+        Parameters
+        ----------
+        *args : object
+            Exception information, ignored.
+        """
+        self.close()
+
+    def __contains__(self, name: object) -> bool:
+        """Whether the archive contains a member.
+
+        Parameters
+        ----------
+        name : object
+            Name of the member.
+
+        Returns
+        -------
+        bool
+            Whether the archive contains the member.
+        """
+        return name in self._infos
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the members.
+
+        Returns
+        -------
+        Iterator[str]
+            Names of the members, in the order of the central directory.
+        """
+        return iter(self._infos)
+
+    def __len__(self) -> int:
+        """Number of members of the archive.
+
+        Returns
+        -------
+        int
+            Number of members, including folders.
+        """
+        return len(self._infos)
+
+    def namelist(self) -> list[str]:
+        """Names of the members of the archive.
+
+        Returns
+        -------
+        list[str]
+            Names of the members, in the order of the central directory.
+        """
+        return list(self._infos)
+
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        """Information about a member.
+
+        Parameters
+        ----------
+        name : str
+            Name of the member.
+
+        Returns
+        -------
+        zipfile.ZipInfo
+            Information about the member.
+
+        Raises
+        ------
+        KeyError
+            If the archive does not contain the member.
+        """
+        try:
+            return self._infos[name]
+        except KeyError:
+            raise KeyError(f"There is no member named {name} in {self.path}.") from None
+
+    def is_stored(self, name: str) -> bool:
+        """Whether a member can be read in place.
+
+        Parameters
+        ----------
+        name : str
+            Name of the member.
+
+        Returns
+        -------
+        bool
+            Whether the member is stored without compression nor encryption.
+        """
+        info = self.getinfo(name)
+        return info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        """Offset of the data of a member in the archive.
+
+        The lengths of the name and extra field of the local header may differ
+        from the ones of the central directory, and are read from the archive.
+
+        Parameters
+        ----------
+        info : zipfile.ZipInfo
+            Information about the member.
+
+        Returns
+        -------
+        int
+            Offset of the first byte of data.
+        """
+        offset = self._offsets.get(info.filename)
+        if offset is None:
+            header = _LOCAL_HEADER.unpack_from(self._mmap, info.header_offset)
+            if header[0] != _LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile(
+                    f"Bad local header of {info.filename} in {self.path}."
+                )
+            name_length, extra_length = header[-2:]
+            offset = (
+                info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+            )
+            if offset + info.file_size > len(self._mmap):
+                raise zipfile.BadZipFile(f"Truncated member {info.filename}.")
+            self._offsets[info.filename] = offset
+        return offset
+
+    def read(self, name: str) -> memoryview | bytes:
+        """Read a member.
+
+        Parameters
+        ----------
+        name : str
+            Name of the member.
+
+        Returns
+        -------
+        memoryview | bytes
+            A read-only view of the archive if the member is stored, its
+            decompressed content otherwise.
+        """
+        info = self.getinfo(name)
+        if self.is_stored(name):
+            offset = self._data_offset(info)
+            return self._view[offset : offset + info.file_size]
+        return self._zipfile.read(info)
+
+    def open(self, name: str) -> IO[bytes]:
+        """Open a member as a binary file.
+
+        Stored members are read from the mapping, while compressed ones are
+        decompressed as they are read, without loading them in memory.
+
+        Parameters
+        ----------
+        name : str
+            Name of the member.
+
+        Returns
+        -------
+        IO[bytes]
+            Readable binary file.
+        """
+        info = self.getinfo(name)
+        if self.is_stored(name):
+            offset = self._data_offset(info)
+            return io.BufferedReader(
+                _ViewFile(self._view[offset : offset + info.file_size])
+            )
+        return self._zipfile.open(info)
+
+    def close(self) -> None:
+        """Close the archive.
+
+        The mapping is only unmapped once the views returned by `read` are
+        released.
+        """
+        self._zipfile.close()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # views are still exported, the mapping is closed with them
+            pass
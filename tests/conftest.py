@@ -1,32 +1,39 @@
+import io
+import os
+from typing import List, Tuple
+
 import pytest
 
 from careamics_portfolio import PortfolioManager
-from careamics_portfolio.utils.pale_blue_dot import PaleBlueDot
-from careamics_portfolio.utils.pale_blue_dot_zip import PaleBlueDotZip
+from careamics_portfolio.portfolio_entry import PortfolioEntry
+from careamics_portfolio.utils import download_utils
+from careamics_portfolio.utils.catalog import get_catalog
+
+from .utils import make_zip, sha256sum, start_http_server
 
 
 @pytest.fixture
-def pale_blue_dot() -> PaleBlueDot:
+def pale_blue_dot() -> PortfolioEntry:
     """Fixture for the PaleBlueDot.
 
     Returns
     -------
-    PaleBlueDot
+    PortfolioEntry
         The PaleBlueDot picture.
     """
-    return PaleBlueDot()
+    return PortfolioEntry(**get_catalog().record("test", "PaleBlueDot"))
 
 
 @pytest.fixture
-def pale_blue_dot_zip() -> PaleBlueDotZip:
-    """Fixture for the PaleBlueDot.
+def pale_blue_dot_zip() -> PortfolioEntry:
+    """Fixture for the zipped PaleBlueDot.
 
     Returns
     -------
-    PaleBlueDot
-        The PaleBlueDot picture.
+    PortfolioEntry
+        The zipped PaleBlueDot picture.
     """
-    return PaleBlueDotZip()
+    return PortfolioEntry(**get_catalog().record("test", "PaleBlueDotZip"))
 
 
 @pytest.fixture
@@ -39,3 +46,113 @@ def portfolio() -> PortfolioManager:
         The Portfolio.
     """
     return PortfolioManager()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """Fixture for a local HTTP server supporting range requests.
+
+    Yields
+    ------
+    ThreadingHTTPServer
+        Server serving the `server` folder of the temporary directory.
+    """
+    directory = tmp_path / "server"
+    directory.mkdir()
+    server = start_http_server(directory)
+    server.directory = directory
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def local_entries(tmp_path, http_server, monkeypatch) -> List[PortfolioEntry]:
+    """Fixture for portfolio entries served by the local HTTP server.
+
+    The entries are added to a temporary registry, which replaces the package
+    registry for the duration of the test.
+
+    Returns
+    -------
+    List[PortfolioEntry]
+        A zip entry and a raw file entry.
+    """
+    zip_path = make_zip(
+        http_server.directory / "local.zip",
+        {
+            "local/train/image_0.tif": os.urandom(300_000),
+            "local/train/image_1.tif": os.urandom(300_000),
+            "local/test/image_0.tif": b"\0" * 200_000,
+            "local/README.txt": b"Local test archive.",
+        },
+    )
+    raw_path = http_server.directory / "local.bin"
+    raw_path.write_bytes(os.urandom(1_500_000))
+
+    entries = [
+        PortfolioEntry(
+            portfolio="test",
+            name=path.stem.capitalize() + path.suffix[1:].capitalize(),
+            url=f"{http_server.url}/{path.name}",
+            description="Local test file.",
+            license="Public domain",
+            citation="None",
+            file_name=path.name,
+            sha256=sha256sum(path),
+            size=path.stat().st_size / 1024 / 1024,
+            tags=["test"],
+            is_zip=path.suffix == ".zip",
+        )
+        for path in (zip_path, raw_path)
+    ]
+
+    registry = tmp_path / "registry.txt"
+    with open(registry, "w") as f:
+        for entry in entries:
+            f.write(f"{entry.get_registry_name()} {entry.hash} {entry.url}\n")
+    monkeypatch.setattr(download_utils, "get_registry_path", lambda: registry)
+
+    return entries
+
+
+@pytest.fixture
+def array_entry(tmp_path, http_server, monkeypatch) -> Tuple[PortfolioEntry, dict]:
+    """Fixture for a zip entry of `.npy` arrays served by the local HTTP server.
+
+    Returns
+    -------
+    Tuple[PortfolioEntry, dict]
+        The entry, and the arrays of the archive indexed by member name.
+    """
+    np = pytest.importorskip("numpy")
+    stack = np.arange(5 * 70 * 90, dtype=np.uint16).reshape(5, 70, 90)
+    arrays = {"arrays/train/X.npy": stack, "arrays/test/X.npy": stack[:2, :30]}
+
+    members = {}
+    for name, array in arrays.items():
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        members[name] = buffer.getvalue()
+    members["arrays/README.txt"] = b"Local test arrays."
+    archive = make_zip(http_server.directory / "arrays.zip", members)
+
+    entry = PortfolioEntry(
+        portfolio="test",
+        name="Arrays",
+        url=f"{http_server.url}/arrays.zip",
+        description="Local test arrays.",
+        license="Public domain",
+        citation="None",
+        file_name=archive.name,
+        sha256=sha256sum(archive),
+        size=archive.stat().st_size / 1024 / 1024,
+        tags=["test"],
+    )
+
+    registry = tmp_path / "registry.txt"
+    registry.write_text(f"{entry.get_registry_name()} {entry.hash} {entry.url}\n")
+    monkeypatch.setattr(download_utils, "get_registry_path", lambda: registry)
+
+    return entry, arrays
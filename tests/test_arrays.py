@@ -0,0 +1,189 @@
+import pickle
+
+import pytest
+
+from careamics_portfolio.portfolio_entry import PortfolioEntry
+from careamics_portfolio.utils import download_utils
+from careamics_portfolio.utils.arrays import (
+    CACHE_MANIFEST,
+    HEADERS_NAME,
+    LazyArray,
+    load_arrays,
+    open_npy_cache,
+    scan_headers,
+    write_npy_cache,
+)
+
+from .utils import sha256sum
+
+np = pytest.importorskip("numpy")
+tifffile = pytest.importorskip("tifffile")
+
+STACK = np.arange(5 * 6 * 7, dtype=np.uint16).reshape(5, 6, 7)
+
+
+@pytest.fixture
+def files(tmp_path):
+    tifffile.imwrite(tmp_path / "raw.tif", STACK)
+    tifffile.imwrite(tmp_path / "compressed.tif", STACK, compression="zlib")
+    np.save(tmp_path / "array.npy", STACK.astype(np.float32))
+    np.save(tmp_path / "fortran.npy", np.asfortranarray(STACK))
+    np.savez(tmp_path / "stored.npz", X=STACK, Y=STACK[0])
+    np.savez_compressed(tmp_path / "compressed.npz", X=STACK)
+    (tmp_path / "README.txt").write_text("not an array")
+    return sorted(tmp_path.iterdir())
+
+
+def test_load_arrays(tmp_path, files):
+    arrays = load_arrays(files, tmp_path)
+
+    assert list(arrays) == [
+        "array.npy",
+        "compressed.npz/X",
+        "compressed.tif",
+        "fortran.npy",
+        "raw.tif",
+        "stored.npz/X",
+        "stored.npz/Y",
+    ]
+    for name, array in arrays.items():
+        expected = STACK[0] if name == "stored.npz/Y" else STACK
+        keys = [1, -1, slice(1, 4, 2), [0, 3], ..., (..., 1)]
+        if expected.ndim == 3:
+            keys.append((2, slice(None), 3))
+        assert array.shape == expected.shape
+        assert len(array) == expected.shape[0]
+        assert array.ndim == expected.ndim
+
+        np.testing.assert_array_equal(np.asarray(array), expected)
+        for key in keys:
+            np.testing.assert_array_equal(array[key], expected[key])
+
+    assert arrays["array.npy"].dtype == np.float32
+    assert arrays["raw.tif"].dtype == np.uint16
+
+
+def test_lazy_array_reads_slices(tmp_path, files, monkeypatch):
+    """Memory-mapped files are not read entirely when indexed."""
+    arrays = load_arrays(files, tmp_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the whole file was read")
+
+    monkeypatch.setattr(tifffile.TiffFile, "asarray", fail)
+    for name in ("raw.tif", "array.npy", "stored.npz/X"):
+        np.testing.assert_array_equal(arrays[name][3], STACK[3])
+
+
+def test_lazy_array_pickle(tmp_path, files):
+    array = load_arrays(files, tmp_path)["raw.tif"]
+    array[0]
+
+    restored = pickle.loads(pickle.dumps(array))
+    assert isinstance(restored, LazyArray)
+    np.testing.assert_array_equal(restored[1:3], STACK[1:3])
+
+
+def test_scan_headers_cache(tmp_path, files, monkeypatch):
+    files = [tmp_path / "array.npy", tmp_path / "raw.tif"]
+    headers = scan_headers(files, tmp_path)
+    assert (tmp_path / HEADERS_NAME).exists()
+
+    def fail(path, suffix=None):
+        raise AssertionError(f"{path} was scanned again")
+
+    monkeypatch.setattr("careamics_portfolio.utils.arrays.scan_file", fail)
+    assert scan_headers(files, tmp_path) == headers
+
+    # modified files are scanned again
+    np.save(tmp_path / "array.npy", STACK[:2])
+    with pytest.raises(AssertionError):
+        scan_headers(files, tmp_path)
+
+
+def test_entry_load(tmp_path, array_entry):
+    entry, expected = array_entry
+
+    arrays = entry.load(tmp_path / "cache")
+    assert list(arrays) == sorted(expected)
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(array[1], expected[name][1])
+
+    arrays = entry.load(tmp_path / "other", members=["**/test/*"])
+    assert list(arrays) == ["arrays/test/X.npy"]
+
+
+def test_entry_load_file(tmp_path, http_server, monkeypatch, local_entries):
+    """Files that are not archives are read according to their file name."""
+    np.save(http_server.directory / "stack.npy", STACK)
+    entry = PortfolioEntry(
+        portfolio="test",
+        name="Stack",
+        url=f"{http_server.url}/stack.npy",
+        description="Local test array.",
+        license="Public domain",
+        citation="None",
+        file_name="stack.npy",
+        sha256=sha256sum(http_server.directory / "stack.npy"),
+        size=0.1,
+        tags=["test"],
+        is_zip=False,
+    )
+    registry = tmp_path / "registry.txt"
+    registry.write_text(f"{entry.get_registry_name()} {entry.hash} {entry.url}\n")
+    monkeypatch.setattr(download_utils, "get_registry_path", lambda: registry)
+
+    arrays = entry.load(tmp_path / "cache")
+    assert list(arrays) == [entry.get_registry_name()]
+    np.testing.assert_array_equal(arrays[entry.get_registry_name()][1:3], STACK[1:3])
+
+    # unsupported formats are not downloaded
+    with pytest.raises(ValueError, match=r"local\.bin"):
+        local_entries[1].load(tmp_path / "other")
+    assert not (tmp_path / "other").exists()
+
+
+def test_npy_cache(tmp_path, files, monkeypatch):
+    arrays = load_arrays(files, tmp_path)
+    cache = tmp_path / "cache"
+    assert open_npy_cache(cache, {"sha256": "abc"}) is None
+
+    monkeypatch.setattr("careamics_portfolio.utils.arrays.COPY_SIZE", 100)
+    cached = write_npy_cache(arrays, cache, {"sha256": "abc"})
+    assert list(cached) == list(arrays)
+    assert (cache / "stored.npz" / "X.npy").exists()
+    assert not list(tmp_path.glob("*.part"))
+    for name, array in cached.items():
+        assert array.filename is not None
+        assert not array.flags.writeable
+        np.testing.assert_array_equal(array, np.asarray(arrays[name]))
+
+    assert list(open_npy_cache(cache, {"sha256": "abc"})) == list(arrays)
+    assert open_npy_cache(cache, {"sha256": "def"}) is None
+
+    # incomplete cache
+    (cache / "raw.tif.npy").unlink()
+    assert open_npy_cache(cache, {"sha256": "abc"}) is None
+
+    (cache / CACHE_MANIFEST).unlink()
+    assert open_npy_cache(cache, {"sha256": "abc"}) is None
+
+
+def test_entry_load_cached(tmp_path, array_entry, monkeypatch):
+    entry, expected = array_entry
+
+    arrays = entry.load_cached(tmp_path)
+    assert list(arrays) == sorted(expected)
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(array, expected[name])
+
+    # later calls only open the cache
+    def fail(*args, **kwargs):
+        raise AssertionError("the dataset was loaded again")
+
+    monkeypatch.setattr(type(entry), "load", fail)
+    assert list(entry.load_cached(tmp_path)) == sorted(expected)
+
+    # unless the selection changes
+    with pytest.raises(AssertionError):
+        entry.load_cached(tmp_path, members=["**/test/*"])
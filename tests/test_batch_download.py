@@ -0,0 +1,149 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from careamics_portfolio import PortfolioManager
+from careamics_portfolio.portfolio import IterablePortfolio
+from careamics_portfolio.utils.batch_download import (
+    AggregateProgressBar,
+    download_many,
+)
+
+
+class SlowEntry:
+    """Stand-in for a PortfolioEntry recording download concurrency."""
+
+    def __init__(self, name, url, tracker):
+        self.name = name
+        self.url = url
+        self.tracker = tracker
+
+    def get_registry_name(self):
+        return "test-" + self.name
+
+    def _fetch(self, poochfolio, progressbar, connections, **kwargs):
+        self.tracker.enter(self.url)
+        time.sleep(0.05)
+        self.tracker.exit(self.url)
+        return self.name
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}
+        self.maximum = {}
+        self.started = []
+
+    def enter(self, url):
+        with self.lock:
+            self.started.append(url)
+            self.current[url] = self.current.get(url, 0) + 1
+            self.maximum[url] = max(self.maximum.get(url, 0), self.current[url])
+
+    def exit(self, url):
+        with self.lock:
+            self.current[url] -= 1
+
+
+def test_download_many(tmp_path, local_entries):
+    results = download_many(local_entries, tmp_path / "cache", progressbar=False)
+
+    assert set(results) == {entry.get_registry_name() for entry in local_entries}
+    for entry in local_entries:
+        paths = results[entry.get_registry_name()]
+        paths = paths if isinstance(paths, list) else [paths]
+        assert len(paths) > 0
+        assert all(Path(p).exists() for p in paths)
+
+
+def test_download_many_progressbar(tmp_path, local_entries):
+    results = download_many(local_entries, tmp_path / "cache", progressbar=True)
+    assert len(results) == len(local_entries)
+
+
+def test_download_many_host_cap(tmp_path):
+    tracker = ConcurrencyTracker()
+    entries = [
+        SlowEntry(f"entry_{i}", f"https://host{i % 2}.org/file", tracker)
+        for i in range(8)
+    ]
+
+    results = download_many(
+        entries, tmp_path, max_workers=8, max_per_host=3, progressbar=False
+    )
+
+    assert results == {e.get_registry_name(): e.name for e in entries}
+    assert tracker.maximum["https://host0.org/file"] == 3
+    assert tracker.maximum["https://host1.org/file"] == 3
+
+
+def test_download_many_busy_host(tmp_path):
+    """Entries of a busy host do not delay the entries of other hosts."""
+    tracker = ConcurrencyTracker()
+    entries = [
+        SlowEntry(f"busy_{i}", "https://busy.org/file", tracker) for i in range(4)
+    ]
+    entries.append(SlowEntry("other", "https://other.org/file", tracker))
+
+    results = download_many(
+        entries, tmp_path, max_workers=2, max_per_host=1, progressbar=False
+    )
+
+    assert list(results) == [e.get_registry_name() for e in entries]
+    assert tracker.maximum["https://busy.org/file"] == 1
+    assert "https://other.org/file" in tracker.started[:2]
+
+
+def test_download_many_error(tmp_path):
+    class FailingEntry(SlowEntry):
+        def _fetch(self, poochfolio, progressbar, connections, **kwargs):
+            raise RuntimeError("Download failed.")
+
+    entries = [FailingEntry("failing", "https://host.org/file", None)]
+    with pytest.raises(RuntimeError):
+        download_many(entries, tmp_path, progressbar=False)
+
+
+def test_download_many_invalid_workers(tmp_path):
+    with pytest.raises(ValueError):
+        download_many([], tmp_path, max_workers=0)
+
+
+def test_aggregate_progress_bar():
+    progress = AggregateProgressBar()
+    first, second = progress.proxy(), progress.proxy()
+
+    first.total = 100
+    second.total = 50
+    assert progress.bar.total == 150
+
+    # pooch overshoots with the chunk size, then fills the bar
+    first.update(64)
+    first.update(64)
+    first.reset()
+    first.update(100)
+    second.update(50)
+    assert progress.bar.n == 150
+
+    progress.close()
+
+
+def test_portfolio_manager_download_many(tmp_path, local_entries):
+    results = PortfolioManager().download_many(
+        local_entries, tmp_path, progressbar=False
+    )
+    assert len(results) == len(local_entries)
+
+
+def test_iterable_portfolio_download_all(tmp_path, local_entries):
+    class LocalPortfolio(IterablePortfolio):
+        def __init__(self) -> None:
+            self._zip = local_entries[0]
+            self._bin = local_entries[1]
+            super().__init__("local")
+
+    results = LocalPortfolio().download_all(tmp_path, progressbar=False)
+    assert list(results) == [entry.get_registry_name() for entry in local_entries]
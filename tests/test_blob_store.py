@@ -0,0 +1,98 @@
+import os
+
+from careamics_portfolio.portfolio_entry import PortfolioEntry
+from careamics_portfolio.utils.blob_store import BlobStore
+from careamics_portfolio.utils.cache_manager import CacheManager
+from careamics_portfolio.utils.hashing import file_hash
+
+
+def test_blob_store(tmp_path):
+    store = BlobStore(tmp_path)
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.write_bytes(b"content")
+    second.write_bytes(b"content")
+    digest = file_hash(first)
+
+    assert digest not in store
+    assert store.add(first)
+    assert digest in store
+    assert os.path.samefile(store.path(digest), first)
+
+    # identical files are linked to the same blob
+    assert store.add(second, digest)
+    assert os.path.samefile(first, second)
+    assert store.add(second, digest)
+
+    third = tmp_path / "third"
+    assert store.link(digest, third)
+    assert third.read_bytes() == b"content"
+    assert not store.link("0" * 64, tmp_path / "fourth")
+    assert not (tmp_path / "fourth").exists()
+
+    # replacing a file does not modify its blob
+    tmp = tmp_path / "tmp"
+    tmp.write_bytes(b"modified")
+    os.replace(tmp, third)
+    assert store.path(digest).read_bytes() == b"content"
+
+
+def test_deduplicate(tmp_path):
+    store = BlobStore(tmp_path)
+    for folder in ("a", "b"):
+        (tmp_path / folder / "sub").mkdir(parents=True)
+        (tmp_path / folder / "sub" / "shared.bin").write_bytes(b"shared")
+        (tmp_path / folder / "own.bin").write_bytes(folder.encode())
+
+    assert store.deduplicate(tmp_path / "a") == 0
+    assert store.deduplicate(tmp_path / "b") == 1
+    assert os.path.samefile(
+        tmp_path / "a/sub/shared.bin", tmp_path / "b/sub/shared.bin"
+    )
+    assert not os.path.samefile(tmp_path / "a/own.bin", tmp_path / "b/own.bin")
+
+    # linked files are not hashed again
+    assert store.deduplicate(tmp_path / "b") == 0
+
+
+def test_gc(tmp_path):
+    store = BlobStore(tmp_path)
+    assert store.gc() == 0
+
+    path = tmp_path / "file"
+    path.write_bytes(b"content")
+    store.add(path)
+    assert store.gc() == 0
+
+    path.unlink()
+    assert store.gc() == len(b"content")
+    assert not any(path.is_file() for path in store.root.rglob("*"))
+
+
+def test_entry_deduplicate(tmp_path, local_entries, http_server):
+    """Entries with the same archive share the archive and its extraction."""
+    entry = local_entries[0]
+    copy = PortfolioEntry(
+        **{**entry.to_dict(), "portfolio": "copy", "sha256": entry.hash}
+    )
+    with open(tmp_path / "registry.txt", "a") as f:
+        f.write(f"{copy.get_registry_name()} {copy.hash} {copy.url}\n")
+
+    files = sorted(entry.download(tmp_path, deduplicate=True))
+    requests = len(http_server.ranges)
+    copy_files = sorted(copy.download(tmp_path, deduplicate=True))
+    assert len(http_server.ranges) == requests
+
+    assert os.path.samefile(
+        tmp_path / entry.get_registry_name(), tmp_path / copy.get_registry_name()
+    )
+    assert len(files) == len(copy_files) == 4
+    for file, copy_file in zip(files, copy_files):
+        assert os.path.samefile(file, copy_file)
+    assert copy.verify(tmp_path)
+
+    # blobs are removed with the last entry linking to them
+    cache = CacheManager(tmp_path)
+    cache.evict(entry.get_registry_name())
+    assert all(os.path.exists(file) for file in copy_files)
+    cache.evict(copy.get_registry_name())
+    assert not any(path.is_file() for path in (tmp_path / "blobs").rglob("*"))
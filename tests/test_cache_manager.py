@@ -0,0 +1,222 @@
+import json
+
+import pytest
+
+from careamics_portfolio.cli import cache_cli
+from careamics_portfolio.utils import cache_manager, get_verification_index
+from careamics_portfolio.utils.blob_store import BlobStore
+from careamics_portfolio.utils.cache_manager import (
+    BUDGET_ENV,
+    CacheManager,
+    parse_size,
+)
+from careamics_portfolio.utils.locking import FileLock
+from careamics_portfolio.utils.processors import INDEX_SUFFIX
+
+from .utils import sha256sum
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        (1000, 1000),
+        ("1000", 1000),
+        ("2K", 2048),
+        ("1.5 MiB", 1536 * 1024),
+        ("7GB", 7 * 1024**3),
+        ("3t", 3 * 1024**4),
+    ],
+)
+def test_parse_size(size, expected):
+    assert parse_size(size) == expected
+
+
+@pytest.mark.parametrize("size", ["", "-5", "12X", "G"])
+def test_parse_size_invalid(size):
+    with pytest.raises(ValueError):
+        parse_size(size)
+
+
+def downloaded(tmp_path, local_entries):
+    """Download the local entries and return their registry names."""
+    for entry in local_entries:
+        entry.download(tmp_path)
+    return [entry.get_registry_name() for entry in local_entries]
+
+
+def test_usage(tmp_path, local_entries):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    (tmp_path / f"{zip_name}.stats.json").write_text("{}")
+
+    usage = CacheManager(tmp_path).usage()
+    assert set(usage) == {zip_name, raw_name}
+    assert usage[raw_name] == {
+        "derived": 0,
+        "extracted": 0,
+        "archive": 1_500_000,
+        "total": 1_500_000,
+    }
+    assert usage[zip_name]["archive"] == (tmp_path / zip_name).stat().st_size
+    index = tmp_path / f"{zip_name}{INDEX_SUFFIX}"
+    assert usage[zip_name]["extracted"] == (
+        800_000 + len(b"Local test archive.") + index.stat().st_size
+    )
+    assert usage[zip_name]["derived"] == 2
+    assert CacheManager(tmp_path).total_size() == sum(
+        sizes["total"] for sizes in usage.values()
+    )
+
+
+def test_access_times(tmp_path, local_entries, monkeypatch):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    cache = CacheManager(tmp_path)
+
+    access = cache.last_access()
+    assert access[zip_name] <= access[raw_name]
+
+    # accesses to cached data are recorded once per interval
+    local_entries[0].download(tmp_path)
+    assert cache.last_access() == access
+
+    monkeypatch.setattr(cache_manager, "TOUCH_INTERVAL", 0.0)
+    local_entries[0].download(tmp_path)
+    assert cache.last_access()[zip_name] >= access[raw_name]
+
+
+def test_pin(tmp_path, local_entries):
+    zip_name, _ = downloaded(tmp_path, local_entries)
+    cache = CacheManager(tmp_path)
+
+    cache.pin(zip_name)
+    assert cache.pinned == [zip_name]
+    assert json.loads((tmp_path / ".cache_manager.json").read_text())["pinned"] == [
+        zip_name
+    ]
+    cache.unpin(zip_name)
+    assert cache.pinned == []
+
+    with pytest.raises(ValueError):
+        cache.pin("unknown")
+
+
+def test_evict(tmp_path, local_entries):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    cache = CacheManager(tmp_path)
+
+    assert cache.evict(zip_name, ["extracted"]) > 0
+    assert not (tmp_path / f"{zip_name}.unzip").exists()
+    assert (tmp_path / zip_name).exists()
+
+    # extracted again without downloading
+    local_entries[0].download(tmp_path)
+    assert (tmp_path / f"{zip_name}.unzip").exists()
+
+    assert cache.evict(raw_name) == 1_500_000
+    assert not (tmp_path / raw_name).exists()
+    assert not get_verification_index(tmp_path).is_verified(
+        raw_name, tmp_path / raw_name, local_entries[1].hash
+    )
+
+    # entries being downloaded are not evicted
+    with FileLock(tmp_path / f"{zip_name}.lock"):
+        with pytest.raises(TimeoutError):
+            cache.evict(zip_name)
+
+    with pytest.raises(ValueError):
+        cache.evict(zip_name, ["unknown"])
+
+
+def test_hard_links(tmp_path, local_entries):
+    """Files linked by several entries are counted and freed once."""
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    zip_stats = tmp_path / f"{zip_name}.stats.json"
+    zip_stats.write_bytes(b"0" * 1000)
+
+    # shared by both entries through the blob store
+    store = BlobStore(tmp_path)
+    digest = sha256sum(zip_stats)
+    assert store.add(zip_stats, digest)
+    assert store.link(digest, tmp_path / f"{raw_name}.stats.json")
+
+    # counted for the first name
+    cache = CacheManager(tmp_path)
+    first, second = sorted([zip_name, raw_name])
+    usage = cache.usage()
+    assert usage[first]["derived"] == 1000
+    assert usage[second]["derived"] == 0
+    assert cache.total_size() == sum(sizes["total"] for sizes in usage.values())
+
+    # still linked by the other entry
+    assert cache.evict(first, ["derived"]) == 0
+    assert store.path(digest).exists()
+    assert cache.usage()[second]["derived"] == 1000
+
+    assert cache.evict(second, ["derived"]) == 1000
+    assert not store.path(digest).exists()
+
+
+def test_enforce(tmp_path, local_entries):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    cache = CacheManager(tmp_path)
+    usage = cache.usage()
+    total = cache.total_size()
+
+    # the zip entry is the least recently used, its extraction goes first
+    budget = total - usage[zip_name]["extracted"]
+    assert cache.enforce(budget) == [(zip_name, "extracted")]
+    assert cache.total_size() == budget
+    assert cache.enforce(budget) == []
+
+    # then its archive, then the other entry
+    assert cache.enforce(usage[raw_name]["total"]) == [(zip_name, "archive")]
+    assert cache.enforce(0) == [(raw_name, "archive")]
+    assert cache.usage() == {}
+
+
+def test_enforce_pinned(tmp_path, local_entries):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+    cache = CacheManager(tmp_path)
+
+    cache.pin(zip_name)
+    assert cache.enforce(0) == [(raw_name, "archive")]
+    assert cache.enforce(0, keep=[raw_name]) == []
+    assert list(cache.usage()) == [zip_name]
+
+    with pytest.raises(ValueError):
+        cache.enforce()
+
+
+def test_budget_on_download(tmp_path, local_entries, monkeypatch):
+    """Downloads evict other entries to stay within the budget."""
+    _, raw_name = downloaded(tmp_path, local_entries)
+
+    monkeypatch.setenv(BUDGET_ENV, "1M")
+    cache = CacheManager(tmp_path)
+    usage = cache.usage()
+
+    # the budget is not enforced when the data is served from the cache
+    local_entries[1].download(tmp_path)
+    assert cache.usage() == usage
+
+    cache.evict(raw_name)
+    local_entries[1].download(tmp_path)
+    assert list(cache.usage()) == [raw_name]
+
+
+def test_cache_cli(tmp_path, local_entries, capsys):
+    zip_name, raw_name = downloaded(tmp_path, local_entries)
+
+    assert cache_cli(["--path", str(tmp_path), "pin", raw_name]) == 0
+    assert cache_cli(["--path", str(tmp_path), "usage"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].startswith(zip_name)
+    assert lines[2].startswith(raw_name) and lines[2].endswith("(pinned)")
+    assert lines[-1] == "Total: 2.8 MiB"
+
+    assert cache_cli(["--path", str(tmp_path), "enforce", "0"]) == 0
+    out = capsys.readouterr().out
+    assert f"Evicted archive of {zip_name}" in out
+    assert list(CacheManager(tmp_path).usage()) == [raw_name]
+
+    with pytest.raises(SystemExit):
+        cache_cli(["--path", str(tmp_path), "evict", "unknown"])
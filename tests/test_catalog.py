@@ -0,0 +1,170 @@
+import json
+import os
+
+import pytest
+
+from careamics_portfolio import PortfolioManager
+from careamics_portfolio.portfolio import IterablePortfolio
+from careamics_portfolio.utils import catalog
+from careamics_portfolio.utils.catalog import get_catalog, to_record, write_catalog
+from careamics_portfolio.utils.download_utils import get_registry_path
+
+
+def test_catalog_matches_registry():
+    """All entries of the catalog are in the registry."""
+    registry = {}
+    for line in get_registry_path().read_text().splitlines():
+        if line and not line.startswith("#"):
+            name, sha256, url = line.split()
+            registry[name] = (sha256, url)
+
+    records = json.loads(catalog.get_catalog_path().read_text(encoding="utf-8"))
+    assert len(records) > 0
+    for name, record in records.items():
+        assert registry[name] == (record["sha256"], record["url"])
+
+
+def test_entries_from_catalog(portfolio: PortfolioManager):
+    """Entries of the portfolios are built from the catalog."""
+    assert to_record(portfolio.denoising.Tribolium) == get_catalog().record(
+        "denoising", "Tribolium"
+    )
+    assert to_record(portfolio.denoiseg.DSB2018_n10) == get_catalog().record(
+        "denoiseg", "DSB2018_n10"
+    )
+
+
+def test_write_catalog(tmp_path, local_entries):
+    path = tmp_path / "catalog.json"
+    write_catalog(local_entries, path)
+    assert len(path.read_text().splitlines()) == len(local_entries) + 2
+
+    loaded = get_catalog(path)
+    assert get_catalog(path) is loaded
+    assert loaded.names("test") == [entry.name for entry in local_entries]
+    for entry in local_entries:
+        assert entry.get_registry_name() in loaded
+        assert loaded.record("test", entry.name) == to_record(entry)
+
+    # records are copies
+    loaded.record("test", local_entries[0].name)["tags"].append("modified")
+    assert loaded.record("test", local_entries[0].name) == to_record(local_entries[0])
+
+    with pytest.raises(KeyError):
+        loaded.record("test", "missing")
+
+
+def test_catalog_attributes(tmp_path, monkeypatch, local_entries):
+    """Entries of the catalog are attributes of their portfolio."""
+    path = tmp_path / "catalog.json"
+    write_catalog(local_entries, path)
+    monkeypatch.setattr(catalog, "get_catalog_path", lambda: path)
+    monkeypatch.setattr(catalog, "_catalogs", {})
+
+    portfolio = IterablePortfolio("test")
+    entry = local_entries[0]
+    assert portfolio.LocalZip.to_dict() == entry.to_dict()
+    assert portfolio.LocalZip is portfolio.LocalZip
+    assert [item.name for item in portfolio] == [item.name for item in local_entries]
+
+    with pytest.raises(AttributeError):
+        _ = portfolio.Missing
+
+
+def test_search(tmp_path, local_entries):
+    path = tmp_path / "catalog.json"
+    write_catalog(local_entries, path)
+    loaded = get_catalog(path)
+    zip_name, bin_name = (entry.get_registry_name() for entry in local_entries)
+
+    assert loaded.search() == [zip_name, bin_name]
+    assert loaded.search(text="localzip") == [zip_name]
+    assert loaded.search(text="LOCALZIP missing") == []
+    assert loaded.search(tags=["missing"]) == []
+    assert loaded.search(portfolios=["denoising"]) == []
+
+    size = min(entry.size for entry in local_entries)
+    assert loaded.search(max_size_mb=size) == [
+        entry.get_registry_name() for entry in local_entries if entry.size <= size
+    ]
+
+
+def test_portfolio_search(portfolio: PortfolioManager):
+    results = portfolio.search(tags=["Segmentation", "nuclei"], max_size_mb=200)
+    assert results == [
+        portfolio.denoiseg.DSB2018_n0,
+        portfolio.denoiseg.MouseNuclei_n0,
+        portfolio.denoiseg.MouseNuclei_n10,
+        portfolio.denoiseg.MouseNuclei_n20,
+    ]
+
+    # names are split into words
+    assert portfolio.search(text="sem n2v") == [portfolio.denoising.N2V_SEM]
+    assert portfolio.search(text="electron", tags=["denoising"]) == [
+        portfolio.denoising.N2N_SEM,
+        portfolio.denoising.N2V_SEM,
+    ]
+
+    # test entries are not part of the portfolios
+    assert portfolio.search(text="voyager") == []
+
+
+def test_catalog_changes(tmp_path, monkeypatch, local_entries):
+    """Cached entries and representations are reset when the catalog changes."""
+    path = tmp_path / "catalog.json"
+    write_catalog(local_entries[:1], path)
+    monkeypatch.setattr(catalog, "get_catalog_path", lambda: path)
+    monkeypatch.setattr(catalog, "_catalogs", {})
+
+    portfolio = IterablePortfolio("test")
+    version = get_catalog().version
+    as_dict = portfolio.as_dict()
+    assert list(as_dict) == [local_entries[0].name]
+
+    # copies of the cached dictionary
+    as_dict[local_entries[0].name]["Tags"].append("modified")
+    as_dict.clear()
+    assert portfolio.as_dict() is not as_dict
+    assert portfolio.as_dict()[local_entries[0].name]["Tags"] == local_entries[0].tags
+
+    write_catalog(local_entries, path)
+    os.utime(path, ns=(0, 0))
+    assert get_catalog().version == version + 1
+    assert list(portfolio.as_dict()) == [entry.name for entry in local_entries]
+    assert get_catalog().search(text="localbin") == [
+        local_entries[1].get_registry_name()
+    ]
+
+
+def test_iteration_reads_catalog_once(monkeypatch, portfolio: PortfolioManager):
+    """The catalog is checked once per iteration, rather than once per entry."""
+    calls = []
+    load = catalog.Catalog._load
+
+    def counting_load(self):
+        calls.append(self)
+        return load(self)
+
+    assert len(list(portfolio.denoising)) == 8
+    monkeypatch.setattr(catalog.Catalog, "_load", counting_load)
+    assert len(list(portfolio.denoising)) == 8
+    assert len(calls) == 2
+
+
+def test_cached_entries(tmp_path, monkeypatch, local_entries):
+    """Cached entries are returned without checking the catalog."""
+    path = tmp_path / "catalog.json"
+    write_catalog(local_entries, path)
+    monkeypatch.setattr(catalog, "get_catalog_path", lambda: path)
+    monkeypatch.setattr(catalog, "_catalogs", {})
+
+    portfolio = IterablePortfolio("test")
+    entry = portfolio.LocalZip
+
+    write_catalog(local_entries[1:], path)
+    os.utime(path, ns=(0, 0))
+    assert portfolio.LocalZip is entry
+
+    portfolio.reload()
+    with pytest.raises(AttributeError):
+        _ = portfolio.LocalZip
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from careamics_portfolio.utils.chunked_store import (
+    ZarrArray,
+    default_chunks,
+    open_store,
+    write_store,
+    write_zarr,
+)
+
+np = pytest.importorskip("numpy")
+
+VOLUME = np.random.default_rng(0).integers(0, 1000, (20, 30, 40), dtype=np.uint16)
+
+
+@pytest.mark.parametrize(
+    "shape, chunks",
+    [
+        ((100,), (64,)),
+        ((10, 20), (10, 20)),
+        ((500, 500, 500), (64, 64, 64)),
+        ((3, 100, 100, 100), (1, 64, 64, 64)),
+    ],
+)
+def test_default_chunks(shape, chunks):
+    assert default_chunks(shape) == chunks
+
+
+@pytest.mark.parametrize("compressor", ["zlib", "zstd", None])
+def test_write_zarr(tmp_path, compressor):
+    if compressor == "zstd":
+        pytest.importorskip("zstandard")
+
+    array = write_zarr(VOLUME, tmp_path / "volume", (8, 16, 16), compressor)
+
+    assert array.shape == VOLUME.shape
+    assert array.chunks == (8, 16, 16)
+    assert array.dtype == VOLUME.dtype
+    assert array.compressor == compressor
+    # 3 x 2 x 3 chunks
+    assert len(list((tmp_path / "volume").glob("*.*.*"))) == 18
+    np.testing.assert_array_equal(np.asarray(array), VOLUME)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        0,
+        -1,
+        slice(3, 17),
+        (slice(5, 10), slice(10, 30), slice(1, 39)),
+        (..., 7),
+        (2, ..., slice(None, None, 3)),
+        (slice(None, None, -2), 4),
+        ([1, 5, 19], slice(0, 4), 3),
+        (slice(4, 4),),
+    ],
+)
+def test_zarr_array_indexing(tmp_path, key):
+    array = write_zarr(VOLUME, tmp_path / "volume", (8, 16, 16))
+    np.testing.assert_array_equal(array[key], VOLUME[key])
+
+
+def test_zarr_array_reads_overlapping_chunks(tmp_path, monkeypatch):
+    array = write_zarr(VOLUME, tmp_path / "volume", (8, 16, 16))
+
+    read = []
+    original = ZarrArray._read_chunk
+
+    def _read_chunk(self, index):
+        read.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(ZarrArray, "_read_chunk", _read_chunk)
+    np.testing.assert_array_equal(array[9:15, :10, 20:30], VOLUME[9:15, :10, 20:30])
+    assert read == [(1, 0, 1)]
+
+
+def test_zarr_array_invalid_index(tmp_path):
+    array = write_zarr(VOLUME, tmp_path / "volume")
+    with pytest.raises(IndexError):
+        array[0, 0, 0, 0]
+    with pytest.raises(IndexError):
+        array[None]
+    with pytest.raises(IndexError):
+        array[20]
+
+
+def test_write_zarr_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        write_zarr(VOLUME, tmp_path / "volume", (8, 16))
+    with pytest.raises(ValueError):
+        write_zarr(VOLUME, tmp_path / "volume", compressor="blosc")
+
+
+def test_zarr_compatibility(tmp_path):
+    """The store can be read by zarr."""
+    zarr = pytest.importorskip("zarr")
+    write_store({"folder/volume": VOLUME}, tmp_path / "store", {}, (8, 16, 16))
+
+    group = zarr.open_group(str(tmp_path / "store"), mode="r")
+    np.testing.assert_array_equal(group["folder/volume"][:], VOLUME)
+
+
+def test_write_store(tmp_path):
+    arrays = {"a/volume": VOLUME, "b": VOLUME[0]}
+    store = tmp_path / "data.zarr"
+
+    written = write_store(arrays, store, {"sha256": "abc"})
+    assert list(written) == ["a/volume", "b"]
+    assert json.loads((store / ".zgroup").read_text()) == {"zarr_format": 2}
+    assert (store / "a" / ".zgroup").exists()
+    assert not store.with_name("data.zarr.part").exists()
+    np.testing.assert_array_equal(written["b"][:], VOLUME[0])
+
+    # not written again with the same attributes
+    mtime = (store / ".zattrs").stat().st_mtime_ns
+    write_store(arrays, store, {"sha256": "abc"})
+    assert (store / ".zattrs").stat().st_mtime_ns == mtime
+
+    assert list(open_store(store, {"sha256": "abc"})) == ["a/volume", "b"]
+    assert open_store(store, {"sha256": "abc"}, chunks=(8, 8, 8)) is None
+    assert open_store(store, {"sha256": "def"}) is None
+
+    # but written again if the source changes
+    arrays["b"] = VOLUME[1]
+    written = write_store(arrays, store, {"sha256": "def"})
+    np.testing.assert_array_equal(written["b"][:], VOLUME[1])
+
+
+def test_entry_to_zarr(tmp_path, monkeypatch, array_entry):
+    entry, expected = array_entry
+
+    arrays = entry.to_zarr(tmp_path, chunks=(1, 32, 32))
+    assert list(arrays) == sorted(expected)
+    for name, array in arrays.items():
+        assert array.chunks == (1, 32, 32)
+        np.testing.assert_array_equal(np.asarray(array), expected[name])
+
+    store = tmp_path / f"{entry.get_registry_name()}.zarr"
+    assert json.loads((store / ".zattrs").read_text())["sha256"] == entry.hash
+
+    # opened without loading the dataset
+    def no_load(*args, **kwargs):
+        raise AssertionError("The dataset should not be loaded.")
+
+    monkeypatch.setattr(type(entry), "load", no_load)
+    arrays = entry.to_zarr(tmp_path, chunks=(1, 32, 32))
+    assert list(arrays) == sorted(expected)
+    np.testing.assert_array_equal(np.asarray(arrays[name]), expected[name])
@@ -1,5 +1,18 @@
+from pathlib import Path
+
+import pytest
+
 from careamics_portfolio import PortfolioManager
-from careamics_portfolio.utils import get_poochfolio, get_registry_path
+from careamics_portfolio.utils import (
+    download_utils,
+    fetch,
+    get_poochfolio,
+    get_registry_path,
+)
+from careamics_portfolio.utils.downloaders import RangeDownloader
+from careamics_portfolio.utils.verification_index import INDEX_NAME
+
+from .utils import sha256sum
 
 
 def test_get_pooch(portfolio: PortfolioManager):
@@ -20,3 +33,101 @@ def test_get_registry_path():
     """Test that the path to the registry is correct."""
     assert get_registry_path().name == "registry.txt"
     assert get_registry_path().exists()
+
+
+def test_shared_poochfolio(tmp_path, local_entries):
+    """Pooch objects are shared, and their registry follows the registry file."""
+    poochfolio = get_poochfolio(tmp_path)
+    assert get_poochfolio(tmp_path) is poochfolio
+    assert get_poochfolio(str(tmp_path / "other" / "..")) is poochfolio
+    assert get_poochfolio(tmp_path, mirrors=[tmp_path]) is not poochfolio
+    assert get_poochfolio(tmp_path / "other") is not poochfolio
+
+    # the registry is only parsed again when modified
+    registry = download_utils.get_registry_path()
+    parsed, _ = download_utils.load_registry(registry)
+    assert download_utils.load_registry(registry)[0] is parsed
+
+    with open(registry, "a") as f:
+        f.write("test-New 0123 https://example.com/new.bin\n")
+    assert "test-New" in get_poochfolio(tmp_path).registry
+    assert get_poochfolio(tmp_path).get_url("test-New") == (
+        "https://example.com/new.bin"
+    )
+    assert download_utils.load_registry(registry)[0] is not parsed
+
+    # registries are copies
+    poochfolio.registry["test-New"] = "4567"
+    assert get_poochfolio(tmp_path / "other").registry["test-New"] == "0123"
+
+
+def test_fetch_single_read(tmp_path, local_entries, monkeypatch):
+    """Downloaded files are not read again to check their hash."""
+    entry = local_entries[1]
+
+    def no_hash(*args, **kwargs):
+        raise AssertionError("The file should not be hashed after download.")
+
+    monkeypatch.setattr(download_utils, "file_hash", no_hash)
+    path = fetch(
+        get_poochfolio(tmp_path / "cache"),
+        entry.get_registry_name(),
+        downloader=RangeDownloader(connections=1),
+    )
+
+    assert sha256sum(path) == entry.hash
+    assert [
+        p.name
+        for p in (tmp_path / "cache").iterdir()
+        if not p.name.startswith(INDEX_NAME)
+    ] == [entry.get_registry_name()]
+
+
+def test_fetch_default_downloader(tmp_path, local_entries):
+    """Downloaders without digest fall back to hashing the file."""
+    entry = local_entries[1]
+    path = fetch(get_poochfolio(tmp_path), entry.get_registry_name())
+    assert sha256sum(path) == entry.hash
+
+    # existing file
+    assert fetch(get_poochfolio(tmp_path), entry.get_registry_name()) == path
+
+
+def test_fetch_hash_mismatch(tmp_path, local_entries):
+    entry = local_entries[1]
+    poochfolio = get_poochfolio(tmp_path / "cache")
+    poochfolio.registry[entry.get_registry_name()] = "0" * 64
+
+    with pytest.raises(ValueError):
+        fetch(poochfolio, entry.get_registry_name())
+
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_fetch_update(tmp_path, local_entries):
+    """Corrupted files are downloaded anew."""
+    entry = local_entries[1]
+    (tmp_path / entry.get_registry_name()).write_bytes(b"corrupted")
+
+    path = fetch(get_poochfolio(tmp_path), entry.get_registry_name())
+    assert sha256sum(path) == entry.hash
+
+    poochfolio = get_poochfolio(tmp_path)
+    poochfolio.allow_updates = False
+    Path(path).write_bytes(b"corrupted")
+    with pytest.raises(ValueError):
+        fetch(poochfolio, entry.get_registry_name())
+
+
+def test_fetch_processor(tmp_path, local_entries):
+    entry = local_entries[1]
+    calls = []
+
+    def processor(fname, action, poochfolio):
+        calls.append(action)
+        return fname
+
+    fetch(get_poochfolio(tmp_path), entry.get_registry_name(), processor=processor)
+    fetch(get_poochfolio(tmp_path), entry.get_registry_name(), processor=processor)
+
+    assert calls == ["download", "fetch"]
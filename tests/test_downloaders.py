@@ -0,0 +1,328 @@
+import os
+
+import pooch
+import pytest
+
+from careamics_portfolio.utils.downloaders import (
+    DownloadJournal,
+    RangeDownloader,
+    preallocate,
+)
+
+from .utils import sha256sum, start_http_server
+
+SIZE = 3_000_001
+
+
+@pytest.fixture
+def large_file(http_server):
+    path = http_server.directory / "large.bin"
+    path.write_bytes(os.urandom(SIZE))
+    return path
+
+
+@pytest.mark.parametrize("connections", [2, 4, 7])
+def test_range_downloader(tmp_path, http_server, large_file, connections):
+    downloader = RangeDownloader(connections=connections, min_range_size=100_000)
+    output = tmp_path / "output.bin"
+
+    downloader(f"{http_server.url}/large.bin", str(output), None)
+
+    assert output.read_bytes() == large_file.read_bytes()
+    ranges = sorted(
+        (r for r in http_server.ranges if r is not None),
+        key=lambda r: int(r[len("bytes=") :].split("-")[0]),
+    )
+    assert len(ranges) == connections
+    assert ranges[0] == f"bytes=0-{SIZE // connections - 1}"
+    assert ranges[-1].endswith(f"-{SIZE - 1}")
+
+
+def test_range_downloader_small_file(tmp_path, http_server, large_file):
+    """Files smaller than two ranges are downloaded over a single stream."""
+    downloader = RangeDownloader(connections=4)
+    output = tmp_path / "output.bin"
+
+    downloader(f"{http_server.url}/large.bin", str(output), None)
+
+    assert output.read_bytes() == large_file.read_bytes()
+    assert http_server.ranges == [None]
+
+
+def test_range_downloader_fallback(tmp_path):
+    """Servers not advertising range support are downloaded over one stream."""
+    directory = tmp_path / "server"
+    directory.mkdir()
+    (directory / "large.bin").write_bytes(os.urandom(SIZE))
+    server = start_http_server(directory, accept_ranges=False)
+    url = f"http://127.0.0.1:{server.server_address[1]}/large.bin"
+
+    try:
+        output = tmp_path / "output.bin"
+        RangeDownloader(connections=4, min_range_size=100_000)(url, str(output), None)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert output.read_bytes() == (directory / "large.bin").read_bytes()
+    assert server.ranges == [None]
+
+
+def test_range_downloader_progressbar(tmp_path, http_server, large_file):
+    downloader = RangeDownloader(
+        connections=3, min_range_size=100_000, progressbar=True
+    )
+    output = tmp_path / "output.bin"
+
+    downloader(f"{http_server.url}/large.bin", str(output), None)
+
+    assert output.read_bytes() == large_file.read_bytes()
+
+
+def test_range_downloader_check_only(http_server, large_file):
+    downloader = RangeDownloader()
+    assert downloader(f"{http_server.url}/large.bin", "", None, check_only=True)
+    assert not downloader(f"{http_server.url}/missing.bin", "", None, check_only=True)
+
+
+def test_range_downloader_with_pooch(tmp_path, http_server, large_file):
+    """Pooch verifies the hash of the file downloaded in ranges."""
+    url = f"{http_server.url}/large.bin"
+    downloader = RangeDownloader(connections=4, min_range_size=100_000)
+
+    path = pooch.retrieve(
+        url,
+        known_hash=sha256sum(large_file),
+        path=tmp_path,
+        downloader=downloader,
+    )
+    assert sha256sum(path) == sha256sum(large_file)
+
+    with pytest.raises(ValueError):
+        pooch.retrieve(
+            url,
+            known_hash="0" * 64,
+            fname="corrupted.bin",
+            path=tmp_path,
+            downloader=downloader,
+        )
+
+
+def test_invalid_connections():
+    with pytest.raises(ValueError):
+        RangeDownloader(connections=0)
+
+
+def test_preallocate(tmp_path):
+    path = tmp_path / "file.bin"
+    preallocate(path, 1000)
+    assert path.stat().st_size == 1000
+
+
+def test_download_entry_connections(tmp_path, local_entries, http_server):
+    entry = local_entries[1]
+    path = entry.download(tmp_path, connections=2)
+    assert sha256sum(path) == entry.hash
+
+
+class Preempted(Exception):
+    pass
+
+
+class PreemptingProgress:
+    """Progress bar interrupting the download after a number of bytes."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.total = 0
+        self.n = 0
+
+    def update(self, n):
+        self.n += n
+        if self.n > self.limit:
+            raise Preempted()
+
+    def reset(self):
+        self.n = 0
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("connections", [1, 3])
+def test_resume_download(tmp_path, http_server, large_file, connections):
+    url = f"{http_server.url}/large.bin"
+    partial = tmp_path / "large.bin.part"
+    output = tmp_path / "output.bin"
+
+    # interrupt the download after ~1 MB
+    downloader = RangeDownloader(
+        connections=connections,
+        min_range_size=100_000,
+        chunk_size=10_000,
+        partial_file=partial,
+        journal_interval=50_000,
+        progressbar=PreemptingProgress(1_000_000),
+    )
+    with pytest.raises(Preempted):
+        downloader(url, str(output), None)
+
+    assert partial.exists()
+    journal = DownloadJournal.load(downloader.journal_file)
+    assert journal is not None
+    assert len(journal.ranges) == connections
+    assert 0 < journal.received < SIZE
+
+    # resume
+    http_server.ranges.clear()
+    downloader = RangeDownloader(
+        connections=connections, min_range_size=100_000, partial_file=partial
+    )
+    downloader(url, str(output), None)
+
+    assert output.read_bytes() == large_file.read_bytes()
+    assert not partial.exists()
+    assert not downloader.journal_file.exists()
+
+    # only the missing bytes were requested
+    starts = [int(r[len("bytes=") :].split("-")[0]) for r in http_server.ranges]
+    assert len(starts) == connections
+    assert all(start > 0 for start in starts)
+
+
+def test_resume_changed_file(tmp_path, http_server, large_file):
+    """A partial download is discarded if the remote file changed."""
+    url = f"{http_server.url}/large.bin"
+    partial = tmp_path / "large.bin.part"
+    output = tmp_path / "output.bin"
+
+    downloader = RangeDownloader(
+        connections=1,
+        chunk_size=10_000,
+        partial_file=partial,
+        journal_interval=50_000,
+        progressbar=PreemptingProgress(1_000_000),
+    )
+    with pytest.raises(Preempted):
+        downloader(url, str(output), None)
+
+    # change the remote file size
+    large_file.write_bytes(os.urandom(SIZE + 10))
+
+    http_server.ranges.clear()
+    RangeDownloader(connections=1, partial_file=partial)(url, str(output), None)
+
+    assert output.read_bytes() == large_file.read_bytes()
+    assert http_server.ranges == [f"bytes=0-{SIZE + 9}"]
+
+
+def test_resume_without_range_support(tmp_path):
+    """The partial file is discarded if the server does not support ranges."""
+    directory = tmp_path / "server"
+    directory.mkdir()
+    (directory / "large.bin").write_bytes(os.urandom(SIZE))
+    server = start_http_server(directory, accept_ranges=False)
+    url = f"http://127.0.0.1:{server.server_address[1]}/large.bin"
+
+    partial = tmp_path / "large.bin.part"
+    partial.write_bytes(b"stale")
+    downloader = RangeDownloader(connections=1, partial_file=partial)
+    downloader.journal_file.write_text("{}")
+
+    try:
+        output = tmp_path / "output.bin"
+        downloader(url, str(output), None)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert output.read_bytes() == (directory / "large.bin").read_bytes()
+    assert not partial.exists()
+    assert not downloader.journal_file.exists()
+
+
+def test_journal_load_invalid(tmp_path):
+    path = tmp_path / "journal.json"
+    assert DownloadJournal.load(path) is None
+
+    path.write_text("not json")
+    assert DownloadJournal.load(path) is None
+
+
+def test_download_entry_resume(tmp_path, local_entries, http_server):
+    """PortfolioEntry downloads resume from the partial file in the cache."""
+    entry = local_entries[1]
+    registry_name = entry.get_registry_name()
+
+    # simulate an interrupted download of the first half of the file
+    content = (http_server.directory / "local.bin").read_bytes()
+    partial = tmp_path / f"{registry_name}.part"
+    partial.write_bytes(content[: len(content) // 2] + b"\0" * (len(content) // 2))
+    journal = DownloadJournal(
+        partial.with_name(partial.name + ".json"),
+        url=entry.url,
+        size=len(content),
+        validators={},
+        ranges=[[0, len(content), len(content) // 2]],
+    )
+    journal.save()
+
+    path = entry.download(tmp_path)
+
+    assert sha256sum(path) == entry.hash
+    assert http_server.ranges == [f"bytes={len(content) // 2}-{len(content) - 1}"]
+    assert not partial.exists()
+
+
+@pytest.mark.parametrize("connections", [1, 3])
+def test_downloader_digest(tmp_path, http_server, large_file, connections):
+    """The digest is computed while downloading."""
+    downloader = RangeDownloader(
+        connections=connections,
+        min_range_size=100_000,
+        partial_file=tmp_path / "large.bin.part",
+    )
+    output = tmp_path / "output.bin"
+
+    downloader(f"{http_server.url}/large.bin", str(output), None)
+
+    assert downloader.digest == sha256sum(large_file)
+
+
+def test_downloader_digest_single_stream(tmp_path, http_server, large_file):
+    downloader = RangeDownloader(connections=1)
+    output = tmp_path / "output.bin"
+
+    downloader(f"{http_server.url}/large.bin", str(output), None)
+
+    assert http_server.ranges == [None]
+    assert downloader.digest == sha256sum(large_file)
+
+
+def test_resume_corrupted_partial(tmp_path, http_server, large_file):
+    """A partial file not matching its journal is downloaded anew."""
+    url = f"{http_server.url}/large.bin"
+    partial = tmp_path / "large.bin.part"
+    output = tmp_path / "output.bin"
+
+    downloader = RangeDownloader(
+        connections=1,
+        chunk_size=10_000,
+        partial_file=partial,
+        journal_interval=50_000,
+        progressbar=PreemptingProgress(1_000_000),
+    )
+    with pytest.raises(Preempted):
+        downloader(url, str(output), None)
+    assert DownloadJournal.load(downloader.journal_file).hashed is not None
+
+    # corrupt the partial file
+    with open(partial, "r+b") as f:
+        f.write(b"corrupted")
+
+    http_server.ranges.clear()
+    downloader = RangeDownloader(connections=1, partial_file=partial)
+    downloader(url, str(output), None)
+
+    assert http_server.ranges == [f"bytes=0-{SIZE - 1}"]
+    assert downloader.digest == sha256sum(large_file)
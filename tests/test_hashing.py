@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+import pytest
+
+from careamics_portfolio.utils.hashing import (
+    OrderedHasher,
+    file_hash,
+    split_hash,
+    verify,
+)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(1_000_003))
+    return path
+
+
+def test_split_hash():
+    assert split_hash("ABC") == ("sha256", "abc")
+    assert split_hash("md5:ABC") == ("md5", "abc")
+
+
+@pytest.mark.parametrize("buffer_size", [1000, 2**20, 2**23])
+def test_file_hash(data_file, buffer_size):
+    expected = hashlib.sha256(data_file.read_bytes()).hexdigest()
+    assert file_hash(data_file, buffer_size=buffer_size) == expected
+
+
+def test_file_hash_md5(data_file):
+    expected = hashlib.md5(data_file.read_bytes()).hexdigest()
+    assert file_hash(data_file, "md5") == expected
+
+
+def test_verify(tmp_path, data_file):
+    digest = hashlib.sha256(data_file.read_bytes()).hexdigest()
+    assert verify(data_file, digest)
+    assert verify(data_file, "sha256:" + digest.upper())
+    assert not verify(data_file, "0" * 64)
+    assert not verify(tmp_path / "missing.bin", digest)
+
+
+def test_ordered_hasher_in_order(data_file):
+    """A single range is hashed from memory, without reading the file."""
+    content = data_file.read_bytes()
+    hasher = OrderedHasher(None, [[0, len(content), 0]])
+
+    for offset in range(0, len(content), 4096):
+        hasher.feed(0, offset, content[offset : offset + 4096])
+
+    assert hasher.offset == len(content)
+    assert hasher.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_ordered_hasher_out_of_order(data_file):
+    """Data written out of order is hashed once the frontier reaches it."""
+    content = data_file.read_bytes()
+    bounds = [0, 300_000, 700_000, len(content)]
+    ranges = [[start, end, 0] for start, end in zip(bounds[:-1], bounds[1:])]
+    hasher = OrderedHasher(data_file, ranges)
+
+    # write the last ranges first
+    for index in (2, 1, 0):
+        start, end, _ = ranges[index]
+        for offset in range(start, end, 50_000):
+            hasher.feed(index, offset, content[offset : min(offset + 50_000, end)])
+
+        if index > 0:
+            assert hasher.offset == 0
+
+    assert hasher.offset == len(content)
+    assert hasher.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_ordered_hasher_resume(data_file):
+    content = data_file.read_bytes()
+    ranges = [[0, 500_000, 200_000], [500_000, len(content), 100_000]]
+    checkpoint = (150_000, hashlib.sha256(content[:150_000]).hexdigest())
+
+    # the data on disk is hashed when creating the hasher
+    hasher = OrderedHasher(data_file, ranges, checkpoint)
+    assert hasher.offset == 200_000
+
+    with pytest.raises(ValueError):
+        OrderedHasher(data_file, ranges, (150_000, "0" * 64))
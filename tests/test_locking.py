@@ -0,0 +1,108 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from careamics_portfolio.utils.locking import FileLock
+
+
+def test_file_lock(tmp_path):
+    lock = FileLock(tmp_path / "folder" / "data.lock")
+    assert not lock.is_locked
+
+    with lock:
+        assert lock.is_locked
+        assert lock.path.exists()
+        with pytest.raises(RuntimeError):
+            lock.acquire()
+    assert not lock.is_locked
+
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+    # the lock can be taken again
+    with lock:
+        pass
+
+
+def test_file_lock_threads(tmp_path):
+    """The lock is exclusive between threads of the same process."""
+    path = tmp_path / "data.lock"
+    inside, overlaps = [], []
+
+    def work():
+        with FileLock(path, poll_interval=0.001):
+            inside.append(1)
+            overlaps.append(len(inside))
+            time.sleep(0.01)
+            inside.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == [1] * 8
+
+
+def test_file_lock_timeout(tmp_path):
+    path = tmp_path / "data.lock"
+    with FileLock(path):
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            FileLock(path, timeout=0.2).acquire()
+        assert time.monotonic() - start < 2
+
+    FileLock(path, timeout=0.2).acquire()
+
+
+def test_file_lock_processes(tmp_path):
+    """The lock is exclusive between processes."""
+    path = tmp_path / "data.lock"
+    script = (
+        "import sys, time\n"
+        "from careamics_portfolio.utils.locking import FileLock\n"
+        f"with FileLock({str(path)!r}):\n"
+        "    print('locked', flush=True)\n"
+        "    time.sleep(1)\n"
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert process.stdout.readline().strip() == "locked"
+        with pytest.raises(TimeoutError):
+            FileLock(path, timeout=0.1).acquire()
+
+        # taken once the other process releases it
+        lock = FileLock(path, timeout=30)
+        lock.acquire()
+        lock.release()
+    finally:
+        process.wait()
+    assert process.returncode == 0
+
+
+def test_concurrent_downloads(tmp_path, local_entries, http_server):
+    """Concurrent downloads of an entry only download and extract it once."""
+    entry = local_entries[0]
+    results, errors = [], []
+
+    def download():
+        try:
+            results.append(sorted(entry.download(tmp_path)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=download) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert all(paths == results[0] for paths in results)
+    assert len(http_server.ranges) == 1
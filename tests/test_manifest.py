@@ -0,0 +1,119 @@
+import json
+import zlib
+
+import pytest
+
+from careamics_portfolio.utils.manifest import (
+    MANIFEST_SUFFIX,
+    archive_members,
+    check_manifest,
+    write_manifest,
+)
+from careamics_portfolio.utils.processors import ArchiveExtractor, ArchiveFormat
+
+from .test_processors import MEMBERS, make_archive
+
+
+def extract(archive, archive_format):
+    processor = ArchiveExtractor(archive_format)
+    processor(str(archive), "download", None)
+    return archive.with_name(archive.name + processor.suffix)
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz"])
+def test_archive_members(tmp_path, archive_format):
+    archive = make_archive(tmp_path, archive_format)
+    assert archive_members(archive, ArchiveFormat(archive_format)) == {
+        name: {"size": len(content), "crc32": zlib.crc32(content)}
+        for name, content in MEMBERS.items()
+    }
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_manifest(tmp_path, archive_format):
+    archive = make_archive(tmp_path, archive_format)
+    extract_dir = extract(archive, archive_format)
+    manifest = tmp_path / "data.manifest.json"
+
+    write_manifest(manifest, archive, ArchiveFormat(archive_format), extract_dir, "a")
+    assert sorted(json.loads(manifest.read_text())["files"]) == sorted(MEMBERS)
+
+    files = check_manifest(manifest, extract_dir, "a", force_verify=True)
+    assert sorted(files) == sorted(str(extract_dir / name) for name in MEMBERS)
+    assert check_manifest(manifest, extract_dir, "b") is None
+
+    # corrupted file of the same size, only detected by checksum
+    path = extract_dir / "data/README.txt"
+    path.write_bytes(b"README")
+    assert check_manifest(manifest, extract_dir, "a") is not None
+    assert check_manifest(manifest, extract_dir, "a", force_verify=True) is None
+    assert check_manifest(manifest, extract_dir, "a", ["**/train"], True) is not None
+
+    # missing file
+    path.unlink()
+    assert check_manifest(manifest, extract_dir, "a") is None
+
+    with pytest.raises(OSError):
+        write_manifest(
+            manifest, archive, ArchiveFormat(archive_format), extract_dir, "a"
+        )
+
+
+def test_manifest_members(tmp_path):
+    """The manifest of a partial extraction only covers the selected members."""
+    archive = make_archive(tmp_path, "zip")
+    processor = ArchiveExtractor(members=["**/test"])
+    processor(str(archive), "download", None)
+    extract_dir = tmp_path / "data.zip.unzip"
+    manifest = tmp_path / "data.manifest.json"
+
+    write_manifest(
+        manifest, archive, ArchiveFormat.ZIP, extract_dir, "a", members=["**/test"]
+    )
+    files = check_manifest(manifest, extract_dir, "a", members=["**/test"])
+    assert files == [str(extract_dir / "data/test/image_0.bin")]
+
+    # members that were not extracted
+    assert check_manifest(manifest, extract_dir, "a") is None
+    assert check_manifest(manifest, extract_dir, "a", members=["**/train"]) is None
+
+
+def test_download_without_archive(tmp_path, local_entries, http_server):
+    entry = local_entries[0]
+    registry_name = entry.get_registry_name()
+    archive = tmp_path / registry_name
+    manifest = tmp_path / (registry_name + MANIFEST_SUFFIX)
+
+    files = entry.download(tmp_path, keep_archive=False)
+    assert not archive.exists()
+    assert manifest.exists()
+    assert entry.verify(tmp_path, force_verify=True)
+
+    # the extraction is reused without downloading the archive again
+    requests = len(http_server.ranges)
+    assert sorted(entry.download(tmp_path)) == sorted(files)
+    assert len(http_server.ranges) == requests
+
+    # a corrupted extraction is downloaded again
+    extracted = tmp_path / f"{registry_name}.unzip" / "local/README.txt"
+    extracted.write_bytes(b"corrupted")
+    assert not entry.verify(tmp_path)
+    assert sorted(entry.download(tmp_path)) == sorted(files)
+    assert len(http_server.ranges) == requests + 1
+    assert extracted.read_bytes() == b"Local test archive."
+    assert archive.exists()
+    assert not manifest.exists()
+
+
+def test_download_without_archive_members(tmp_path, local_entries, http_server):
+    entry = local_entries[0]
+    files = entry.download(tmp_path, members=["**/test"], keep_archive=False)
+    assert len(files) == 1
+
+    requests = len(http_server.ranges)
+    assert entry.download(tmp_path, members=["**/test"]) == files
+    assert len(http_server.ranges) == requests
+
+    # members that were not extracted require the archive
+    assert len(entry.download(tmp_path, members=["**/train"])) == 2
+    assert len(http_server.ranges) == requests + 1
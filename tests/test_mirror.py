@@ -0,0 +1,137 @@
+import tarfile
+
+import pytest
+
+from careamics_portfolio import PortfolioManager
+from careamics_portfolio.utils import get_poochfolio
+from careamics_portfolio.utils.download_utils import MIRRORS_ENV
+
+from .utils import start_http_server
+
+
+@pytest.fixture
+def mirror(tmp_path, local_entries):
+    return PortfolioManager().build_mirror(
+        tmp_path / "mirror", local_entries, cache=tmp_path / "cache"
+    )
+
+
+def test_build_mirror(tmp_path, local_entries, mirror, http_server):
+    names = sorted(entry.get_registry_name() for entry in local_entries)
+    assert sorted(p.name for p in mirror.iterdir()) == sorted([*names, "registry.txt"])
+    for entry in local_entries:
+        name = entry.get_registry_name()
+        assert (mirror / name).read_bytes() == (
+            http_server.directory / entry.file_name
+        ).read_bytes()
+        assert f"{name} {entry.hash} {name}\n" in (mirror / "registry.txt").read_text()
+
+    # the files of the cache are reused
+    requests = len(http_server.ranges)
+    PortfolioManager().build_mirror(
+        tmp_path / "bundle.tar", local_entries, cache=tmp_path / "cache", as_tar=True
+    )
+    assert len(http_server.ranges) == requests
+    with tarfile.open(tmp_path / "bundle.tar") as tar:
+        assert tar.getnames()[0] == "registry.txt"
+        assert sorted(tar.getnames()) == sorted([*names, "registry.txt"])
+
+
+def test_get_urls(tmp_path, local_entries, mirror, monkeypatch):
+    flat = tmp_path / "flat"
+    poochfolio = get_poochfolio(tmp_path, mirrors=[flat, mirror])
+    zip_entry, raw_entry = local_entries
+    name = zip_entry.get_registry_name()
+
+    # flat layout without registry, registry of the mirror otherwise
+    assert poochfolio.get_urls(name) == [
+        str(flat / name),
+        str(mirror / name),
+        poochfolio.get_url(name),
+    ]
+
+    # files are located through the registry, and skipped if their hash differs
+    (mirror / "nested").mkdir()
+    (mirror / name).rename(mirror / "nested" / "renamed.zip")
+    registry = (mirror / "registry.txt").read_text()
+    registry = registry.replace(f" {name}\n", " nested/renamed.zip\n")
+    registry = registry.replace(raw_entry.hash, "0" * 64)
+    (mirror / "registry.txt").write_text(registry)
+    assert poochfolio.get_urls(name)[1] == str(mirror / "nested" / "renamed.zip")
+    assert poochfolio.get_urls(raw_entry.get_registry_name()) == [
+        str(flat / raw_entry.get_registry_name()),
+        poochfolio.get_url(raw_entry.get_registry_name()),
+    ]
+
+    monkeypatch.setenv(MIRRORS_ENV, "http://a ; file:///b")
+    assert get_poochfolio(tmp_path).mirrors == ["http://a", "file:///b"]
+    monkeypatch.delenv(MIRRORS_ENV)
+    assert get_poochfolio(tmp_path).mirrors == []
+
+
+@pytest.mark.parametrize("stream_extract", [False, True])
+def test_local_mirror(
+    tmp_path, local_entries, mirror, http_server, monkeypatch, stream_extract
+):
+    """Files are copied from a local mirror without requests to their URL."""
+    monkeypatch.setenv(MIRRORS_ENV, mirror.as_uri())
+    requests = len(http_server.ranges)
+
+    zip_entry, raw_entry = local_entries
+    assert (
+        len(zip_entry.download(tmp_path / "node", stream_extract=stream_extract)) == 4
+    )
+    raw_entry.download(tmp_path / "node")
+    for entry in local_entries:
+        assert entry.verify(tmp_path / "node", force_verify=True)
+    assert len(http_server.ranges) == requests
+
+
+@pytest.mark.parametrize("stream_extract", [False, True])
+def test_tar_mirror(tmp_path, local_entries, http_server, monkeypatch, stream_extract):
+    """Files are read from a tar mirror without extracting it."""
+    mirror = PortfolioManager().build_mirror(
+        tmp_path / "mirror.tar", local_entries, cache=tmp_path / "cache", as_tar=True
+    )
+    monkeypatch.setenv(MIRRORS_ENV, str(mirror))
+    requests = len(http_server.ranges)
+
+    zip_entry, raw_entry = local_entries
+    assert (
+        len(zip_entry.download(tmp_path / "node", stream_extract=stream_extract)) == 4
+    )
+    raw_entry.download(tmp_path / "node")
+    for entry in local_entries:
+        assert entry.verify(tmp_path / "node", force_verify=True)
+    assert len(http_server.ranges) == requests
+
+
+def test_http_mirror(tmp_path, local_entries, mirror, http_server, monkeypatch):
+    server = start_http_server(mirror)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        monkeypatch.setenv(MIRRORS_ENV, f"{url}/missing;{url}")
+        requests = len(http_server.ranges)
+
+        entry = local_entries[1]
+        entry.download(tmp_path / "node", connections=2)
+        assert entry.verify(tmp_path / "node", force_verify=True)
+        assert len(http_server.ranges) == requests
+        assert len(server.ranges) > 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_mirror_fallback(tmp_path, local_entries, mirror, http_server, monkeypatch):
+    """Missing or corrupted files of a mirror are downloaded from their URL."""
+    zip_entry, raw_entry = local_entries
+    (mirror / zip_entry.get_registry_name()).unlink()
+    (mirror / raw_entry.get_registry_name()).write_bytes(b"corrupted")
+    monkeypatch.setenv(MIRRORS_ENV, str(mirror))
+
+    requests = len(http_server.ranges)
+    for entry in local_entries:
+        entry.download(tmp_path / "node")
+        assert entry.verify(tmp_path / "node", force_verify=True)
+    assert len(http_server.ranges) == requests + 2
@@ -0,0 +1,136 @@
+import threading
+
+import pytest
+
+from careamics_portfolio.utils.patches import iter_patches
+
+np = pytest.importorskip("numpy")
+
+STACK = np.arange(3 * 20 * 30, dtype=np.float32).reshape(3, 20, 30)
+
+
+class ReadCounter:
+    """Array wrapper recording the shape of each read."""
+
+    def __init__(self, array):
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.reads = []
+
+    def __getitem__(self, key):
+        data = self.array[key]
+        self.reads.append(data.shape)
+        return data
+
+
+def all_patches(array, patch_shape, stride):
+    """Reference patches, in order."""
+    patches = []
+    for image in array.reshape(-1, *array.shape[-len(patch_shape) :]):
+        for y in range(0, image.shape[0] - patch_shape[0] + 1, stride[0]):
+            for x in range(0, image.shape[1] - patch_shape[1] + 1, stride[1]):
+                patches.append(image[y : y + patch_shape[0], x : x + patch_shape[1]])
+    return np.stack(patches)
+
+
+@pytest.mark.parametrize("stride", [None, (5, 7)])
+def test_iter_patches(stride):
+    array = ReadCounter(STACK)
+    batches = list(iter_patches([array], (8, 10), stride=stride, batch_size=4))
+
+    patches = np.concatenate(batches)
+    expected = all_patches(STACK, (8, 10), stride or (8, 10))
+    np.testing.assert_array_equal(patches, expected)
+    assert all(len(batch) == 4 for batch in batches[:-1])
+
+    # one slab per row of patches
+    assert set(array.reads) == {(8, 30)}
+
+
+def test_iter_patches_volume():
+    volume = np.arange(10 * 12 * 14).reshape(10, 12, 14)
+    patches = np.concatenate(list(iter_patches([volume], (4, 4, 4), batch_size=5)))
+    assert patches.shape == (2 * 3 * 3, 4, 4, 4)
+    np.testing.assert_array_equal(patches[-1], volume[4:8, 8:12, 8:12])
+
+
+def test_iter_patches_shuffle():
+    batches = list(
+        iter_patches([STACK, STACK[0]], (4, 5), batch_size=7, shuffle_buffer=10, seed=1)
+    )
+    patches = np.concatenate(batches)
+
+    expected = np.concatenate(
+        [all_patches(STACK, (4, 5), (4, 5)), all_patches(STACK[0], (4, 5), (4, 5))]
+    )
+    assert not np.array_equal(patches, expected)
+    # same patches, in a different order
+    assert sorted(p.tobytes() for p in patches) == sorted(p.tobytes() for p in expected)
+
+    # reproducible
+    again = iter_patches(
+        [STACK, STACK[0]], (4, 5), batch_size=7, shuffle_buffer=10, seed=1
+    )
+    np.testing.assert_array_equal(np.concatenate(list(again)), patches)
+
+
+def test_iter_patches_drop_last():
+    batches = list(iter_patches([STACK], (10, 10), batch_size=4, drop_last=True))
+    # 18 patches
+    assert [len(b) for b in batches] == [4, 4, 4, 4]
+
+
+def test_iter_patches_small_arrays():
+    """Arrays smaller than the patches are ignored."""
+    assert list(iter_patches([STACK, np.zeros(5)], (25, 25))) == []
+
+
+def test_iter_patches_stops_reading():
+    """The background thread stops when the iteration is interrupted."""
+    threads = threading.active_count()
+    array = ReadCounter(np.zeros((1000, 4, 4)))
+
+    patches = iter_patches([array], (4, 4), prefetch=2)
+    next(patches)
+    patches.close()
+
+    assert threading.active_count() == threads
+    assert len(array.reads) <= 4
+
+
+def test_iter_patches_read_error():
+    class Failing:
+        shape = (10, 10)
+        dtype = np.uint8
+
+        def __getitem__(self, key):
+            raise OSError("read error")
+
+    with pytest.raises(OSError, match="read error"):
+        list(iter_patches([Failing()], (5, 5)))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"patch_shape": ()},
+        {"patch_shape": (0, 4)},
+        {"patch_shape": (4, 4), "stride": (4,)},
+        {"patch_shape": (4, 4), "batch_size": 0},
+    ],
+)
+def test_iter_patches_invalid(kwargs):
+    with pytest.raises(ValueError):
+        next(iter_patches([STACK], **kwargs))
+
+
+def test_entry_iter_patches(tmp_path, array_entry):
+    entry, expected = array_entry
+
+    patches = np.concatenate(
+        list(entry.iter_patches((30, 30), path=tmp_path, batch_size=3))
+    )
+    # 3 patches in each of the 2 test images, 6 in each of the 5 train images
+    assert patches.shape == (2 * 3 + 5 * 6, 30, 30)
+    np.testing.assert_array_equal(patches[0], expected["arrays/test/X.npy"][0, :, :30])
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -5,6 +7,7 @@ import pytest
 from careamics_portfolio import PortfolioManager, update_registry
 from careamics_portfolio.portfolio import IterablePortfolio
 from careamics_portfolio.utils import get_registry_path
+from careamics_portfolio.utils.catalog import get_catalog
 
 
 def registry_checker(portfolio: PortfolioManager, path_to_file: Path) -> None:
@@ -49,12 +52,7 @@ def list_iterable_portfolios():
     """List all iterable portfolios."""
     portfolio = PortfolioManager()
 
-    list_iter_portfolios = []
-    for attribute in vars(portfolio).values():
-        if isinstance(attribute, IterablePortfolio):
-            list_iter_portfolios.append(attribute)
-
-    return list_iter_portfolios
+    return list(portfolio.as_dict().values())
 
 
 ITERABLES = list_iterable_portfolios()
@@ -211,3 +209,51 @@ def test_update_registry(tmp_path, portfolio: PortfolioManager):
 
     # verify registry
     registry_checker(portfolio, get_registry_path())
+
+
+def test_registry_from_catalog(tmp_path):
+    """The packaged registry is the one generated from the catalog."""
+    path_to_file = tmp_path / "registry.txt"
+    update_registry(path_to_file)
+    assert path_to_file.read_text() == get_registry_path().read_text()
+
+
+def test_verify(tmp_path, portfolio: PortfolioManager):
+    """Test that only downloaded datasets are verified."""
+    assert portfolio.verify(tmp_path) == {}
+
+    entry = portfolio.denoising.N2V_SEM
+    (tmp_path / entry.get_registry_name()).write_bytes(b"corrupted")
+    assert portfolio.verify(tmp_path) == {entry.get_registry_name(): False}
+
+
+def test_lazy_entries():
+    """Entries are only created when accessed, and then reused."""
+    portfolio = PortfolioManager()
+    assert portfolio._denoising is None
+
+    denoising = portfolio.denoising
+    assert denoising._entries == {}
+    assert denoising.N2V_SEM is denoising.N2V_SEM
+    assert len(denoising._entries) == 1
+    assert list(denoising) == [
+        getattr(denoising, name) for name in get_catalog().names(denoising.name)
+    ]
+
+
+def test_import_time():
+    """Importing the package and looking up an entry is fast and imports neither
+    pooch nor tqdm."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import careamics_portfolio\n"
+        "careamics_portfolio.PortfolioManager().denoising.N2V_SEM.get_registry_name()\n"
+        "print(time.perf_counter() - start)\n"
+        "print(any(name in sys.modules for name in ('pooch', 'tqdm')))\n"
+    )
+    elapsed, imported = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert imported == "False"
+    assert float(elapsed) < 1.0
@@ -1,8 +1,12 @@
+import json
+import pickle
 from pathlib import Path
 
 import pytest
 
+from careamics_portfolio import PortfolioManager
 from careamics_portfolio.portfolio_entry import PortfolioEntry
+from careamics_portfolio.utils.processors import ArchiveFormat
 
 
 def test_download(tmp_path, pale_blue_dot: PortfolioEntry):
@@ -65,6 +69,37 @@ def test_change_entry(pale_blue_dot: PortfolioEntry):
     with pytest.raises(AttributeError):
         pale_blue_dot.hash = ""
 
+    # including private attributes, and tags are copies
+    with pytest.raises(AttributeError):
+        pale_blue_dot._name = ""
+    pale_blue_dot.tags.append("modified")
+    assert "modified" not in pale_blue_dot.tags
+
+
+def test_entry_identity(pale_blue_dot: PortfolioEntry):
+    """Entries are identified by their registry name."""
+    copy = pickle.loads(pickle.dumps(pale_blue_dot))
+    assert copy == pale_blue_dot
+    assert len({copy, pale_blue_dot}) == 1
+    assert copy.to_dict() == pale_blue_dot.to_dict()
+
+    other = PortfolioEntry(
+        **{**pale_blue_dot.to_dict(), "portfolio": "other", "sha256": "a"}
+    )
+    assert other != pale_blue_dot
+
+
+def test_cached_serialization(pale_blue_dot: PortfolioEntry):
+    assert pale_blue_dot.to_json() is pale_blue_dot.to_json()
+
+    # dictionaries are copies
+    entry = pale_blue_dot.to_dict()
+    entry["tags"].append("modified")
+    entry["name"] = "modified"
+    assert pale_blue_dot.to_dict() != entry
+    assert json.loads(pale_blue_dot.to_json()) == pale_blue_dot.to_dict()
+    assert str(pale_blue_dot) == str(pale_blue_dot.to_dict())
+
 
 def test_registry_name(pale_blue_dot: PortfolioEntry):
     """Test that the registry name is correct."""
@@ -90,6 +125,52 @@ def test_name_with_space():
         )
 
 
+@pytest.mark.parametrize(
+    "file_name, is_zip, archive_format, expected",
+    [
+        ("file.zip", True, None, ArchiveFormat.ZIP),
+        ("file.tar.gz", True, None, ArchiveFormat.TAR_GZ),
+        ("file", True, None, ArchiveFormat.ZIP),
+        ("file.tif", False, None, ArchiveFormat.NONE),
+        ("file", True, "tar.zst", ArchiveFormat.TAR_ZST),
+    ],
+)
+def test_archive_format(file_name, is_zip, archive_format, expected):
+    entry = PortfolioEntry(
+        name="name",
+        url="url",
+        portfolio="portfolio",
+        description="description",
+        license="license",
+        citation="citation",
+        file_name=file_name,
+        sha256="34973248736ygdw3",
+        size=1,
+        tags=["dsadas"],
+        is_zip=is_zip,
+        archive_format=archive_format,
+    )
+    assert entry.archive_format == expected
+    assert entry.is_zip == (expected != ArchiveFormat.NONE)
+
+
+def test_tribolium_archive_format(portfolio: PortfolioManager):
+    assert portfolio.denoising.Tribolium.archive_format == ArchiveFormat.TAR_GZ
+    assert portfolio.denoising.Tribolium.is_zip
+
+
 def test_entry_to_str(pale_blue_dot: PortfolioEntry):
     """Test the export to str and dict."""
     assert str(pale_blue_dot) == str(pale_blue_dot.to_dict())
+
+
+def test_verify(tmp_path, local_entries):
+    entry = local_entries[0]
+    assert not entry.verify(tmp_path)
+
+    entry.download(tmp_path)
+    assert entry.verify(tmp_path)
+
+    with open(tmp_path / entry.get_registry_name(), "r+b") as f:
+        f.write(b"corrupted")
+    assert not entry.verify(tmp_path)
@@ -0,0 +1,492 @@
+import io
+import os
+import sys
+import tarfile
+import threading
+import zipfile
+import zlib
+
+import pooch
+import pytest
+
+from careamics_portfolio.utils import fetch
+from careamics_portfolio.utils.downloaders import RangeDownloader
+from careamics_portfolio.utils.processors import (
+    ArchiveExtractor,
+    ArchiveFormat,
+    ParallelUnzip,
+    StreamingExtractor,
+    extract_tar,
+    glob_to_regex,
+    read_zip_tail,
+)
+
+from .test_downloaders import Preempted, PreemptingProgress
+from .utils import make_zip, sha256sum, start_http_server
+
+MEMBERS = {
+    "data/train/image_0.bin": os.urandom(700_000),
+    "data/train/image_1.bin": os.urandom(900_000),
+    "data/test/image_0.bin": os.urandom(500_000),
+    "data/README.txt": b"readme",
+}
+
+
+def make_tar(path, members, mode="w:gz"):
+    with tarfile.open(path, mode) as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return path
+
+
+def make_archive(directory, archive_format):
+    if archive_format == "zip":
+        return make_zip(directory / "data.zip", MEMBERS)
+    elif archive_format == "tar":
+        return make_tar(directory / "data.tar", MEMBERS, "w")
+    return make_tar(directory / "data.tar.gz", MEMBERS)
+
+
+def local_pooch(cache, url, archive):
+    return pooch.create(
+        path=cache, base_url=url + "/", registry={archive.name: sha256sum(archive)}
+    )
+
+
+def check_extracted(paths, extract_dir):
+    assert sorted(paths) == sorted(str(extract_dir / name) for name in MEMBERS)
+    for name, content in MEMBERS.items():
+        assert (extract_dir / name).read_bytes() == content
+
+
+@pytest.mark.parametrize("connections", [1, 3])
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz"])
+def test_streaming_extractor(tmp_path, http_server, archive_format, connections):
+    archive = make_archive(http_server.directory, archive_format)
+    poochfolio = local_pooch(tmp_path / "cache", http_server.url, archive)
+
+    extractor = StreamingExtractor(tmp_path / "cache" / archive.name, archive_format)
+    downloader = RangeDownloader(
+        connections=connections,
+        min_range_size=100_000,
+        partial_file=tmp_path / "cache" / "data.part",
+        sink=extractor,
+    )
+    paths = fetch(poochfolio, archive.name, processor=extractor, downloader=downloader)
+
+    check_extracted(paths, extractor.extract_dir)
+    assert not extractor._staging.exists()
+    if archive_format == "zip":
+        # the central directory was fetched first
+        size = archive.stat().st_size
+        assert any(
+            r is not None and r.endswith(f"-{size - 1}") for r in http_server.ranges
+        )
+
+    # existing archive
+    assert sorted(
+        fetch(
+            poochfolio,
+            archive.name,
+            processor=StreamingExtractor(
+                tmp_path / "cache" / archive.name, archive_format
+            ),
+        )
+    ) == sorted(paths)
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_streaming_extractor_no_ranges(tmp_path, archive_format):
+    """Without range requests, zip archives are extracted after the download."""
+    directory = tmp_path / "server"
+    directory.mkdir()
+    archive = make_archive(directory, archive_format)
+    server = start_http_server(directory, accept_ranges=False)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        extractor = StreamingExtractor(
+            tmp_path / "cache" / archive.name, archive_format
+        )
+        paths = fetch(
+            local_pooch(tmp_path / "cache", url, archive),
+            archive.name,
+            processor=extractor,
+            downloader=RangeDownloader(connections=4, sink=extractor),
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    check_extracted(paths, extractor.extract_dir)
+
+
+def test_streaming_extractor_hash_mismatch(tmp_path, http_server):
+    archive = make_zip(http_server.directory / "data.zip", MEMBERS)
+    poochfolio = pooch.create(
+        path=tmp_path / "cache",
+        base_url=http_server.url + "/",
+        registry={archive.name: "0" * 64},
+    )
+
+    extractor = StreamingExtractor(tmp_path / "cache" / archive.name)
+    with pytest.raises(ValueError):
+        fetch(
+            poochfolio,
+            archive.name,
+            processor=extractor,
+            downloader=RangeDownloader(connections=2, sink=extractor),
+        )
+
+    assert not extractor.extract_dir.exists()
+
+
+def test_streaming_extractor_not_an_archive(tmp_path, http_server):
+    """Extraction errors are raised by the processor, not the download."""
+    archive = http_server.directory / "data.tar.gz"
+    archive.write_bytes(os.urandom(100_000))
+    poochfolio = local_pooch(tmp_path / "cache", http_server.url, archive)
+
+    extractor = StreamingExtractor(tmp_path / "cache" / archive.name, "tar.gz")
+    with pytest.raises(tarfile.TarError):
+        fetch(
+            poochfolio,
+            archive.name,
+            processor=extractor,
+            downloader=RangeDownloader(sink=extractor),
+        )
+
+    assert (tmp_path / "cache" / archive.name).exists()
+
+
+def test_read_zip_tail_large_central_directory(tmp_path):
+    """The tail is extended to central directories larger than a first read."""
+    members = {f"folder/member_with_a_long_name_{i:05d}.txt": b"" for i in range(3000)}
+    archive = make_zip(tmp_path / "data.zip", members)
+    content = archive.read_bytes()
+
+    calls = []
+
+    def read_range(start, end):
+        calls.append((start, end))
+        return content[start:end]
+
+    offset, tail = read_zip_tail(read_range, len(content))
+
+    assert len(calls) == 2
+    assert content[offset:] == tail
+
+    # the central directory can be read from the tail only
+    with zipfile.ZipFile(io.BytesIO(bytes(offset) + tail)) as zf:
+        assert len(zf.infolist()) == len(members)
+
+
+def test_entry_stream_extract(tmp_path, local_entries):
+    entry = local_entries[0]
+
+    paths = entry.download(tmp_path / "streamed", connections=2, stream_extract=True)
+    expected = entry.download(tmp_path / "unzipped")
+
+    assert sorted(os.path.relpath(p, tmp_path / "streamed") for p in paths) == sorted(
+        os.path.relpath(p, tmp_path / "unzipped") for p in expected
+    )
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_streaming_extractor_resume(tmp_path, http_server, archive_format):
+    """Data of a resumed download is replayed to the extractor."""
+    archive = make_archive(http_server.directory, archive_format)
+    poochfolio = local_pooch(tmp_path / "cache", http_server.url, archive)
+    partial = tmp_path / "cache" / "data.part"
+
+    extractor = StreamingExtractor(tmp_path / "cache" / archive.name, archive_format)
+    with pytest.raises(Preempted):
+        fetch(
+            poochfolio,
+            archive.name,
+            processor=extractor,
+            downloader=RangeDownloader(
+                connections=2,
+                min_range_size=100_000,
+                partial_file=partial,
+                progressbar=PreemptingProgress(1_000_000),
+                sink=extractor,
+            ),
+        )
+    assert partial.exists()
+
+    extractor = StreamingExtractor(tmp_path / "cache" / archive.name, archive_format)
+    paths = fetch(
+        poochfolio,
+        archive.name,
+        processor=extractor,
+        downloader=RangeDownloader(
+            connections=2, min_range_size=100_000, partial_file=partial, sink=extractor
+        ),
+    )
+    check_extracted(paths, extractor.extract_dir)
+
+
+@pytest.mark.parametrize(
+    "file_name, archive_format",
+    [
+        ("data.zip", ArchiveFormat.ZIP),
+        ("data.tar", ArchiveFormat.TAR),
+        ("Denoising_Tribolium.tar.gz", ArchiveFormat.TAR_GZ),
+        ("data.tgz", ArchiveFormat.TAR_GZ),
+        ("data.TAR.ZST", ArchiveFormat.TAR_ZST),
+        ("image.tif", ArchiveFormat.NONE),
+    ],
+)
+def test_archive_format_from_file_name(file_name, archive_format):
+    assert ArchiveFormat.from_file_name(file_name) == archive_format
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar", "tar.gz"])
+def test_archive_extractor(tmp_path, archive_format):
+    archive = make_archive(tmp_path, archive_format)
+    extractor = ArchiveExtractor(archive_format)
+
+    paths = extractor(str(archive), "download", None)
+    extract_dir = tmp_path / (archive.name + extractor.suffix)
+    check_extracted(paths, extract_dir)
+
+    # already extracted
+    (extract_dir / "data" / "README.txt").write_bytes(b"modified")
+    assert sorted(extractor(str(archive), "fetch", None)) == sorted(paths)
+    assert (extract_dir / "data" / "README.txt").read_bytes() == b"modified"
+
+    # extracted anew after an update
+    extractor(str(archive), "update", None)
+    check_extracted(paths, extract_dir)
+
+
+def test_archive_extractor_none():
+    with pytest.raises(ValueError):
+        ArchiveExtractor(ArchiveFormat.NONE)
+
+
+def test_extract_tar_unsafe_members(tmp_path):
+    """Members outside of the extraction folder and links are ignored."""
+    archive = tmp_path / "data.tar"
+    with tarfile.open(archive, "w") as tar:
+        for name in ("../outside.txt", "/absolute.txt", "inside.txt"):
+            info = tarfile.TarInfo(name)
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"data"))
+        link = tarfile.TarInfo("link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "/etc/passwd"
+        tar.addfile(link)
+
+    extract_dir = tmp_path / "extracted"
+    extract_dir.mkdir()
+    with open(archive, "rb") as f:
+        extract_tar(f, extract_dir, ArchiveFormat.TAR)
+
+    assert [p.name for p in extract_dir.iterdir()] == ["inside.txt"]
+    assert not (tmp_path / "outside.txt").exists()
+
+
+def test_extract_tar_zst(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    tar = make_tar(tmp_path / "data.tar", MEMBERS, "w")
+    archive = tmp_path / "data.tar.zst"
+    archive.write_bytes(zstandard.ZstdCompressor().compress(tar.read_bytes()))
+
+    extractor = ArchiveExtractor(ArchiveFormat.TAR_ZST)
+    paths = extractor(str(archive), "download", None)
+    check_extracted(paths, tmp_path / "data.tar.zst.untar")
+
+
+def test_extract_tar_zst_missing(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ImportError, match="zstd"):
+        extract_tar(io.BytesIO(b""), tmp_path, ArchiveFormat.TAR_ZST)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_unzip(tmp_path, workers):
+    members = {
+        **MEMBERS,
+        **{f"data/many/file_{i}.txt": os.urandom(i * 100) for i in range(50)},
+        "data/empty.txt": b"",
+    }
+    archive = make_zip(tmp_path / "data.zip", members)
+
+    paths = ParallelUnzip(workers, progressbar=True)(str(archive), "download", None)
+
+    extract_dir = tmp_path / "data.zip.unzip"
+    assert sorted(paths) == sorted(str(extract_dir / name) for name in members)
+    for name, content in members.items():
+        assert (extract_dir / name).read_bytes() == content
+
+
+def test_parallel_unzip_handles(tmp_path, monkeypatch):
+    """Each thread reads the archive through its own handle."""
+    members = {f"file_{i}.txt": os.urandom(10_000) for i in range(20)}
+    archive = make_zip(tmp_path / "data.zip", members)
+
+    handles = {}
+    extract_member = ParallelUnzip._extract_member
+
+    def recording_extract_member(archive, info, destination):
+        handles.setdefault(threading.get_ident(), set()).add(archive)
+        return extract_member(archive, info, destination)
+
+    monkeypatch.setattr(
+        ParallelUnzip, "_extract_member", staticmethod(recording_extract_member)
+    )
+    ParallelUnzip(4)(str(archive), "download", None)
+
+    assert all(len(archives) == 1 for archives in handles.values())
+    opened = set.union(*handles.values())
+    assert len(opened) == len(handles)
+    assert all(archive.fp is None for archive in opened)
+
+
+def test_parallel_unzip_corrupted(tmp_path):
+    archive = make_zip(tmp_path / "data.zip", {"data.bin": b"\0" * 1_000_000})
+    with zipfile.ZipFile(archive) as zf:
+        offset = zf.infolist()[0].header_offset + 100
+
+    # corrupt the compressed data
+    content = bytearray(archive.read_bytes())
+    content[offset : offset + 10] = os.urandom(10)
+    archive.write_bytes(bytes(content))
+
+    with pytest.raises((zipfile.BadZipFile, zlib.error)):
+        ParallelUnzip(2)(str(archive), "download", None)
+    assert not (tmp_path / "data.zip.unzip").exists()
+
+
+def test_parallel_unzip_invalid_workers():
+    with pytest.raises(ValueError):
+        ParallelUnzip(0)
+
+
+def test_entry_extract_workers(tmp_path, local_entries):
+    entry = local_entries[0]
+
+    paths = entry.download(tmp_path / "parallel", extract_workers=3)
+    expected = entry.download(tmp_path / "unzipped")
+
+    assert sorted(os.path.relpath(p, tmp_path / "parallel") for p in paths) == sorted(
+        os.path.relpath(p, tmp_path / "unzipped") for p in expected
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern, name, matches",
+    [
+        ("**/test/*.bin", "data/test/image_0.bin", True),
+        ("**/test/*.bin", "test/image_0.bin", True),
+        ("**/test/*.bin", "data/test/sub/image_0.bin", False),
+        ("data/train", "data/train/image_0.bin", True),
+        ("data/train", "data/training/image_0.bin", False),
+        ("data/train/image_?.bin", "data/train/image_1.bin", True),
+        ("data/train/image_[!0].bin", "data/train/image_0.bin", False),
+        ("data/train/image_[!0].bin", "data/train/image_1.bin", True),
+        ("*.txt", "data/README.txt", False),
+    ],
+)
+def test_glob_to_regex(pattern, name, matches):
+    assert bool(glob_to_regex(pattern).match(name)) == matches
+
+
+@pytest.mark.parametrize(
+    "archive_format, workers", [("zip", None), ("zip", 2), ("tar.gz", None)]
+)
+def test_archive_extractor_members(tmp_path, archive_format, workers):
+    """A superset of members only extracts the missing members."""
+    archive = make_archive(tmp_path, archive_format)
+
+    def extractor(members):
+        if workers is None:
+            return ArchiveExtractor(archive_format, members)
+        return ParallelUnzip(workers, members=members)
+
+    paths = extractor(["**/test/*.bin"])(str(archive), "download", None)
+    extract_dir = tmp_path / (archive.name + extractor(None).suffix)
+    assert paths == [str(extract_dir / "data/test/image_0.bin")]
+    assert sorted(p.name for p in (extract_dir / "data").iterdir()) == ["test"]
+    assert (tmp_path / (archive.name + ".index.json")).exists()
+
+    (extract_dir / "data/test/image_0.bin").write_bytes(b"modified")
+    paths = extractor(["data/test", "data/*.txt"])(str(archive), "fetch", None)
+    assert sorted(paths) == sorted(
+        str(extract_dir / name) for name in ("data/test/image_0.bin", "data/README.txt")
+    )
+    assert (extract_dir / "data/test/image_0.bin").read_bytes() == b"modified"
+    assert (extract_dir / "data/README.txt").read_bytes() == MEMBERS["data/README.txt"]
+
+    # all members
+    paths = extractor(None)(str(archive), "fetch", None)
+    assert len(paths) == len(MEMBERS)
+    assert (extract_dir / "data/test/image_0.bin").read_bytes() == b"modified"
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_archive_extractor_index(tmp_path, monkeypatch, archive_format):
+    """Extracted selections do not read the archive while it is unchanged."""
+    archive = make_archive(tmp_path, archive_format)
+    extractor = ArchiveExtractor(archive_format, ["data/train/*"])
+    paths = extractor(str(archive), "download", None)
+    assert (tmp_path / (archive.name + ".index.json")).exists()
+
+    calls = []
+    extract_file = ArchiveExtractor._extract_file
+
+    def counting_extract_file(self, *args):
+        calls.append(args)
+        return extract_file(self, *args)
+
+    monkeypatch.setattr(ArchiveExtractor, "_extract_file", counting_extract_file)
+    assert extractor(str(archive), "fetch", None) == paths
+    assert calls == []
+
+    # the archive is read again when it changes
+    os.utime(archive, ns=(0, 0))
+    assert extractor(str(archive), "fetch", None) == paths
+    assert len(calls) == 1
+    assert extractor(str(archive), "fetch", None) == paths
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_streaming_extractor_members(tmp_path, http_server, archive_format):
+    archive = make_archive(http_server.directory, archive_format)
+    poochfolio = local_pooch(tmp_path / "cache", http_server.url, archive)
+
+    extractor = StreamingExtractor(
+        tmp_path / "cache" / archive.name, archive_format, ["data/train/*"]
+    )
+    paths = fetch(
+        poochfolio,
+        archive.name,
+        processor=extractor,
+        downloader=RangeDownloader(
+            connections=2, min_range_size=100_000, sink=extractor
+        ),
+    )
+
+    names = ["data/train/image_0.bin", "data/train/image_1.bin"]
+    assert sorted(paths) == [str(extractor.extract_dir / name) for name in names]
+    for name in names:
+        assert (extractor.extract_dir / name).read_bytes() == MEMBERS[name]
+    assert not (extractor.extract_dir / "data/README.txt").exists()
+
+
+def test_entry_members(tmp_path, local_entries):
+    entry = local_entries[0]
+
+    paths = entry.download(tmp_path, members=["**/test/*.tif"])
+    assert [os.path.basename(os.path.dirname(p)) for p in paths] == ["test"]
+
+    paths = entry.download(tmp_path, members=["local/*/*.tif"])
+    assert len(paths) == 3
+
+    with pytest.raises(ValueError):
+        local_entries[1].download(tmp_path, members=["*"])
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from careamics_portfolio.utils.statistics import cached_stats, compute_stats
+
+np = pytest.importorskip("numpy")
+
+RNG = np.random.default_rng(0)
+PERCENTILES = (0.1, 1.0, 50.0, 99.0, 99.9)
+
+
+def check_stats(stats, values, exact=True):
+    """Compare statistics to numpy, values being of shape (n, channels)."""
+    values = values.astype(np.float64)
+    assert stats["count"] == len(values)
+    np.testing.assert_allclose(stats["mean"], values.mean(axis=0))
+    np.testing.assert_allclose(stats["std"], values.std(axis=0))
+    np.testing.assert_array_equal(stats["min"], values.min(axis=0))
+    np.testing.assert_array_equal(stats["max"], values.max(axis=0))
+
+    expected = np.percentile(values, PERCENTILES, axis=0)
+    for q, percentile in zip(PERCENTILES, expected):
+        if exact:
+            np.testing.assert_allclose(stats["percentiles"][str(q)], percentile)
+        else:
+            np.testing.assert_allclose(
+                stats["percentiles"][str(q)], percentile, rtol=0.05, atol=0.05
+            )
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.int16])
+def test_compute_stats_integers(monkeypatch, dtype):
+    """Percentiles of small integer types are exact."""
+    monkeypatch.setattr("careamics_portfolio.utils.statistics.BLOCK_SIZE", 1000)
+    info = np.iinfo(dtype)
+    arrays = [
+        RNG.integers(info.min, info.max, (5, 40, 30), dtype=dtype, endpoint=True),
+        RNG.integers(info.min, info.max, (20, 17), dtype=dtype, endpoint=True),
+    ]
+
+    stats = compute_stats(arrays)
+    check_stats(stats, np.concatenate([a.ravel() for a in arrays])[:, None])
+
+
+def test_compute_stats_channels(monkeypatch):
+    monkeypatch.setattr("careamics_portfolio.utils.statistics.BLOCK_SIZE", 1000)
+    rgb = RNG.integers(0, 255, (4, 30, 20, 3), dtype=np.uint8)
+    rgb[..., 2] //= 2
+
+    stats = compute_stats([rgb, rgb[0]], channel_axis=-1)
+    values = np.concatenate([rgb.reshape(-1, 3), rgb[0].reshape(-1, 3)])
+    check_stats(stats, values)
+    assert len(stats["mean"]) == 3
+
+
+def test_compute_stats_channels_first(monkeypatch):
+    monkeypatch.setattr("careamics_portfolio.utils.statistics.BLOCK_SIZE", 100)
+    array = RNG.normal(size=(2, 50, 40)).astype(np.float32)
+    array[1] += 10
+
+    stats = compute_stats([array], channel_axis=0)
+    check_stats(stats, array.reshape(2, -1).T, exact=False)
+
+
+def test_compute_stats_sampled(monkeypatch):
+    """Percentiles of floats are estimated from a sample."""
+    monkeypatch.setattr("careamics_portfolio.utils.statistics.BLOCK_SIZE", 5000)
+    array = RNG.normal(size=(100, 1000))
+
+    stats = compute_stats([array], sample_size=20_000)
+    check_stats(stats, array.reshape(-1, 1), exact=False)
+
+    # the sample is uniform over the whole array
+    array[:25] += 100
+    stats = compute_stats([array], sample_size=20_000)
+    check_stats(stats, array.reshape(-1, 1), exact=False)
+    assert (
+        stats["percentiles"]
+        == compute_stats([array], sample_size=20_000)["percentiles"]
+    )
+
+
+def test_compute_stats_invalid():
+    with pytest.raises(ValueError):
+        compute_stats([])
+    with pytest.raises(ValueError):
+        compute_stats([np.zeros((0, 5))])
+    with pytest.raises(ValueError):
+        compute_stats([np.zeros((4, 3)), np.zeros((4, 2))], channel_axis=-1)
+
+
+def test_cached_stats(tmp_path):
+    sidecar = tmp_path / "stats.json"
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"mean": [len(calls)]}
+
+    assert cached_stats(sidecar, "abc", {"channel_axis": None}, compute) == {
+        "mean": [1]
+    }
+    assert cached_stats(sidecar, "abc", {"channel_axis": None}, compute) == {
+        "mean": [1]
+    }
+    assert len(calls) == 1
+
+    # other parameters are added to the sidecar
+    cached_stats(sidecar, "abc", {"channel_axis": -1}, compute)
+    assert len(json.loads(sidecar.read_text())["stats"]) == 2
+
+    # a new hash discards the sidecar
+    assert cached_stats(sidecar, "def", {"channel_axis": None}, compute) == {
+        "mean": [3]
+    }
+    assert len(json.loads(sidecar.read_text())["stats"]) == 1
+
+
+def test_entry_stats(tmp_path, array_entry, monkeypatch):
+    entry, expected = array_entry
+
+    stats = entry.stats(tmp_path)
+    values = np.concatenate([a.ravel() for a in expected.values()])[:, None]
+    check_stats(stats, values)
+    assert (tmp_path / f"{entry.get_registry_name()}.stats.json").exists()
+
+    # cached
+    def fail(*args, **kwargs):
+        raise AssertionError("the dataset was read again")
+
+    monkeypatch.setattr(type(entry), "load", fail)
+    assert entry.stats(tmp_path) == stats
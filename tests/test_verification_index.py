@@ -0,0 +1,147 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from careamics_portfolio.utils import verification_index
+from careamics_portfolio.utils.verification_index import (
+    INDEX_NAME,
+    VerificationIndex,
+    get_verification_index,
+)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(100_000))
+    return path
+
+
+@pytest.fixture
+def count_hashes(monkeypatch):
+    """Count the files hashed by the verification index."""
+    calls = []
+    verify = verification_index.verify
+
+    def _verify(path, known_hash):
+        calls.append(path)
+        return verify(path, known_hash)
+
+    monkeypatch.setattr(verification_index, "verify", _verify)
+    return calls
+
+
+def sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_verify_skips_unchanged_files(tmp_path, data_file, count_hashes):
+    index = VerificationIndex(tmp_path)
+    known_hash = sha256(data_file)
+
+    assert not index.is_verified("data", data_file, known_hash)
+    assert index.verify("data", data_file, known_hash)
+    assert index.is_verified("data", data_file, known_hash)
+    assert (tmp_path / INDEX_NAME).exists()
+
+    # the file is not hashed again
+    assert index.verify("data", data_file, known_hash)
+    assert len(count_hashes) == 1
+
+    # unless forced
+    assert index.verify("data", data_file, known_hash, force_verify=True)
+    assert len(count_hashes) == 2
+
+
+def test_verify_persists(tmp_path, data_file, count_hashes):
+    known_hash = sha256(data_file)
+    assert VerificationIndex(tmp_path).verify("data", data_file, known_hash)
+
+    # a new index reads the records from disk
+    assert VerificationIndex(tmp_path).verify("data", data_file, known_hash)
+    assert len(count_hashes) == 1
+
+
+def test_verify_modified_file(tmp_path, data_file):
+    index = VerificationIndex(tmp_path)
+    known_hash = sha256(data_file)
+    assert index.verify("data", data_file, known_hash)
+
+    with open(data_file, "r+b") as f:
+        f.write(b"corrupted")
+    assert not index.is_verified("data", data_file, known_hash)
+    assert not index.verify("data", data_file, known_hash)
+
+
+def test_verify_replaced_file(tmp_path, data_file):
+    index = VerificationIndex(tmp_path)
+    known_hash = sha256(data_file)
+    assert index.verify("data", data_file, known_hash)
+
+    # same content and times, but a different inode
+    stat = data_file.stat()
+    copy = tmp_path / "copy.bin"
+    copy.write_bytes(data_file.read_bytes())
+    os.utime(copy, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(copy, data_file)
+    assert not index.is_verified("data", data_file, known_hash)
+
+
+def test_verify_other_hash(tmp_path, data_file):
+    index = VerificationIndex(tmp_path)
+    assert index.verify("data", data_file, sha256(data_file))
+    assert not index.is_verified("data", data_file, "0" * 64)
+    assert not index.verify("data", data_file, "0" * 64)
+
+    # the failed check removed the record
+    assert not index.is_verified("data", data_file, sha256(data_file))
+
+
+def test_corrupted_index(tmp_path, data_file):
+    (tmp_path / INDEX_NAME).write_text("{not json")
+    index = VerificationIndex(tmp_path)
+    assert not index.is_verified("data", data_file, sha256(data_file))
+    assert index.verify("data", data_file, sha256(data_file))
+
+
+def test_get_verification_index(tmp_path):
+    assert get_verification_index(tmp_path) is get_verification_index(tmp_path / ".")
+
+
+def test_fetch_uses_index(tmp_path, local_entries, count_hashes):
+    entry = local_entries[1]
+    cache = tmp_path / "cache"
+
+    # the download is hashed while streaming and recorded in the index
+    entry.download(cache)
+    assert get_verification_index(cache).is_verified(
+        entry.get_registry_name(), cache / entry.get_registry_name(), entry.hash
+    )
+
+    entry.download(cache)
+    assert entry.verify(cache)
+    assert len(count_hashes) == 0
+
+    entry.download(cache, force_verify=True)
+    assert entry.verify(cache, force_verify=True)
+    assert len(count_hashes) == 2
+
+
+def test_concurrent_indices(tmp_path, data_file):
+    """Indices of the same folder, e.g. in other processes, keep all records."""
+    known_hash = sha256(data_file)
+    indices = [VerificationIndex(tmp_path) for _ in range(4)]
+    names = [f"data{i}" for i in range(40)]
+
+    with ThreadPoolExecutor(4) as pool:
+        list(
+            pool.map(
+                lambda i: indices[i % 4].add(names[i], data_file, known_hash),
+                range(len(names)),
+            )
+        )
+
+    index = VerificationIndex(tmp_path)
+    assert all(index.is_verified(name, data_file, known_hash) for name in names)
@@ -0,0 +1,87 @@
+import os
+import zipfile
+
+import pytest
+
+from careamics_portfolio.utils.zip_reader import ZipReader
+
+STORED = os.urandom(300_000)
+DEFLATED = b"\0" * 200_000
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "data.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("folder/", b"")
+        zf.writestr("folder/stored.bin", STORED, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("folder/deflated.bin", DEFLATED, compress_type=zipfile.ZIP_DEFLATED)
+    return path
+
+
+def test_zip_reader(archive):
+    with ZipReader(archive) as reader:
+        assert reader.namelist() == [
+            "folder/",
+            "folder/stored.bin",
+            "folder/deflated.bin",
+        ]
+        assert "folder/stored.bin" in reader
+        assert len(reader) == 3
+
+        # stored members are views of the archive
+        assert reader.is_stored("folder/stored.bin")
+        view = reader.read("folder/stored.bin")
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view == STORED
+
+        assert not reader.is_stored("folder/deflated.bin")
+        assert reader.read("folder/deflated.bin") == DEFLATED
+
+        with pytest.raises(KeyError):
+            reader.read("missing.bin")
+
+    # the view outlives the reader
+    assert view == STORED
+    view.release()
+
+
+@pytest.mark.parametrize("name, content", [("stored", STORED), ("deflated", DEFLATED)])
+def test_zip_reader_open(archive, name, content):
+    with ZipReader(archive) as reader, reader.open(f"folder/{name}.bin") as f:
+        assert f.read(10) == content[:10]
+        assert f.read() == content[10:]
+
+
+def test_zip_reader_numpy(archive):
+    np = pytest.importorskip("numpy")
+    with ZipReader(archive) as reader:
+        array = np.frombuffer(reader.read("folder/stored.bin"), dtype=np.uint8)
+        assert array.tobytes() == STORED
+        assert not array.flags.writeable
+
+
+def test_zip_reader_extra_field(tmp_path):
+    """The data offset accounts for local extra fields."""
+    path = tmp_path / "data.zip"
+    info = zipfile.ZipInfo("stored.bin")
+    info.extra = b"\xfe\xca\x04\x00abcd"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(info, STORED)
+
+    with ZipReader(path) as reader:
+        assert reader.read("stored.bin") == STORED
+
+
+def test_entry_open_archive(tmp_path, local_entries):
+    entry = local_entries[0]
+
+    with entry.open_archive(tmp_path) as reader:
+        assert reader.read("local/README.txt") == b"Local test archive."
+
+    # the archive was not extracted
+    assert not list(tmp_path.glob("*.unzip"))
+
+    with pytest.raises(ValueError):
+        local_entries[1].open_archive(tmp_path)
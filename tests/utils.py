@@ -1,4 +1,10 @@
+import hashlib
+import io
 import os
+import threading
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -69,3 +75,76 @@ def download_checker(path: Path, dataset: PortfolioEntry) -> None:
         f"{dataset.name} has not the expected size "
         f"(expected {dataset.size}, got {file_size})."
     )
+
+
+class RangeHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler supporting single `Range` requests.
+
+    The server records the `Range` header of each GET request in its `ranges`
+    attribute, and only advertises range support if its `accept_ranges`
+    attribute is True.
+    """
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404, "File not found")
+            return None
+
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        header = self.headers.get("Range")
+        if self.command == "GET":
+            self.server.ranges.append(header)
+
+        partial = header is not None and self.server.accept_ranges
+        if partial:
+            first, last = header.replace("bytes=", "").split("-")
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if start >= size:
+                self.send_error(416, "Requested range not satisfiable")
+                return None
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        if partial:
+            with open(path, "rb") as f:
+                f.seek(start)
+                return io.BytesIO(f.read(end - start + 1))
+        return open(path, "rb")
+
+
+def start_http_server(directory: Path, accept_ranges: bool = True):
+    """Serve a directory over HTTP on a random local port."""
+    handler = partial(RangeHTTPRequestHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.accept_ranges = accept_ranges
+    server.ranges = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def sha256sum(path: Path) -> str:
+    """Compute the SHA256 hash of a file."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def make_zip(path: Path, members: dict) -> Path:
+    """Create a zip archive with the given member names and contents."""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return path